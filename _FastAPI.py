@@ -211,6 +211,11 @@ def get_index_html() -> str:
   <!-- WATCHLIST (grid) -->
   <section id="page-watchlist" class="card hidden">
     <div class="title">Watchlist</div>
+    <div class="wl-tools">
+      <button id="wl-select" class="btn-ghost" type="button" onclick="toggleWlSelect()">Select</button>
+      <span id="wl-sel-count" class="wl-sel-count hidden"></span>
+      <button id="wl-del-selected" class="btn danger hidden" type="button" onclick="deleteSelected()" disabled>Delete selected</button>
+    </div>
     <div id="wl-msg" class="wall-msg">Loading…</div>
     <div id="wl-grid" class="wl-grid hidden"></div>
   </section>
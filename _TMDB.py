@@ -2,94 +2,403 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Optional, Tuple, Dict, Any, List
+from typing import Callable, Optional, Tuple, Dict, Any, List, Iterable
+import hashlib
 import json
+import os
+import queue
+import tempfile
+import threading
+import urllib.error
 import urllib.request
 import time
 
 TMDB_IMG = "https://image.tmdb.org/t/p"
 TMDB_API = "https://api.themoviedb.org/3"
 
+# -------- Metadata store --------
+# One record per title in cache/tmdb_meta/{typ}-{id}.json, shared by every consumer
+# (wall genres, hover overview, poster path, watch-time runtime):
+#   {"v": 2, "id", "type", "status": "ok"|"missing"|"error",
+#    "fetched_at": last good fetch, "checked_at": last attempt, "error": last error or "",
+#    "fields": {title, overview, year, poster_path, genres, runtime}, "raw": <TMDb body>}
+META_VERSION = 2
+DAY = 86400
+FIELD_TTL: Dict[str, int] = {
+    "title": 30 * DAY,
+    "year": 30 * DAY,
+    "genres": 30 * DAY,
+    "runtime": 30 * DAY,
+    "overview": 14 * DAY,
+    "poster_path": 7 * DAY,
+}
+NEG_TTL_MISSING = 3 * DAY   # TMDb answered 404
+NEG_TTL_ERROR = 15 * 60     # network/auth trouble: don't hammer, retry soon
+
+class SingleFlight:
+    """Per-key call coalescing: concurrent callers for the same key share one execution (and its result/error)."""
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Any, Dict[str, Any]] = {}
+
+    def do(self, key: Any, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {"done": threading.Event(), "result": None, "error": None}
+        if not leader:
+            call["done"].wait()
+            if call["error"] is not None:
+                raise call["error"]
+            return call["result"]
+        try:
+            call["result"] = fn()
+            return call["result"]
+        except BaseException as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call["done"].set()
+
+FLIGHT = SingleFlight()
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write via a unique temp file in the same dir + os.replace: readers see the old file or the new one, never a partial one."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
 def _urlopen(url: str) -> bytes:
     req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
     with urllib.request.urlopen(req, timeout=15) as r:
         return r.read()
 
-def get_meta(api_key: str, typ: str, tmdb_id: int, cache_dir: Path) -> Dict[str, Any]:
-    meta_file = cache_dir / "tmdb_meta" / f"{typ}-{tmdb_id}.json"
-    meta_file.parent.mkdir(parents=True, exist_ok=True)
-    if meta_file.exists():
-        try:
-            return json.loads(meta_file.read_text(encoding="utf-8"))
-        except Exception:
-            pass
-    url = f"{TMDB_API}/{typ}/{tmdb_id}?language=en-US&api_key={api_key}"
-    j = json.loads(_urlopen(url).decode("utf-8", errors="ignore"))
-    genres: List[str] = [g.get("name", "") for g in (j.get("genres") or []) if g.get("name")]
-    out = {
-        "id": tmdb_id,
-        "type": typ,
+def _meta_file(cache_dir: Path, typ: str, tmdb_id: int) -> Path:
+    return cache_dir / "tmdb_meta" / f"{typ}-{int(tmdb_id)}.json"
+
+def _runtime_of(typ: str, j: Dict[str, Any]) -> Optional[int]:
+    if typ == "movie":
+        rt = j.get("runtime")
+        return int(rt) if isinstance(rt, (int, float)) and rt > 0 else None
+    arr = j.get("episode_run_time") or j.get("episode_run_times") or []
+    if isinstance(arr, list):
+        arr = [x for x in arr if isinstance(x, (int, float)) and x > 0]
+        if arr:
+            return int(sum(arr) / len(arr))
+    return None
+
+def _derive(typ: str, j: Dict[str, Any]) -> Dict[str, Any]:
+    """Derived fields from a raw TMDb /movie or /tv body."""
+    genres: List[str] = []
+    for g in (j.get("genres") or []):
+        name = g.get("name", "") if isinstance(g, dict) else g
+        if isinstance(name, str) and name.strip():
+            genres.append(name.strip())
+    return {
         "title": j.get("title") or j.get("name") or "",
         "overview": j.get("overview") or "",
-        "year": (j.get("release_date") or j.get("first_air_date") or "0000")[:4],
+        "year": str(j.get("year") or (j.get("release_date") or j.get("first_air_date") or "0000")[:4]),
         "poster_path": j.get("poster_path"),
         "genres": genres,
+        "runtime": _runtime_of(typ, j),
     }
-    meta_file.write_text(json.dumps(out, indent=2), encoding="utf-8")
-    return out
 
-def get_poster_file(api_key: str, typ: str, tmdb_id: int, size: str, cache_dir: Path) -> Tuple[Path, str]:
-    meta = get_meta(api_key, typ, tmdb_id, cache_dir)
-    poster_path = meta.get("poster_path")
-    if not poster_path:
-        raise RuntimeError("no poster")
-    safe_size = size if size.startswith("w") or size == "original" else "w342"
-    local = cache_dir / "tmdb" / typ / str(tmdb_id) / f"{safe_size}.jpg"
-    local.parent.mkdir(parents=True, exist_ok=True)
-    if not local.exists():
-        url = f"{TMDB_IMG}/{safe_size}{poster_path}"
-        local.write_bytes(_urlopen(url))
-    return local, "image/jpeg"
+def _from_legacy(typ: str, tmdb_id: int, j: Dict[str, Any], mtime: float) -> Dict[str, Any]:
+    """v1 files were either our summary or the raw TMDb body; fold both into a v2 record."""
+    is_summary = "genres" in j and all(isinstance(g, str) for g in (j.get("genres") or [])) and "runtime" not in j
+    fields = _derive(typ, j)
+    if is_summary:
+        fields.pop("runtime", None)  # never stored in the summary shape -> stale for runtime readers
+    return {
+        "v": META_VERSION, "id": int(tmdb_id), "type": typ, "status": "ok",
+        "fetched_at": int(mtime), "checked_at": int(mtime), "error": "",
+        "fields": fields, "raw": {} if is_summary else j,
+    }
 
-def get_runtime(api_key: str, typ: str, tmdb_id: int, cache_dir: Path, ttl_days: int = 14) -> Optional[int]:
+def _read_record(typ: str, tmdb_id: int, cache_dir: Path) -> Optional[Dict[str, Any]]:
+    f = _meta_file(cache_dir, typ, tmdb_id)
     try:
-        t = "tv" if typ == "tv" else "movie"
-        f = cache_dir / "tmdb_meta" / f"{t}-{int(tmdb_id)}.json"
-        f.parent.mkdir(parents=True, exist_ok=True)
+        j = json.loads(f.read_text(encoding="utf-8"))
+        if not isinstance(j, dict):
+            return None
+        if j.get("v") == META_VERSION:
+            return j
+        return _from_legacy(typ, tmdb_id, j, f.stat().st_mtime)
+    except Exception:
+        return None
+
+# called as fn(typ, tmdb_id, record) after every record write (e.g. Stats folding in runtimes).
+# deferred listeners run on one dispatcher thread, in write order, so a writer (possibly the event loop)
+# never waits on their locks; use that for anything heavier than a dict update.
+_META_LISTENERS: List[Callable[[str, int, Dict[str, Any]], None]] = []
+_DEFERRED_META_LISTENERS: List[Callable[[str, int, Dict[str, Any]], None]] = []
+_META_QUEUE: "queue.Queue[Tuple[str, int, Dict[str, Any]]]" = queue.Queue()
+_META_DISPATCHER: Optional[threading.Thread] = None
+_META_DISPATCHER_LOCK = threading.Lock()
 
-        data: Optional[Dict[str, Any]] = None
+def add_meta_listener(fn: Callable[[str, int, Dict[str, Any]], None], deferred: bool = False) -> None:
+    target = _DEFERRED_META_LISTENERS if deferred else _META_LISTENERS
+    if fn not in target:
+        target.append(fn)
 
-        # try fresh cache
-        if f.exists() and (time.time() - f.stat().st_mtime) < ttl_days * 86400:
+def _dispatch_meta() -> None:
+    while True:
+        typ, tmdb_id, rec = _META_QUEUE.get()
+        for fn in list(_DEFERRED_META_LISTENERS):
             try:
-                maybe = json.loads(f.read_text(encoding="utf-8"))
-                if isinstance(maybe, dict):
-                    data = maybe
+                fn(typ, tmdb_id, rec)
             except Exception:
-                data = None
+                pass
+
+def _defer_meta(typ: str, tmdb_id: int, rec: Dict[str, Any]) -> None:
+    global _META_DISPATCHER
+    if _META_DISPATCHER is None or not _META_DISPATCHER.is_alive():
+        with _META_DISPATCHER_LOCK:
+            if _META_DISPATCHER is None or not _META_DISPATCHER.is_alive():
+                _META_DISPATCHER = threading.Thread(target=_dispatch_meta, name="TmdbMetaListeners", daemon=True)
+                _META_DISPATCHER.start()
+    _META_QUEUE.put((typ, tmdb_id, rec))
+
+def _write_record(rec: Dict[str, Any], cache_dir: Path) -> None:
+    f = _meta_file(cache_dir, rec["type"], rec["id"])
+    atomic_write_bytes(f, json.dumps(rec, separators=(",", ":")).encode("utf-8"))
+    for fn in list(_META_LISTENERS):
+        try:
+            fn(rec["type"], int(rec["id"]), rec)
+        except Exception:
+            pass
+    if _DEFERRED_META_LISTENERS:
+        _defer_meta(rec["type"], int(rec["id"]), rec)
+
+def _needs_fetch(rec: Optional[Dict[str, Any]], fields: Iterable[str], now: float) -> bool:
+    if rec is None:
+        return True
+    checked = float(rec.get("checked_at") or 0)
+    status = rec.get("status")
+    if status == "missing":
+        return now - checked > NEG_TTL_MISSING
+    if rec.get("error") and now - checked < NEG_TTL_ERROR:
+        return False  # a recent attempt failed; serve what we have
+    if status != "ok":
+        return True
+    have = rec.get("fields") or {}
+    fetched = float(rec.get("fetched_at") or 0)
+    for k in fields:
+        if k not in have or now - fetched > FIELD_TTL.get(k, 14 * DAY):
+            return True
+    return False
+
+def _record_url(api_key: str, typ: str, tmdb_id: int) -> str:
+    return f"{TMDB_API}/{typ}/{int(tmdb_id)}?language=en-US&api_key={api_key}"
+
+def _merge_fetch(prev: Optional[Dict[str, Any]], typ: str, tmdb_id: int,
+                 code: Optional[int], body: Optional[bytes], error: str = "") -> Dict[str, Any]:
+    """Fold one TMDb answer (HTTP code + body, or a transport error) into the record."""
+    now = int(time.time())
+    rec = dict(prev or {"v": META_VERSION, "id": int(tmdb_id), "type": typ, "status": "error",
+                        "fetched_at": 0, "fields": {}, "raw": {}})
+    rec["v"] = META_VERSION
+    rec["checked_at"] = now
+    if code == 404:
+        rec.update({"status": "missing", "error": "not found on TMDb", "fields": {}, "raw": {}})
+    elif code == 200 and body is not None:
+        try:
+            j = json.loads(body.decode("utf-8", errors="ignore"))
+            if not isinstance(j, dict):
+                raise ValueError("unexpected TMDb payload")
+            rec.update({"status": "ok", "fetched_at": now, "error": "", "fields": _derive(typ, j), "raw": j})
+        except Exception as e:
+            rec["error"] = str(e) or e.__class__.__name__
+    else:
+        rec["error"] = error or f"HTTP {code}"
+    return rec
+
+def _fetch_record(api_key: str, typ: str, tmdb_id: int, prev: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    try:
+        return _merge_fetch(prev, typ, tmdb_id, 200, _urlopen(_record_url(api_key, typ, tmdb_id)))
+    except urllib.error.HTTPError as e:
+        return _merge_fetch(prev, typ, tmdb_id, e.code, None)
+    except Exception as e:
+        return _merge_fetch(prev, typ, tmdb_id, None, None, str(e) or e.__class__.__name__)
+
+def get_record(api_key: str, typ: str, tmdb_id: int, cache_dir: Path,
+               fields: Optional[Iterable[str]] = None, allow_fetch: bool = True) -> Optional[Dict[str, Any]]:
+    """The cached record, refreshed from TMDb when any requested field is past its TTL."""
+    typ = "tv" if typ == "tv" else "movie"
+    rec = _read_record(typ, tmdb_id, cache_dir)
+    want = list(fields) if fields is not None else list(FIELD_TTL)
+    if not allow_fetch or not api_key or not _needs_fetch(rec, want, time.time()):
+        return rec
 
-        # fetch if cache missing/invalid
-        if data is None:
-            url = f"{TMDB_API}/{t}/{int(tmdb_id)}?api_key={api_key}&language=en-US"
-            raw = _urlopen(url)
-            f.write_bytes(raw)
+    def _refresh() -> Optional[Dict[str, Any]]:
+        cur = _read_record(typ, tmdb_id, cache_dir)  # a previous flight may have just written it
+        if not _needs_fetch(cur, want, time.time()):
+            return cur
+        cur = _fetch_record(api_key, typ, tmdb_id, cur)
+        try:
+            _write_record(cur, cache_dir)
+        except Exception:
+            pass
+        return cur
+
+    return FLIGHT.do(("meta", typ, int(tmdb_id), str(cache_dir)), _refresh)
+
+def _summary(typ: str, tmdb_id: int, rec: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not rec or not rec.get("fields"):
+        return None
+    f = rec["fields"]
+    return {
+        "id": int(tmdb_id),
+        "type": typ,
+        "title": f.get("title") or "",
+        "overview": f.get("overview") or "",
+        "year": f.get("year") or "0000",
+        "poster_path": f.get("poster_path"),
+        "genres": list(f.get("genres") or []),
+        "runtime": f.get("runtime"),
+    }
+
+def peek_record(typ: str, tmdb_id: int, cache_dir: Path) -> Optional[Dict[str, Any]]:
+    """Cache-only read of the raw record, including negative ("missing") entries."""
+    return _read_record("tv" if typ == "tv" else "movie", tmdb_id, cache_dir)
+
+def peek_meta(typ: str, tmdb_id: int, cache_dir: Path) -> Optional[Dict[str, Any]]:
+    """Cache-only read (never touches the network); stale entries are still returned."""
+    return _summary(typ, tmdb_id, _read_record(typ, tmdb_id, cache_dir))
+
+def get_meta(api_key: str, typ: str, tmdb_id: int, cache_dir: Path) -> Dict[str, Any]:
+    rec = get_record(api_key, typ, tmdb_id, cache_dir)
+    out = _summary(typ, tmdb_id, rec)
+    if out is None:
+        raise RuntimeError((rec or {}).get("error") or "metadata not available")
+    return out
+
+def poster_version(poster_path: Optional[str]) -> str:
+    """Short token for the current artwork; changes only when TMDb swaps the poster."""
+    return hashlib.sha1(poster_path.encode("utf-8")).hexdigest()[:10] if poster_path else ""
+
+def _safe_size(size: str) -> str:
+    return size if size.startswith("w") or size == "original" else "w342"
+
+# -------- Poster store --------
+# Content-addressed: cache/tmdb/blobs/{h[:2]}/{h}.jpg with h = sha1(size + poster_path). The (typ, id) -> poster_path
+# index is the metadata record above, so titles sharing artwork share one file, and a new poster_path on TMDb
+# simply points at a new blob. Files are only ever created via rename, and downloads take a lock file
+# (O_CREAT|O_EXCL) next to the blob, so several app instances can share one cache volume.
+LOCK_STALE_SEC = 60
+LOCK_WAIT_SEC = 30
+
+def _blob_path(cache_dir: Path, poster_path: str, size: str) -> Path:
+    h = hashlib.sha1(f"{_safe_size(size)}{poster_path}".encode("utf-8")).hexdigest()
+    return cache_dir / "tmdb" / "blobs" / h[:2] / f"{h}.jpg"
+
+def _legacy_poster(cache_dir: Path, typ: str, tmdb_id: int, size: str) -> Path:
+    return cache_dir / "tmdb" / typ / str(tmdb_id) / f"{_safe_size(size)}.jpg"
+
+def _lock(target: Path) -> Optional[Path]:
+    """Cross-process download lock; None if someone else holds a fresh one."""
+    lock = target.with_name(target.name + ".lock")
+    lock.parent.mkdir(parents=True, exist_ok=True)
+    for _ in range(2):
+        try:
+            os.close(os.open(str(lock), os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644))
+            return lock
+        except FileExistsError:
             try:
-                maybe = json.loads(raw.decode("utf-8", errors="ignore"))
-                if isinstance(maybe, dict):
-                    data = maybe
-                else:
+                if time.time() - lock.stat().st_mtime < LOCK_STALE_SEC:
                     return None
-            except Exception:
-                return None
+                lock.unlink()  # holder died mid-download; take over
+            except FileNotFoundError:
+                pass
+    return None
 
-        if t == "movie":
-            rt = data.get("runtime")
-            return int(rt) if isinstance(rt, (int, float)) else None
+def _unlock(lock: Optional[Path]) -> None:
+    if lock is not None:
+        try:
+            lock.unlink()
+        except OSError:
+            pass
 
-        arr = data.get("episode_run_time") or data.get("episode_run_times") or []
-        if isinstance(arr, list) and arr:
-            return int(sum(arr) / len(arr))
+def _wait_for(target: Path, timeout: float = LOCK_WAIT_SEC) -> bool:
+    lock = target.with_name(target.name + ".lock")
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if target.exists():
+            return True
+        if not lock.exists():
+            break
+        time.sleep(0.1)
+    return target.exists()
+
+def poster_cached(typ: str, tmdb_id: int, size: str, cache_dir: Path,
+                  meta: Optional[Dict[str, Any]] = None) -> Optional[Path]:
+    """Path of an already-downloaded poster, or None (cache-only). Pass `meta` if already read."""
+    if meta is None:
+        meta = peek_meta(typ, tmdb_id, cache_dir)
+    poster_path = (meta or {}).get("poster_path")
+    if not poster_path:
         return None
+    blob = _blob_path(cache_dir, poster_path, size)
+    if blob.exists():
+        return blob
+    legacy = _legacy_poster(cache_dir, typ, tmdb_id, size)
+    if legacy.exists():
+        # pre-blob layout: adopt the file instead of downloading it again
+        try:
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(legacy, blob)
+            return blob
+        except OSError:
+            return legacy
+    return None
+
+STREAM_CHUNK = 64 * 1024  # _tmdb_async streams poster misses through in chunks of this size
+
+def _poster_target(api_key: str, typ: str, tmdb_id: int, size: str, cache_dir: Path) -> Tuple[Path, str]:
+    meta = get_meta(api_key, typ, tmdb_id, cache_dir)
+    poster_path = meta.get("poster_path")
+    if not poster_path:
+        raise RuntimeError("no poster")
+    safe_size = _safe_size(size)
+    return _blob_path(cache_dir, poster_path, safe_size), f"{TMDB_IMG}/{safe_size}{poster_path}"
+
+def get_poster_file(api_key: str, typ: str, tmdb_id: int, size: str, cache_dir: Path) -> Tuple[Path, str]:
+    hit = poster_cached(typ, tmdb_id, size, cache_dir)
+    if hit is not None:
+        return hit, "image/jpeg"
+    local, url = _poster_target(api_key, typ, tmdb_id, size, cache_dir)
 
+    def _download() -> Path:
+        if local.exists():
+            return local
+        lock = _lock(local)
+        if lock is None and _wait_for(local):
+            return local  # a running stream or another process fetched it
+        try:
+            if not local.exists():
+                atomic_write_bytes(local, _urlopen(url))
+        finally:
+            _unlock(lock)
+        return local
+
+    return FLIGHT.do(("img", str(local)), _download), "image/jpeg"
+
+def get_runtime(api_key: str, typ: str, tmdb_id: int, cache_dir: Path, ttl_days: int = 14) -> Optional[int]:
+    try:
+        rec = get_record(api_key, typ, int(tmdb_id), cache_dir, fields=("runtime",))
+        rt = ((rec or {}).get("fields") or {}).get("runtime")
+        return int(rt) if isinstance(rt, (int, float)) else None
     except Exception:
         return None
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+_cache.py
+
+Bounded TMDb cache (posters, variants, metadata records) under CACHE_DIR.
+A background sweep keeps the footprint under `cache.max_mb` (config) by
+evicting least-recently-used image files first. "Used" is the later of the
+file's mtime and the last time the web app served it (tracked in memory;
+atime is unreliable on relatime/noatime mounts). Metadata records count
+toward the footprint but are never evicted: they are small, and they are the
+only (type, id) -> poster index, so dropping one would orphan its images.
+"""
+
+from __future__ import annotations
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_MAX_MB = 1024
+SWEEP_INTERVAL_SEC = 600
+LOW_WATERMARK = 0.9  # evict down to 90% of the budget so we don't sweep on every new poster
+SUBDIRS = ("tmdb", "tmdb_meta")
+EVICTABLE = ("tmdb",)  # posters + variants; tmdb_meta only counts toward the total
+
+
+class CacheManager:
+    def __init__(
+        self,
+        cache_dir: Path,
+        load_config: Callable[[], Dict[str, Any]],
+        interval: int = SWEEP_INTERVAL_SEC,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.load_config_cb = load_config
+        self.interval = max(30, int(interval))
+
+        self._lock = threading.Lock()
+        self._access: Dict[str, float] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._stats: Dict[str, Any] = {
+            "bytes": 0,
+            "entries": 0,
+            "hits": 0,
+            "misses": 0,
+            "evicted_files": 0,
+            "evicted_bytes": 0,
+            "last_sweep": 0,
+            "last_sweep_ms": 0,
+        }
+
+    # ---- accounting (cheap; called from request handlers) ----
+    def touch(self, path: Optional[Path]) -> None:
+        if path is not None:
+            with self._lock:
+                self._access[str(path)] = time.time()
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            self._stats["hits" if hit else "misses"] += 1
+
+    def budget_bytes(self) -> int:
+        try:
+            cfg = self.load_config_cb() or {}
+            mb = float((cfg.get("cache") or {}).get("max_mb") or DEFAULT_MAX_MB)
+        except Exception:
+            mb = DEFAULT_MAX_MB
+        return int(max(16.0, mb) * 1024 * 1024)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            st = dict(self._stats)
+        total = st["hits"] + st["misses"]
+        st["hit_ratio"] = round(st["hits"] / total, 4) if total else None
+        st["budget_bytes"] = self.budget_bytes()
+        st["running"] = bool(self._thread and self._thread.is_alive())
+        return st
+
+    def reset(self) -> None:
+        """After a wholesale clear: forget access times and counters."""
+        with self._lock:
+            self._access.clear()
+            for k in ("bytes", "entries", "hits", "misses", "evicted_files", "evicted_bytes"):
+                self._stats[k] = 0
+
+    # ---- control ----
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="CacheManager", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+
+    def kick(self) -> None:
+        """Sweep soon (e.g. after a warm-up pass filled the cache)."""
+        self._wake.set()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.sweep()
+            except Exception:
+                pass
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    # ---- sweep ----
+    def _scan(self) -> List[Tuple[float, int, Path, bool]]:
+        with self._lock:
+            access = dict(self._access)
+        out: List[Tuple[float, int, Path, bool]] = []
+        for sub in SUBDIRS:
+            evictable = sub in EVICTABLE
+            root = self.cache_dir / sub
+            if not root.exists():
+                continue
+            for dirpath, _, files in os.walk(root):
+                for name in files:
+                    if name.endswith((".tmp", ".lock")):
+                        continue  # in-flight atomic write / download
+                    p = Path(dirpath) / name
+                    try:
+                        st = p.stat()
+                    except OSError:
+                        continue
+                    used = max(st.st_mtime, access.get(str(p), 0.0))
+                    out.append((used, st.st_size, p, evictable))
+        return out
+
+    def sweep(self) -> Dict[str, Any]:
+        t0 = time.time()
+        entries = self._scan()
+        total = sum(e[1] for e in entries)
+        budget = self.budget_bytes()
+        evicted_files = evicted_bytes = 0
+        if total > budget:
+            target = int(budget * LOW_WATERMARK)
+            entries.sort(key=lambda e: e[0])  # oldest use first
+            for _, sz, p, evictable in entries:
+                if total <= target:
+                    break
+                if not evictable:
+                    continue
+                try:
+                    p.unlink()
+                except OSError:
+                    continue
+                total -= sz
+                evicted_files += 1
+                evicted_bytes += sz
+                with self._lock:
+                    self._access.pop(str(p), None)
+                try:
+                    p.parent.rmdir()  # only succeeds once the folder is empty
+                except OSError:
+                    pass
+        with self._lock:
+            self._stats["bytes"] = total
+            self._stats["entries"] = len(entries) - evicted_files
+            self._stats["evicted_files"] += evicted_files
+            self._stats["evicted_bytes"] += evicted_bytes
+            self._stats["last_sweep"] = int(time.time())
+            self._stats["last_sweep_ms"] = int((time.time() - t0) * 1000)
+        return {"evicted_files": evicted_files, "evicted_bytes": evicted_bytes, "bytes": total}
@@ -0,0 +1,196 @@
+# _compress.py
+# Response compression for the web UI.
+# - CompressionMiddleware: gzip (brotli when the optional `brotli` package is installed) for JSON bodies
+#   above a size threshold. Event streams and bodies that already carry a Content-Encoding pass through.
+# - AssetBundle: UI files read once at startup, content-hashed and pre-compressed, then served from memory
+#   under /assets/<stem>.<hash><ext> with immutable caching (the index page links to those names).
+
+from __future__ import annotations
+import gzip
+import hashlib
+import mimetypes
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+
+try:
+    import brotli
+except Exception:  # optional dependency
+    brotli = None  # type: ignore[assignment]
+
+MIN_SIZE = 1024
+GZIP_LEVEL = 6
+BR_DYNAMIC_QUALITY = 4    # per-request: fast
+BR_STATIC_QUALITY = 11    # once at startup: smallest
+COMPRESSIBLE = ("application/json",)
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "public, no-cache"
+
+
+def pick_encoding(accept_encoding: Optional[str], available: Iterable[str] = ("br", "gzip")) -> Optional[str]:
+    """Best of `available` ('br' before 'gzip') that the client accepts (q > 0), else None."""
+    accepted = set()
+    for part in (accept_encoding or "").lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip())
+    if brotli is not None and "br" in available and "br" in accepted:
+        return "br"
+    if "gzip" in available and ("gzip" in accepted or "*" in accepted):
+        return "gzip"
+    return None
+
+
+def compress(data: bytes, encoding: str, static: bool = False) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=BR_STATIC_QUALITY if static else BR_DYNAMIC_QUALITY)
+    return gzip.compress(data, compresslevel=9 if static else GZIP_LEVEL, mtime=0)
+
+
+class CompressionMiddleware:
+    """Pure ASGI (no buffering of streams): only single-message JSON responses are compressed."""
+    def __init__(self, app: Any, minimum_size: int = MIN_SIZE, types: Iterable[str] = COMPRESSIBLE) -> None:
+        self.app = app
+        self.minimum_size = int(minimum_size)
+        self.types = tuple(types)
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        enc = pick_encoding(Headers(scope=scope).get("accept-encoding"))
+        if enc is None:
+            await self.app(scope, receive, send)
+            return
+
+        held: Dict[str, Any] = {}
+
+        async def _send(msg: Dict[str, Any]) -> None:
+            if msg["type"] == "http.response.start":
+                h = Headers(raw=msg["headers"])
+                ctype = (h.get("content-type") or "").split(";")[0].strip().lower()
+                if ctype in self.types and "content-encoding" not in h and msg["status"] not in (204, 304):
+                    held["start"] = msg  # decide once we see the body
+                    return
+                await send(msg)
+                return
+            start = held.pop("start", None)
+            if start is None:
+                await send(msg)
+                return
+            body = msg.get("body", b"")
+            if msg.get("more_body") or len(body) < self.minimum_size:
+                await send(start)
+                await send(msg)
+                return
+            data = compress(body, enc)
+            if len(data) >= len(body):
+                await send(start)
+                await send(msg)
+                return
+            headers = MutableHeaders(scope=start)
+            headers["Content-Encoding"] = enc
+            headers["Content-Length"] = str(len(data))
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = "W/" + etag  # different bytes than the identity representation
+            await send(start)
+            await send({"type": "http.response.body", "body": data})
+
+        await self.app(scope, receive, _send)
+
+
+class AssetBundle:
+    """In-memory, pre-compressed copies of the UI files, addressable by plain or content-hashed name."""
+    def __init__(self, root: Path, names: Iterable[str] = ()) -> None:
+        self.root = Path(root)
+        self._files: Dict[str, Dict[str, Any]] = {}  # name -> {"hashed", "hash", "mime", "identity", "gzip", "br"}
+        self._hashed: Dict[str, str] = {}            # hashed name -> name
+        for name in names:
+            try:
+                self.add_file(name)
+            except OSError:
+                pass
+
+    def add_file(self, name: str) -> str:
+        p = self.root / name
+        data = p.read_bytes()
+        mime = mimetypes.guess_type(p.name)[0] or "application/octet-stream"
+        if mime.startswith("text/") or mime == "application/javascript":
+            data = self.rewrite(data.decode("utf-8")).encode("utf-8")  # e.g. the css pointing at the svg
+            mime += "; charset=utf-8"
+        return self.add(name, data, mime)
+
+    def add(self, name: str, data: bytes, mime: str) -> str:
+        """Register bytes under `name`; returns the content-hashed name."""
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        stem, dot, ext = name.rpartition(".")
+        hashed = f"{stem}.{digest}.{ext}" if dot else f"{name}.{digest}"
+        rec: Dict[str, Any] = {"hashed": hashed, "hash": digest, "mime": mime, "identity": data}
+        for enc in ("gzip", "br"):
+            if enc == "br" and brotli is None:
+                continue
+            packed = compress(data, enc, static=True)
+            if len(packed) < len(data):
+                rec[enc] = packed
+        old = self._files.get(name)
+        if old:
+            self._hashed.pop(old["hashed"], None)
+        self._files[name] = rec
+        self._hashed[hashed] = name
+        return hashed
+
+    def url(self, name: str, prefix: str = "/assets/") -> str:
+        rec = self._files.get(name)
+        return prefix + (rec["hashed"] if rec else name)
+
+    def rewrite(self, text: str, prefix: str = "/assets/") -> str:
+        """Point references to bundled files at their hashed names."""
+        for name in self._files:
+            text = text.replace(f"{prefix}{name}\"", f"{self.url(name, prefix)}\"")
+        return text
+
+    def response(self, name: str, headers: Headers) -> Optional[Response]:
+        """Serve a bundled file (plain or hashed name), or None if it isn't bundled."""
+        immutable = name in self._hashed
+        key = self._hashed.get(name, name)
+        rec = self._files.get(key)
+        if rec is None:
+            return None
+        etag = f'"{rec["hash"]}"'
+        out = {
+            "ETag": etag,
+            "Cache-Control": IMMUTABLE if immutable else REVALIDATE,
+            "Vary": "Accept-Encoding",
+        }
+        inm = headers.get("if-none-match")
+        if inm and any(t.strip() in (etag, f"W/{etag}", "*") for t in inm.split(",")):
+            return Response(status_code=304, headers=out)
+        enc = pick_encoding(headers.get("accept-encoding"), [e for e in ("br", "gzip") if e in rec])
+        if enc:
+            out["Content-Encoding"] = enc
+        return Response(content=rec[enc or "identity"], media_type=rec["mime"], headers=out)
+
+
+class BundledStaticFiles(StaticFiles):
+    """StaticFiles that answers from an AssetBundle first and falls back to the directory."""
+    def __init__(self, bundle: AssetBundle, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.bundle = bundle
+
+    async def get_response(self, path: str, scope: Dict[str, Any]) -> Response:
+        if scope.get("method") in ("GET", "HEAD"):
+            resp = self.bundle.response(path, Headers(scope=scope))
+            if resp is not None:
+                return resp
+        return await super().get_response(path, scope)
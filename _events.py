@@ -0,0 +1,112 @@
+# _events.py
+# Tiny in-process pub/sub used to push UI updates (SSE) instead of polling.
+
+from __future__ import annotations
+import asyncio
+import json
+import threading
+from typing import Any, AsyncIterator, Iterable, List, Optional, Set, Tuple
+
+HEARTBEAT_SEC = 15.0
+
+
+class Subscription:
+    """One SSE client. Lives on the event loop; fed thread-safely by EventHub.publish()."""
+    def __init__(self, hub: "EventHub", topics: Iterable[str], loop: asyncio.AbstractEventLoop, maxsize: int) -> None:
+        self.hub = hub
+        self.topics: Set[str] = set(topics)
+        self.loop = loop
+        self.queue: "asyncio.Queue[Tuple[str, Any]]" = asyncio.Queue(maxsize=maxsize)
+
+    def wants(self, topic: str) -> bool:
+        # "logs" matches "logs:SYNC", "logs:PLEX", ...
+        return topic in self.topics or topic.split(":", 1)[0] in self.topics
+
+    def _offer(self, item: Tuple[str, Any]) -> None:
+        # runs on the loop thread; slow consumers lose the oldest message, never block publishers
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            try:
+                self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            try:
+                self.queue.put_nowait(item)
+            except asyncio.QueueFull:
+                pass
+
+    def push(self, topic: str, data: Any) -> None:
+        """Deliver to this subscriber only (loop thread), e.g. its initial snapshot."""
+        self._offer((topic, data))
+
+    async def get(self, timeout: float) -> Optional[Tuple[str, Any]]:
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.hub.unsubscribe(self)
+
+
+class EventHub:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._subs: List[Subscription] = []
+
+    def subscribe(self, topics: Iterable[str], maxsize: int = 256) -> Subscription:
+        """Must be called from inside the running event loop (async handler / generator)."""
+        sub = Subscription(self, topics, asyncio.get_running_loop(), maxsize)
+        with self._lock:
+            self._subs.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            try:
+                self._subs.remove(sub)
+            except ValueError:
+                pass
+
+    def has_subscribers(self, topic: str) -> bool:
+        with self._lock:
+            return any(s.wants(topic) for s in self._subs)
+
+    def publish(self, topic: str, data: Any) -> None:
+        """Safe from any thread (sync workers, subprocess readers, the loop itself)."""
+        with self._lock:
+            subs = [s for s in self._subs if s.wants(topic)]
+        for s in subs:
+            try:
+                s.loop.call_soon_threadsafe(s._offer, (topic, data))
+            except RuntimeError:
+                # loop already closed (shutdown); drop the subscriber
+                self.unsubscribe(s)
+
+
+def sse_pack(data: Any, event: Optional[str] = None) -> str:
+    payload = data if isinstance(data, str) else json.dumps(data, separators=(",", ":"))
+    head = f"event: {event}\n" if event else ""
+    return head + "".join(f"data: {ln}\n" for ln in (payload.split("\n") or [""])) + "\n"
+
+
+async def sse_stream(
+    sub: Subscription,
+    initial: Iterable[Tuple[str, Any]] = (),
+    named: bool = True,
+    heartbeat: float = HEARTBEAT_SEC,
+) -> AsyncIterator[str]:
+    """Yield SSE frames for a subscription; comment heartbeats keep proxies from closing idle streams."""
+    try:
+        for topic, data in initial:
+            yield sse_pack(data, topic if named else None)
+        while True:
+            item = await sub.get(heartbeat)
+            if item is None:
+                yield ": ping\n\n"
+                continue
+            topic, data = item
+            yield sse_pack(data, topic if named else None)
+    finally:
+        sub.close()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+_monitor.py
+
+Background connectivity monitor. Each registered probe (Plex, SIMKL, GitHub
+releases, ...) runs on its own schedule in a small thread pool, so slow
+upstreams are checked concurrently and never inside a request. Request
+handlers only read the latest cached value.
+
+Scheduling: `interval` after a success, exponential backoff from `retry`
+up to `max_backoff` after consecutive failures, both with +/- jitter so
+restarts don't line probes up. A probe fails when it raises or returns a
+falsy value; `keep_last=True` keeps the last good value through failures
+(e.g. the latest release), otherwise the falsy value replaces it.
+`on_change(name, value)` fires whenever a probe's value changes.
+"""
+
+from __future__ import annotations
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_INTERVAL = 300
+DEFAULT_RETRY = 30
+DEFAULT_MAX_BACKOFF = 1800
+JITTER = 0.1  # +/- 10% on every delay
+
+
+class ConnectivityMonitor:
+    def __init__(
+        self,
+        on_change: Optional[Callable[[str, Any], None]] = None,
+        jitter: float = JITTER,
+    ) -> None:
+        self.on_change_cb = on_change
+        self.jitter = max(0.0, float(jitter))
+        self._lock = threading.Lock()
+        self._probes: Dict[str, Dict[str, Any]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+
+    def add(
+        self,
+        name: str,
+        fn: Callable[[], Any],
+        interval: int = DEFAULT_INTERVAL,
+        retry: int = DEFAULT_RETRY,
+        max_backoff: int = DEFAULT_MAX_BACKOFF,
+        keep_last: bool = False,
+    ) -> None:
+        with self._lock:
+            self._probes[name] = {
+                "fn": fn,
+                "interval": max(5, int(interval)),
+                "retry": max(1, int(retry)),
+                "max_backoff": max(1, int(max_backoff)),
+                "keep_last": bool(keep_last),
+                "value": None,
+                "ok": None,        # None until the first probe finished
+                "ts": 0.0,
+                "fails": 0,
+                "next": 0.0,       # due immediately
+                "running": False,
+                "again": False,    # kicked while running: probe once more right after
+            }
+
+    # ---- reads (cheap; called from request handlers) ----
+    def value(self, name: str, default: Any = None) -> Any:
+        with self._lock:
+            p = self._probes.get(name)
+            return default if p is None or p["ok"] is None or p["value"] is None else p["value"]
+
+    def status(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            return {
+                name: {
+                    "ok": p["ok"],
+                    "ts": int(p["ts"]),
+                    "fails": p["fails"],
+                    "next_in": max(0, int(p["next"] - now)),
+                }
+                for name, p in self._probes.items()
+            }
+
+    # ---- control ----
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, len(self._probes)), thread_name_prefix="probe")
+        self._thread = threading.Thread(target=self._loop, name="ConnectivityMonitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+        if self._pool:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    def kick(self, *names: str) -> None:
+        """Re-probe now (all probes when no names are given), e.g. after a token or config change."""
+        with self._lock:
+            for name in (names or tuple(self._probes)):
+                p = self._probes.get(name)
+                if p:
+                    p["next"] = 0.0
+                    p["fails"] = 0
+                    p["again"] = p["running"]
+        self._wake.set()
+
+    # ---- loop ----
+    def _delay(self, p: Dict[str, Any]) -> float:
+        if p["fails"]:
+            base = min(p["max_backoff"], p["retry"] * (2 ** (p["fails"] - 1)))
+        else:
+            base = p["interval"]
+        return base * (1.0 + random.uniform(-self.jitter, self.jitter))
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()  # before scanning, so a kick during the scan isn't lost
+            now = time.time()
+            due: List[str] = []
+            wait = 60.0
+            with self._lock:
+                for name, p in self._probes.items():
+                    if p["running"]:
+                        continue
+                    if p["next"] <= now:
+                        p["running"] = True
+                        due.append(name)
+                    else:
+                        wait = min(wait, p["next"] - now)
+            for name in due:
+                try:
+                    self._pool.submit(self._run, name)
+                except Exception:  # pool shut down under us
+                    return
+            self._wake.wait(max(0.05, wait))
+
+    def _run(self, name: str) -> None:
+        with self._lock:
+            p = self._probes[name]
+            fn = p["fn"]
+        try:
+            value = fn()
+        except Exception:
+            value = None
+        ok = bool(value)
+        with self._lock:
+            prev = p["value"]
+            first = p["ok"] is None
+            p["fails"] = 0 if ok else p["fails"] + 1
+            if ok or not p["keep_last"] or first:
+                p["value"] = value
+            p["ok"] = ok
+            p["ts"] = time.time()
+            p["next"] = 0.0 if p["again"] else p["ts"] + self._delay(p)
+            p["running"] = p["again"] = False
+            changed = first or p["value"] != prev
+            current = p["value"]
+        self._wake.set()  # reschedule
+        if changed and self.on_change_cb:
+            try:
+                self.on_change_cb(name, current)
+            except Exception:
+                pass
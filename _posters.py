@@ -0,0 +1,131 @@
+# _posters.py
+# Poster variants: resized WebP/AVIF thumbnails and tiny LQIP placeholders built from the cached TMDb JPEG.
+# Pillow is optional; without it (or without a codec) everything falls back to the original JPEG.
+
+from __future__ import annotations
+import base64
+import io
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from _TMDB import FLIGHT, atomic_write_bytes
+
+try:
+    from PIL import Image, ImageFilter, features
+except Exception:  # Pillow not installed
+    Image = None  # type: ignore[assignment]
+    ImageFilter = None  # type: ignore[assignment]
+    features = None  # type: ignore[assignment]
+
+# widths the UI actually renders: ~150-170px cards at 1x / 1.5x / 2x
+VARIANT_WIDTHS: Tuple[int, ...] = (160, 240, 342)
+LQIP_WIDTH = 16
+
+MIME = {"avif": "image/avif", "webp": "image/webp", "jpeg": "image/jpeg"}
+QUALITY = {"avif": 50, "webp": 72, "jpeg": 80}
+
+
+def _codec(fmt: str) -> bool:
+    if Image is None:
+        return False
+    if fmt == "jpeg":
+        return True
+    try:
+        return bool(features.check(fmt))
+    except Exception:
+        return False
+
+
+def supported_formats(allow_avif: bool = False) -> List[str]:
+    """Best first; 'jpeg' is always last and always there. AVIF is opt-in (slow to encode)."""
+    prefs = ("avif", "webp") if allow_avif else ("webp",)
+    return [f for f in prefs if _codec(f)] + ["jpeg"]
+
+
+def pick_format(accept: str, allow_avif: bool = False) -> str:
+    accept = (accept or "").lower()
+    for fmt in supported_formats(allow_avif):
+        if fmt == "jpeg" or MIME[fmt] in accept:
+            return fmt
+    return "jpeg"
+
+
+def snap_width(w: int) -> int:
+    """Round a requested width up to a known variant so the cache stays small."""
+    for vw in VARIANT_WIDTHS:
+        if w <= vw:
+            return vw
+    return VARIANT_WIDTHS[-1]
+
+
+def variant_path(src: Path, width: int, fmt: str) -> Path:
+    return src.with_name(f"{src.stem}.{width}.{'jpg' if fmt == 'jpeg' else fmt}")
+
+
+def get_variant(src: Path, width: int, fmt: str) -> Tuple[Path, str]:
+    """Resized copy of `src` in `fmt`, built once and kept next to it. Falls back to the source JPEG."""
+    if Image is None or not _codec(fmt):
+        return src, MIME["jpeg"]
+    width = snap_width(int(width))
+    out = variant_path(src, width, fmt)
+    if out.exists() and out.stat().st_mtime >= src.stat().st_mtime:
+        return out, MIME[fmt]
+
+    def _build() -> Path:
+        if out.exists() and out.stat().st_mtime >= src.stat().st_mtime:
+            return out
+        with Image.open(src) as im:
+            im = im.convert("RGB")
+            if im.width > width:
+                im = im.resize((width, max(1, round(im.height * width / im.width))), Image.LANCZOS)
+            buf = io.BytesIO()
+            im.save(buf, format=fmt.upper(), quality=QUALITY[fmt])
+        atomic_write_bytes(out, buf.getvalue())
+        return out
+
+    try:
+        return FLIGHT.do(("variant", str(out)), _build), MIME[fmt]
+    except Exception:
+        return src, MIME["jpeg"]
+
+
+def _lqip_file(src: Path) -> Path:
+    return src.with_name(f"{src.stem}.lqip.txt")
+
+
+def peek_lqip(src: Path) -> Optional[str]:
+    """Cached placeholder data URI, or None (cache-only)."""
+    try:
+        return _lqip_file(src).read_text(encoding="ascii").strip() or None
+    except Exception:
+        return None
+
+
+def make_lqip(src: Path) -> Optional[str]:
+    """~16px blurred WebP/JPEG as a data: URI (a few hundred bytes), cached next to the poster."""
+    hit = peek_lqip(src)
+    if hit or Image is None:
+        return hit
+    try:
+        fmt = "webp" if _codec("webp") else "jpeg"
+        with Image.open(src) as im:
+            im = im.convert("RGB")
+            im = im.resize((LQIP_WIDTH, max(1, round(im.height * LQIP_WIDTH / im.width))), Image.BILINEAR)
+            im = im.filter(ImageFilter.GaussianBlur(1))
+            buf = io.BytesIO()
+            im.save(buf, format=fmt.upper(), quality=30)
+        uri = f"data:{MIME[fmt]};base64," + base64.b64encode(buf.getvalue()).decode("ascii")
+        atomic_write_bytes(_lqip_file(src), uri.encode("ascii"))
+        return uri
+    except Exception:
+        return None
+
+
+def warm_variants(src: Path, allow_avif: bool = False) -> None:
+    """Pre-build the LQIP and the preferred-format thumbnails for every UI width."""
+    if Image is None:
+        return
+    make_lqip(src)
+    fmt = supported_formats(allow_avif)[0]
+    for w in VARIANT_WIDTHS:
+        get_variant(src, w, fmt)
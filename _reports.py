@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+_reports.py
+
+Sync report store. Each run still gets its own sync_reports/sync-YYYYmmdd-HHMMSS.json,
+but lookups go through an append-only index (index.jsonl, one summary row per line,
+later lines for the same id patch earlier ones) that is loaded once and kept in memory.
+History pages are slices of that list, independent of how many runs ever happened.
+
+Retention (config "reports": {"keep_days": 90, "keep_max": 1000}) moves older runs into
+per-day rollups (rollups.json) and deletes their files; the index is then compacted.
+"""
+
+from __future__ import annotations
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_KEEP_DAYS = 90
+DEFAULT_KEEP_MAX = 1000
+INDEX_NAME = "index.jsonl"
+ROLLUPS_NAME = "rollups.json"
+
+# fields copied from a report into its index row
+ROW_FIELDS = (
+    "started_at", "finished_at", "duration_sec", "result", "exit_code",
+    "plex_pre", "simkl_pre", "plex_post", "simkl_post", "added_last", "removed_last",
+)
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _epoch_of_id(rid: str) -> int:
+    try:
+        return int(datetime.strptime(rid[5:], "%Y%m%d-%H%M%S").replace(tzinfo=timezone.utc).timestamp())
+    except Exception:
+        return 0
+
+
+class ReportStore:
+    def __init__(self, report_dir: Path, load_config: Optional[Callable[[], Dict[str, Any]]] = None) -> None:
+        self.dir = Path(report_dir)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.dir / INDEX_NAME
+        self.rollups_path = self.dir / ROLLUPS_NAME
+        self.load_config_cb = load_config
+        self.lock = threading.Lock()
+        self._rows: List[Dict[str, Any]] = []   # oldest -> newest
+        self._pos: Dict[str, int] = {}          # id -> position in _rows
+        self._index_lines = 0
+        self._load()
+
+    # ---- index ----
+    def _load(self) -> None:
+        rows: Dict[str, Dict[str, Any]] = {}
+        lines = 0
+        if self.index_path.exists():
+            with self.index_path.open("r", encoding="utf-8") as f:
+                for ln in f:
+                    ln = ln.strip()
+                    if not ln:
+                        continue
+                    try:
+                        r = json.loads(ln)
+                    except Exception:
+                        continue  # torn last line after a crash
+                    lines += 1
+                    rid = r.get("id")
+                    if not rid:
+                        continue
+                    if r.get("deleted"):
+                        rows.pop(rid, None)
+                    else:
+                        rows.setdefault(rid, {}).update(r)
+        else:
+            # first start with the store: index whatever reports are already on disk (one-off)
+            for p in sorted(self.dir.glob("sync-*.json")):
+                try:
+                    d = json.loads(p.read_text(encoding="utf-8"))
+                except Exception:
+                    continue
+                rows[p.stem] = self._row(p.stem, d)
+        self._rows = sorted(rows.values(), key=lambda r: (int(r.get("ts") or 0), r["id"]))
+        self._pos = {r["id"]: i for i, r in enumerate(self._rows)}
+        self._index_lines = lines
+        if not self.index_path.exists() or lines > 2 * len(self._rows) + 16:
+            self._rewrite_index()
+
+    def _row(self, rid: str, report: Dict[str, Any]) -> Dict[str, Any]:
+        row = {"id": rid, "ts": _epoch_of_id(rid)}
+        for k in ROW_FIELDS:
+            if k in report:
+                row[k] = report.get(k)
+        return row
+
+    def _append_index(self, row: Dict[str, Any]) -> None:
+        with self.index_path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(row, separators=(",", ":")) + "\n")
+        self._index_lines += 1
+
+    def _rewrite_index(self) -> None:
+        _atomic_write(self.index_path, "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in self._rows))
+        self._index_lines = len(self._rows)
+
+    # ---- writes ----
+    def add(self, report: Dict[str, Any]) -> str:
+        """Persist one run; returns its id (sync-YYYYmmdd-HHMMSS, suffixed if the second is taken)."""
+        with self.lock:
+            rid = "sync-" + datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+            base, n = rid, 1
+            while rid in self._pos or (self.dir / f"{rid}.json").exists():
+                n += 1
+                rid = f"{base}-{n}"
+            _atomic_write(self.dir / f"{rid}.json", json.dumps(report, indent=2))
+            row = self._row(rid, report)
+            row["ts"] = int(time.time())
+            self._rows.append(row)
+            self._pos[rid] = len(self._rows) - 1
+            self._append_index(row)
+            self._apply_retention()
+            return rid
+
+    def patch(self, rid: Optional[str], **fields: Any) -> bool:
+        """Add fields to a stored run (report file + an index patch line)."""
+        if not rid:
+            return False
+        with self.lock:
+            i = self._pos.get(rid)
+            if i is None:
+                return False
+            p = self.dir / f"{rid}.json"
+            try:
+                d = json.loads(p.read_text(encoding="utf-8"))
+            except Exception:
+                d = {}
+            d.update(fields)
+            _atomic_write(p, json.dumps(d, indent=2))
+            self._rows[i].update({k: v for k, v in fields.items() if k in ROW_FIELDS})
+            self._append_index({"id": rid, **{k: v for k, v in fields.items() if k in ROW_FIELDS}})
+            return True
+
+    # ---- reads ----
+    def latest_id(self) -> Optional[str]:
+        with self.lock:
+            return self._rows[-1]["id"] if self._rows else None
+
+    def history(self, limit: int = 10, before: Optional[str] = None) -> Dict[str, Any]:
+        """Newest-first page of index rows; pass the returned `next` as `before` for the next page."""
+        limit = max(1, min(int(limit), 500))
+        with self.lock:
+            end = self._pos.get(before, len(self._rows)) if before else len(self._rows)
+            start = max(0, end - limit)
+            page = [dict(r) for r in reversed(self._rows[start:end])]
+            nxt = self._rows[start]["id"] if start > 0 else None
+            total = len(self._rows)
+        return {"items": page, "next": nxt, "total": total}
+
+    def get(self, rid: str) -> Optional[Dict[str, Any]]:
+        if rid not in self._pos:
+            return None
+        try:
+            return json.loads((self.dir / f"{rid}.json").read_text(encoding="utf-8"))
+        except Exception:
+            return None
+
+    def rollups(self) -> Dict[str, Any]:
+        try:
+            return json.loads(self.rollups_path.read_text(encoding="utf-8"))
+        except Exception:
+            return {}
+
+    # ---- retention ----
+    def _limits(self) -> Dict[str, int]:
+        cfg: Dict[str, Any] = {}
+        if self.load_config_cb:
+            try:
+                cfg = (self.load_config_cb() or {}).get("reports") or {}
+            except Exception:
+                cfg = {}
+        return {
+            "keep_days": int(cfg.get("keep_days") or DEFAULT_KEEP_DAYS),
+            "keep_max": int(cfg.get("keep_max") or DEFAULT_KEEP_MAX),
+        }
+
+    def _apply_retention(self) -> int:
+        lim = self._limits()
+        cutoff = int(time.time()) - lim["keep_days"] * 86400
+        drop = 0
+        while drop < len(self._rows) and (
+            len(self._rows) - drop > lim["keep_max"] or int(self._rows[drop].get("ts") or 0) < cutoff
+        ):
+            drop += 1
+        if not drop:
+            return 0
+
+        rolled = self.rollups()
+        for r in self._rows[:drop]:
+            day = datetime.fromtimestamp(int(r.get("ts") or 0), timezone.utc).strftime("%Y-%m-%d")
+            d = rolled.setdefault(day, {"runs": 0, "ok": 0, "failed": 0, "added": 0, "removed": 0, "duration_sec": 0.0})
+            d["runs"] += 1
+            if r.get("exit_code") == 0:
+                d["ok"] += 1
+            else:
+                d["failed"] += 1
+            d["added"] += int(r.get("added_last") or 0)
+            d["removed"] += int(r.get("removed_last") or 0)
+            d["duration_sec"] = round(float(d["duration_sec"]) + float(r.get("duration_sec") or 0), 2)
+        _atomic_write(self.rollups_path, json.dumps(rolled, indent=2, sort_keys=True))
+
+        for r in self._rows[:drop]:
+            try:
+                (self.dir / f"{r['id']}.json").unlink()
+            except OSError:
+                pass
+        self._rows = self._rows[drop:]
+        self._pos = {r["id"]: i for i, r in enumerate(self._rows)}
+        self._rewrite_index()  # compaction: live rows only, patches folded in
+        return drop
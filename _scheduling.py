@@ -58,11 +58,13 @@ class SyncScheduler:
         save_config: Callable[[Dict[str, Any]], None],
         run_sync_fn: Callable[[], bool],
         is_sync_running_fn: Optional[Callable[[], bool]] = None,
+        on_status: Optional[Callable[[Dict[str, Any]], None]] = None,
     ) -> None:
         self.load_config_cb = load_config
         self.save_config_cb = save_config
         self.run_sync_fn = run_sync_fn
         self.is_sync_running_fn = is_sync_running_fn or (lambda: False)
+        self.on_status_cb = on_status
 
         self._thread: Optional[threading.Thread] = None
         self._stop = threading.Event()
@@ -98,6 +100,22 @@ class SyncScheduler:
         st["config"] = self._get_sched_cfg()
         return st
 
+    def _set_status(self, **kw: Any) -> None:
+        # last_tick alone is not worth a push; anything else is
+        with self._lock:
+            changed = any(self._status.get(k) != v for k, v in kw.items() if k != "last_tick")
+            self._status.update(kw)
+        if changed:
+            self.notify()
+
+    def notify(self) -> None:
+        if not self.on_status_cb:
+            return
+        try:
+            self.on_status_cb(self.status())
+        except Exception:
+            pass
+
     # ---- control ----
     def start(self) -> None:
         if self._thread and self._thread.is_alive():
@@ -122,16 +140,13 @@ class SyncScheduler:
 
     # ---- internals ----
     def _loop(self) -> None:
-        with self._lock:
-            self._status["running"] = True
+        self._set_status(running=True)
         try:
             while not self._stop.is_set():
                 now = datetime.now()
                 sch = self._get_sched_cfg()
                 nxt = compute_next_run(now, sch)
-                with self._lock:
-                    self._status["last_tick"] = int(time.time())
-                    self._status["next_run_at"] = int(nxt.timestamp())
+                self._set_status(last_tick=int(time.time()), next_run_at=int(nxt.timestamp()))
 
                 while True:
                     if self._stop.is_set(): break
@@ -144,17 +159,13 @@ class SyncScheduler:
                             try:
                                 ok = bool(self.run_sync_fn())
                             finally:
-                                with self._lock:
-                                    self._status["last_run_ok"] = ok
-                                    self._status["last_run_at"] = int(time.time())
+                                self._set_status(last_run_ok=ok, last_run_at=int(time.time()))
                         # compute next slot
                         nxt = compute_next_run(datetime.now(), sch)
-                        with self._lock:
-                            self._status["next_run_at"] = int(nxt.timestamp())
+                        self._set_status(next_run_at=int(nxt.timestamp()))
                     # sleep small
                     rem = max(0.0, (nxt - datetime.now()).total_seconds())
                     time.sleep(min(30.0, rem if rem > 0 else 0.5))
                 time.sleep(0.2)
         finally:
-            with self._lock:
-                self._status["running"] = False
+            self._set_status(running=False)
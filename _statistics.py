@@ -1,14 +1,29 @@
 # _statistics.py
 from __future__ import annotations
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Set
+from typing import Callable, Dict, Any, List, Optional, Set, Tuple
 from datetime import datetime, timezone
-import json, time, threading
+from bisect import bisect_left, bisect_right
+import json, os, time, threading
 
 ROOT = Path(__file__).resolve().parent
 CONFIG_BASE = Path("/config") if str(ROOT).startswith("/app") else ROOT
 STATS_PATH = CONFIG_BASE / "statistics.json"
 
+# Full history lives in an append-only log next to statistics.json (statistics.log.jsonl);
+# statistics.json is a checkpoint: current snapshot, rollups and short tails for older readers, plus
+# `log_offset`, the log size the rollups cover. On load, log rows past that offset are replayed into
+# the rollups, so a crash between a log append and the next checkpoint never leaves them behind.
+TAIL_EVENTS = 250
+TAIL_SAMPLES = 500
+RAW_RETENTION_DAYS = 400
+BUCKETS = {"hour": 3600, "day": 86400, "week": 7 * 86400}
+HOUR_BUCKETS_KEEP_DAYS = 31
+
+# watch-time guesses for titles without a known TMDb runtime
+FALLBACK_MINUTES = {"movie": 115, "tv": 45}
+SAVE_DELAY_SEC = 5.0  # coalesce bursts of runtime updates (warm-up) into one write
+
 def _read_json(p: Path) -> Dict[str, Any]:
     try:
         with p.open("r", encoding="utf-8") as f:
@@ -24,10 +39,28 @@ def _write_json_atomic(p: Path, data: Dict[str, Any]) -> None:
     tmp.replace(p)
 
 class Stats:
-    def __init__(self, path: Optional[Path] = None) -> None:
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        runtime_lookup: Optional[Callable[[str, int], Optional[int]]] = None,
+    ) -> None:
         self.path = Path(path) if path else STATS_PATH
         self.lock = threading.Lock()
         self.data: Dict[str, Any] = {}
+        # (typ, tmdb_id) -> cached runtime minutes or None; must not hit the network
+        self.runtime_lookup = runtime_lookup
+        self._tmdb_index: Dict[Tuple[str, int], List[str]] = {}
+        self._tmdb_index_of: Optional[int] = None
+        self._sides: Optional[Dict[str, Dict[str, str]]] = None
+        self._by_ck: Dict[str, Dict[str, Dict[str, Dict[str, Any]]]] = {}
+        self._save_timer: Optional[threading.Timer] = None
+        self.log_path = self.path.with_name(self.path.stem + ".log.jsonl")
+        # sorted in-memory index over the log (bisect for point/range lookups)
+        self._s_ts: List[int] = []
+        self._s_cnt: List[int] = []
+        self._events: List[Dict[str, Any]] = []
+        self._e_ts: List[int] = []
+        self._log_size = 0
         self._load()
 
     def _load(self) -> None:
@@ -40,11 +73,169 @@ class Stats:
         d.setdefault("counters", {"added": 0, "removed": 0})
         d.setdefault("last_run", {"added": 0, "removed": 0, "ts": 0})
         self.data = d
+        self._load_log()
+
+    # ---- append-only log ----
+    def _load_log(self) -> None:
+        samples: List[Tuple[int, int]] = []
+        events: List[Dict[str, Any]] = []
+        # rows the checkpointed rollups don't cover yet (None: rebuild them from the whole log)
+        tail_samples: Optional[List[Tuple[int, int]]] = []
+        tail_events: List[Dict[str, Any]] = []
+        offset = self.data.get("log_offset")
+        if self.log_path.exists():
+            pos = 0
+            with self.log_path.open("rb") as f:
+                for ln in f:
+                    start, pos = pos, pos + len(ln)
+                    try:
+                        r = json.loads(ln)
+                    except Exception:
+                        continue  # torn last line after a crash
+                    tail = isinstance(offset, int) and start >= offset
+                    if r.pop("t", None) == "s":
+                        samples.append((int(r.get("ts") or 0), int(r.get("count") or 0)))
+                        if tail:
+                            tail_samples.append(samples[-1])
+                    else:
+                        events.append(r)
+                        if tail:
+                            tail_events.append(r)
+            self._log_size = pos
+            if isinstance(offset, int) and offset > pos:
+                tail_samples = None  # log was replaced/truncated under the checkpoint
+            seeded = False
+        else:
+            # first start with the log: seed it from what statistics.json kept so far
+            samples = [(int(r.get("ts") or 0), int(r.get("count") or 0)) for r in (self.data.get("samples") or [])]
+            events = [dict(e) for e in (self.data.get("events") or [])]
+            seeded = True
+
+        cutoff = int(time.time()) - RAW_RETENTION_DAYS * 86400
+        expired = any(t < cutoff for t, _ in samples) or any(int(e.get("ts") or 0) < cutoff for e in events)
+        samples = sorted(x for x in samples if x[0] >= cutoff)
+        events = sorted((e for e in events if int(e.get("ts") or 0) >= cutoff), key=lambda e: int(e.get("ts") or 0))
+        self._s_ts = [t for t, _ in samples]
+        self._s_cnt = [c for _, c in samples]
+        self._events = events
+        self._e_ts = [int(e.get("ts") or 0) for e in events]
+
+        if not isinstance(self.data.get("rollups"), dict) or tail_samples is None:
+            self.data["rollups"] = {}
+            tail_samples, tail_events = samples, events
+        for t, c in tail_samples:
+            self._rollup_sample(t, c)
+        for e in tail_events:
+            self._rollup_event(e)
+        if seeded or expired:
+            self._rewrite_log()
+        if (seeded and self.path.exists()) or expired or tail_samples or tail_events or (offset is not None and offset != self._log_size):
+            self._save()  # checkpoint what was replayed
+
+    def _log_rows(self) -> List[Dict[str, Any]]:
+        rows = [{"t": "s", "ts": t, "count": c} for t, c in zip(self._s_ts, self._s_cnt)]
+        rows += [{"t": "e", **e} for e in self._events]
+        rows.sort(key=lambda r: int(r.get("ts") or 0))
+        return rows
+
+    def _rewrite_log(self) -> None:
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.log_path.with_name(self.log_path.name + ".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            for r in self._log_rows():
+                f.write(json.dumps(r, separators=(",", ":")) + "\n")
+            self._log_size = f.tell()
+        tmp.replace(self.log_path)
+
+    def _append_log(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.log_path.open("a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(r, separators=(",", ":")) + "\n" for r in rows))
+            f.flush()
+            os.fsync(f.fileno())
+            self._log_size = f.tell()
+
+    # ---- rollups: per hour/day/week bucket {n, min, max, last, added, removed} ----
+    def _bucket(self, kind: str, ts: int) -> Dict[str, Any]:
+        size = BUCKETS[kind]
+        start = ts - (ts % size) if kind != "week" else ts - ((ts - 4 * 86400) % size)  # weeks start on Monday
+        table = self.data["rollups"].setdefault(kind, {})
+        return table.setdefault(str(start), {"n": 0, "min": None, "max": None, "last": None, "added": 0, "removed": 0})
+
+    def _rollup_sample(self, ts: int, count: int) -> None:
+        for kind in BUCKETS:
+            b = self._bucket(kind, ts)
+            b["n"] += 1
+            b["min"] = count if b["min"] is None else min(b["min"], count)
+            b["max"] = count if b["max"] is None else max(b["max"], count)
+            b["last"] = count
+
+    def _rollup_event(self, e: Dict[str, Any]) -> None:
+        k = "added" if e.get("action") == "add" else ("removed" if e.get("action") == "remove" else None)
+        if k:
+            for kind in BUCKETS:
+                self._bucket(kind, int(e.get("ts") or 0))[k] += 1
+
+    def _add_sample(self, ts: int, count: int) -> None:
+        if not self._s_ts or ts >= self._s_ts[-1]:
+            self._s_ts.append(ts); self._s_cnt.append(count)
+        else:
+            i = bisect_right(self._s_ts, ts)
+            self._s_ts.insert(i, ts); self._s_cnt.insert(i, count)
+        self._rollup_sample(ts, count)
+        self._append_log([{"t": "s", "ts": ts, "count": count}])
+
+    def _add_events(self, evs: List[Dict[str, Any]]) -> None:
+        for e in evs:
+            ts = int(e.get("ts") or 0)
+            if not self._e_ts or ts >= self._e_ts[-1]:
+                self._e_ts.append(ts); self._events.append(e)
+            else:
+                i = bisect_right(self._e_ts, ts)
+                self._e_ts.insert(i, ts); self._events.insert(i, e)
+            self._rollup_event(e)
+        self._append_log([{"t": "e", **e} for e in evs])
 
     def _save(self) -> None:
         self.data["generated_at"] = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        # statistics.json stays small: tails only, history is in the log
+        self.data["samples"] = [{"ts": t, "count": c} for t, c in zip(self._s_ts[-TAIL_SAMPLES:], self._s_cnt[-TAIL_SAMPLES:])]
+        self.data["events"] = self._events[-TAIL_EVENTS:]
+        hours = self.data.get("rollups", {}).get("hour") or {}
+        floor = int(time.time()) - HOUR_BUCKETS_KEEP_DAYS * 86400
+        for k in [k for k in hours if int(k) < floor]:
+            del hours[k]
+        self.data["log_offset"] = self._log_size
         _write_json_atomic(self.path, self.data)
 
+    def reset(self) -> None:
+        """Wipe all statistics (snapshot, log, rollups)."""
+        with self.lock:
+            self.data = {
+                "events": [],
+                "samples": [],
+                "current": {},
+                "counters": {"added": 0, "removed": 0},
+                "last_run": {"added": 0, "removed": 0, "ts": 0},
+                "rollups": {},
+            }
+            self._s_ts, self._s_cnt, self._events, self._e_ts = [], [], [], []
+            self._sides, self._by_ck = None, {}
+            self._rewrite_log()
+            self._save()
+
+    def _save_soon(self) -> None:
+        if self._save_timer is not None and self._save_timer.is_alive():
+            return
+        def _flush() -> None:
+            with self.lock:
+                self._save()
+        self._save_timer = threading.Timer(SAVE_DELAY_SEC, _flush)
+        self._save_timer.daemon = True
+        self._save_timer.start()
+
     @staticmethod
     def _title_of(d: Dict[str, Any]) -> str:
         return (d.get("title") or d.get("name") or d.get("original_title") or d.get("original_name") or "").strip()
@@ -141,42 +332,193 @@ class Stats:
         return out
 
     @staticmethod
-    def _union_keys(state: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
-        plex = (state.get("plex", {}) or {}).get("items", {}) or {}
-        simkl = (state.get("simkl", {}) or {}).get("items", {}) or {}
+    def _tmdb_of(ids: Dict[str, Any]) -> Optional[int]:
+        try:
+            return int(ids.get("tmdb")) if ids.get("tmdb") is not None else None
+        except Exception:
+            return None
 
-        out: Dict[str, Dict[str, Any]] = {}
-        simkl_index: Dict[str, Dict[str, Any]] = {}
-
-        for _, raw in simkl.items():
-            ids = Stats._extract_ids(raw)
-            typ = (raw.get("type") or "").lower()
-            ck = Stats._canon_from_ids(ids, typ) or Stats._fallback_key(raw)
-            if not ck:
-                continue
-            simkl_index[ck] = {"src": "simkl", "title": Stats._title_of(raw), "type": typ}
-
-        for _, raw in plex.items():
-            ids = Stats._extract_ids(raw)
-            typ = (raw.get("type") or "").lower()
-            ck = Stats._canon_from_ids(ids, typ) or Stats._fallback_key(raw)
-            if not ck:
-                continue
-            if ck in simkl_index:
-                s = simkl_index.pop(ck)
-                out[ck] = {
-                    "src": "both",
-                    "title": Stats._title_of(raw) or s.get("title") or "",
-                    "type": typ or s.get("type") or "",
-                }
-            else:
-                out[ck] = {"src": "plex", "title": Stats._title_of(raw), "type": typ}
+    @staticmethod
+    def canonical_key(raw: Dict[str, Any]) -> Optional[str]:
+        """The key Stats counts a state item under (imdb > tmdb > tvdb > simkl > title/year), or None."""
+        return Stats._canon_from_ids(Stats._extract_ids(raw), (raw.get("type") or "").lower()) or Stats._fallback_key(raw)
+
+    @staticmethod
+    def _side_meta(raw: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        ck = Stats.canonical_key(raw)
+        if not ck:
+            return None
+        return ck, {"title": Stats._title_of(raw), "type": (raw.get("type") or "").lower(), "tmdb": Stats._tmdb_of(Stats._extract_ids(raw))}
 
-        for ck, s in simkl_index.items():
-            out[ck] = {"src": "simkl", "title": s.get("title") or "", "type": s.get("type") or ""}
+    @staticmethod
+    def _merge_sides(p: Optional[Dict[str, Any]], s: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if p and s:
+            return {
+                "src": "both",
+                "title": p.get("title") or s.get("title") or "",
+                "type": p.get("type") or s.get("type") or "",
+                "tmdb": p.get("tmdb") or s.get("tmdb"),
+            }
+        if p:
+            return {"src": "plex", **p}
+        if s:
+            return {"src": "simkl", **s, "title": s.get("title") or "", "type": s.get("type") or ""}
+        return None
 
+    @staticmethod
+    def _union_keys(state: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        by_side: Dict[str, Dict[str, Dict[str, Any]]] = {"plex": {}, "simkl": {}}
+        for side in ("plex", "simkl"):
+            for _, raw in (((state.get(side, {}) or {}).get("items", {})) or {}).items():
+                m = Stats._side_meta(raw)
+                if m:
+                    by_side[side][m[0]] = m[1]
+        out: Dict[str, Dict[str, Any]] = {}
+        for ck in {**dict.fromkeys(by_side["plex"]), **dict.fromkeys(by_side["simkl"])}:
+            out[ck] = Stats._merge_sides(by_side["plex"].get(ck), by_side["simkl"].get(ck))  # type: ignore[assignment]
         return out
 
+    # ---- per-side index (state key -> canonical key), kept in memory for delta refreshes ----
+    def _build_sides(self, state: Dict[str, Any]) -> None:
+        self._sides = {"plex": {}, "simkl": {}}
+        self._by_ck = {}
+        for side in ("plex", "simkl"):
+            for sk, raw in (((state.get(side, {}) or {}).get("items", {})) or {}).items():
+                self._side_put(side, sk, raw)
+
+    def _side_put(self, side: str, sk: str, raw: Dict[str, Any]) -> Optional[str]:
+        m = self._side_meta(raw or {})
+        if not m:
+            return None
+        self._sides[side][sk] = m[0]
+        self._by_ck.setdefault(m[0], {"plex": {}, "simkl": {}})[side][sk] = m[1]
+        return m[0]
+
+    def _side_pop(self, side: str, sk: str) -> Optional[str]:
+        ck = self._sides[side].pop(sk, None)
+        if ck is not None:
+            refs = self._by_ck.get(ck) or {}
+            (refs.get(side) or {}).pop(sk, None)
+            if refs and not refs["plex"] and not refs["simkl"]:
+                self._by_ck.pop(ck, None)
+        return ck
+
+    def _src_of(self, ck: str) -> Optional[str]:
+        refs = self._by_ck.get(ck) or {}
+        p, s = bool(refs.get("plex")), bool(refs.get("simkl"))
+        return "both" if p and s else ("plex" if p else ("simkl" if s else None))
+
+    def _union_entry(self, ck: str) -> Optional[Dict[str, Any]]:
+        refs = self._by_ck.get(ck)
+        if not refs:
+            return None
+        p = next(reversed(refs["plex"].values()), None) if refs["plex"] else None
+        s = next(reversed(refs["simkl"].values()), None) if refs["simkl"] else None
+        return self._merge_sides(p, s)
+
+    def _apply_side_delta(self, state: Dict[str, Any], delta: Dict[str, Any]) -> Set[str]:
+        """Fold per-side added/removed state keys into the index; returns the canonical keys touched."""
+        touched: Set[str] = set()
+        for side in ("plex", "simkl"):
+            d = delta.get(side) or {}
+            items = ((state.get(side) or {}).get("items") or {})
+            for sk in d.get("removed") or []:
+                ck = self._side_pop(side, sk)
+                if ck:
+                    touched.add(ck)
+            for sk in d.get("added") or []:
+                raw = items.get(sk)
+                if raw is None:
+                    continue
+                old = self._side_pop(side, sk)
+                if old:
+                    touched.add(old)
+                ck = self._side_put(side, sk, raw)
+                if ck:
+                    touched.add(ck)
+        return touched
+
+    # ---- watch time (kept incrementally; /api/insights reads it as-is) ----
+    @staticmethod
+    def _wt_kind(entry: Dict[str, Any]) -> str:
+        return "movie" if (entry.get("type") or "") == "movie" else "tv"
+
+    def _wt_apply(self, entry: Dict[str, Any], sign: int) -> None:
+        wt = self.data["watchtime"]
+        kind = self._wt_kind(entry)
+        wt["movies" if kind == "movie" else "shows"] += sign
+        m = entry.get("minutes")
+        if isinstance(m, int) and m > 0:
+            wt["known"] += sign
+            wt["known_minutes"] += sign * m
+        else:
+            wt["unknown"] += sign
+            wt["fallback_minutes"] += sign * FALLBACK_MINUTES[kind]
+
+    def _lookup_minutes(self, entry: Dict[str, Any]) -> Optional[int]:
+        if not self.runtime_lookup or not entry.get("tmdb"):
+            return None
+        try:
+            m = self.runtime_lookup(self._wt_kind(entry), int(entry["tmdb"]))
+            return int(m) if isinstance(m, (int, float)) and m > 0 else None
+        except Exception:
+            return None
+
+    def _rebuild_watchtime(self) -> None:
+        self.data["watchtime"] = {"movies": 0, "shows": 0, "known": 0, "known_minutes": 0, "unknown": 0, "fallback_minutes": 0}
+        for entry in (self.data.get("current") or {}).values():
+            self._wt_apply(entry, +1)
+
+    def _ensure_watchtime(self) -> Dict[str, Any]:
+        if not isinstance(self.data.get("watchtime"), dict):
+            self._rebuild_watchtime()
+        return self.data["watchtime"]
+
+    def _index(self) -> Dict[Tuple[str, int], List[str]]:
+        cur = self.data.get("current") or {}
+        if self._tmdb_index_of != id(cur):
+            idx: Dict[Tuple[str, int], List[str]] = {}
+            for k, e in cur.items():
+                if e.get("tmdb"):
+                    idx.setdefault((self._wt_kind(e), int(e["tmdb"])), []).append(k)
+            self._tmdb_index, self._tmdb_index_of = idx, id(cur)
+        return self._tmdb_index
+
+    def on_runtime(self, typ: str, tmdb_id: int, minutes: Optional[int]) -> None:
+        """TMDb metadata arrived for a title: fold its runtime into the aggregate."""
+        minutes = int(minutes) if isinstance(minutes, (int, float)) and minutes > 0 else None
+        with self.lock:
+            keys = self._index().get(("movie" if typ == "movie" else "tv", int(tmdb_id))) or []
+            if not keys:
+                return
+            self._ensure_watchtime()
+            cur = self.data.get("current") or {}
+            changed = False
+            for k in keys:
+                e = cur.get(k)
+                if e is None or e.get("minutes") == minutes:
+                    continue
+                self._wt_apply(e, -1)
+                e["minutes"] = minutes
+                self._wt_apply(e, +1)
+                changed = True
+            if changed:
+                self._save_soon()
+
+    def watchtime(self) -> Dict[str, Any]:
+        with self.lock:
+            wt = dict(self._ensure_watchtime())
+        total = int(wt["known_minutes"]) + int(wt["fallback_minutes"])
+        method = "tmdb" if wt["known"] and not wt["unknown"] else ("mixed" if wt["known"] else "fallback")
+        return {
+            "movies": int(wt["movies"]),
+            "shows": int(wt["shows"]),
+            "minutes": total,
+            "hours": round(total / 60, 1),
+            "days": round(total / 60 / 24, 1),
+            "method": method,
+        }
+
     def _counts_by_source(self, cur: Dict[str, Any]) -> Dict[str, int]:
         plex_only = simkl_only = both = 0
         for v in (cur or {}).values():
@@ -193,7 +535,7 @@ class Stats:
         }
 
     def _totals_from_events(self) -> dict:
-        ev = list(self.data.get("events") or [])
+        ev = self._events
         adds = sum(1 for e in ev if (e or {}).get("action") == "add")
         rems = sum(1 for e in ev if (e or {}).get("action") == "remove")
         return {"added": adds, "removed": rems}
@@ -209,69 +551,141 @@ class Stats:
         return self.data["counters"]
 
     def _count_at(self, ts_floor: int) -> int:
-        samples: List[Dict[str, Any]] = list(self.data.get("samples") or [])
-        if not samples:
-            return 0
-        samples.sort(key=lambda r: int(r.get("ts") or 0))
-        best = None
-        for r in samples:
-            t = int(r.get("ts") or 0)
-            if t <= ts_floor:
-                best = r
-            else:
-                break
-        if best is None:
-            best = samples[0]
-        try:
-            return int(best.get("count") or 0)
-        except Exception:
+        # last sample at or before ts_floor (or the oldest one we have)
+        if not self._s_cnt:
             return 0
+        i = bisect_right(self._s_ts, ts_floor) - 1
+        return int(self._s_cnt[max(0, i)])
 
-    def refresh_from_state(self, state: Dict[str, Any]) -> Dict[str, Any]:
+    # ---- range queries ----
+    def range(self, start: int, end: int, bucket: str = "raw") -> List[Dict[str, Any]]:
+        """Samples in [start, end]: raw points, or hour/day/week rollups."""
+        with self.lock:
+            if bucket == "raw":
+                lo, hi = bisect_left(self._s_ts, start), bisect_right(self._s_ts, end)
+                return [{"ts": t, "count": c} for t, c in zip(self._s_ts[lo:hi], self._s_cnt[lo:hi])]
+            table = (self.data.get("rollups") or {}).get(bucket) or {}
+            keys = sorted(int(k) for k in table if start - BUCKETS[bucket] < int(k) <= end)
+            return [{"ts": k, **table[str(k)]} for k in keys]
+
+    def events_range(self, start: int, end: int, limit: int = 500) -> List[Dict[str, Any]]:
+        """Events in [start, end], newest first."""
+        with self.lock:
+            lo, hi = bisect_left(self._e_ts, start), bisect_right(self._e_ts, end)
+            return [dict(e) for e in reversed(self._events[max(lo, hi - max(1, int(limit))):hi])]
+
+    def samples_tail(self, n: int) -> List[Dict[str, Any]]:
+        with self.lock:
+            n = max(0, int(n))
+            return [{"ts": t, "count": c} for t, c in zip(self._s_ts[-n:], self._s_cnt[-n:])] if n else []
+
+    def _windows(self, now: int) -> Dict[str, Any]:
+        return {
+            "now": len(self.data.get("current") or {}),
+            "week": self._count_at(now - 7*86400),
+            "month": self._count_at(now - 30*86400),
+        }
+
+    def refresh_from_state(self, state: Dict[str, Any], delta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Bring `current` in line with a state snapshot.
+
+        Unchanged state (same checksum as last time) is a no-op. A state whose `delta`
+        was computed against the checksum we last saw (or an explicit `delta`, e.g. after
+        a single delete) only touches the keys it names; anything else rebuilds from scratch.
+        """
         now = int(time.time())
+        state = state or {}
         with self.lock:
-            prev = {k: dict(v) for k, v in (self.data.get("current") or {}).items()}
-            cur = self._union_keys(state)
-            prev_keys, cur_keys = set(prev.keys()), set(cur.keys())
-            added_keys = sorted(cur_keys - prev_keys)
-            removed_keys = sorted(prev_keys - cur_keys)
-
-            ev = self.data.get("events") or []
-            for k in added_keys:
-                m = cur.get(k) or {}
-                ev.append({"ts": now, "action": "add", "key": k, "source": m.get("src",""), "title": m.get("title",""), "type": m.get("type","")})
-            for k in removed_keys:
-                m = prev.get(k) or {}
-                ev.append({"ts": now, "action": "remove", "key": k, "source": m.get("src",""), "title": m.get("title",""), "type": m.get("type","")})
-            self.data["events"] = ev[-5000:]
+            checksum = state.get("checksum")
+            explicit = delta is not None
+            if not explicit:
+                if checksum and checksum == self.data.get("state_checksum"):
+                    if self._sides is None:
+                        self._build_sides(state)  # first look after a restart: index now, so later deltas stay small
+                    lr = self.data.get("last_run") or {}
+                    if lr.get("added") or lr.get("removed"):
+                        self.data["last_run"] = {"added": 0, "removed": 0, "ts": now}
+                        self._save_soon()
+                    return self._windows(now)
+                d = state.get("delta")
+                if checksum and isinstance(d, dict) and d.get("base_checksum") and d.get("base_checksum") == self.data.get("state_checksum"):
+                    delta = d
+
+            cur = self.data.get("current") or {}
+            if delta is not None and self._sides is not None:
+                touched = self._apply_side_delta(state, delta)
+            elif delta is not None and cur:
+                # delta before the index was built (restart): index the new state, then the removed keys
+                # are whatever `current` has that the index no longer backs the same way (no re-merge of the rest)
+                self._build_sides(state)
+                touched = self._apply_side_delta(state, {side: {"added": (delta.get(side) or {}).get("added") or []}
+                                                         for side in ("plex", "simkl")})
+                touched |= {k for k, e in cur.items() if self._src_of(k) != (e or {}).get("src")}
+            else:
+                self._build_sides(state)
+                touched = set(cur) | set(self._by_ck)
+            changes = [(k, cur.get(k), self._union_entry(k)) for k in sorted(touched)]
+
+            # watch time: keep known runtimes, adjust the aggregate only for what changed
+            wt_ok = isinstance(self.data.get("watchtime"), dict)
+            ev: List[Dict[str, Any]] = []
+            added = removed = 0
+            dirty = not explicit and checksum != self.data.get("state_checksum")
+            for k, p, e in changes:
+                if e is not None:
+                    if p is not None and p.get("minutes") and p.get("tmdb") == e.get("tmdb"):
+                        e["minutes"] = p.get("minutes")
+                    else:
+                        e["minutes"] = self._lookup_minutes(e)
+                    dirty = dirty or e != p
+                    cur[k] = e
+                else:
+                    dirty = dirty or p is not None
+                    cur.pop(k, None)
+                if wt_ok:
+                    if p is not None:
+                        self._wt_apply(p, -1)
+                    if e is not None:
+                        self._wt_apply(e, +1)
+                if p is None and e is not None:
+                    added += 1
+                    ev.append({"ts": now, "action": "add", "key": k, "source": e.get("src",""), "title": e.get("title",""), "type": e.get("type","")})
+                elif p is not None and e is None:
+                    removed += 1
+                    ev.append({"ts": now, "action": "remove", "key": k, "source": p.get("src",""), "title": p.get("title",""), "type": p.get("type","")})
+            # adds first, like the event order readers are used to
+            ev.sort(key=lambda x: x["action"] != "add")
+            self._add_events(ev)
 
             c = self._ensure_counters()
-            c["added"]   = int(c.get("added", 0))   + len(added_keys)
-            c["removed"] = int(c.get("removed", 0)) + len(removed_keys)
+            c["added"]   = int(c.get("added", 0))   + added
+            c["removed"] = int(c.get("removed", 0)) + removed
             self.data["counters"] = c
 
-            self.data["last_run"] = {"added": len(added_keys), "removed": len(removed_keys), "ts": now}
+            self.data["last_run"] = {"added": added, "removed": removed, "ts": now}
             self.data["current"] = cur
-
-            samples = self.data.get("samples") or []
-            samples.append({"ts": now, "count": len(cur)})
-            self.data["samples"] = samples[-4000:]
-
-            self._save()
-            return {
-                "now": len(cur),
-                "week": self._count_at(now - 7*86400),
-                "month": self._count_at(now - 30*86400),
-            }
+            self._tmdb_index_of = None  # current was edited in place
+            if not wt_ok:
+                self._rebuild_watchtime()
+            if not explicit:
+                self.data["state_checksum"] = checksum
+
+            self._add_sample(now, len(cur))
+
+            # the sample/events are already durable in the log (replayed on load), so only a changed
+            # `current` needs the checkpoint right away; everything else rides on a coalesced save
+            if dirty:
+                self._save()
+            else:
+                self._save_soon()
+            return self._windows(now)
 
     def record_event(self, *, action: str, key: str, source: str = "", title: str = "", typ: str = "") -> None:
         now = int(time.time())
         with self.lock:
-            ev = self.data.get("events") or []
-            ev.append({"ts": now, "action": action, "key": key, "source": source, "title": title, "type": typ})
-            self.data["events"] = ev[-5000:]
+            # log append only (constant cost); statistics.json picks up the tail on its next save
+            self._add_events([{"ts": now, "action": action, "key": key, "source": source, "title": title, "type": typ}])
             # NOTE: no counters update here; counters are updated in refresh_from_state()
-            self._save()
 
 
     def overview(self, state: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -0,0 +1,341 @@
+# _tmdb_async.py
+# Async TMDb client for the web request path: one pooled keep-alive httpx.AsyncClient, a global in-flight
+# limit, per-call deadlines and a circuit breaker, so a slow TMDb never ties up the sync threadpool.
+# Records and poster blobs are the same files _TMDB uses (the warm-up threads keep using the sync helpers).
+# httpx is optional: without it every call falls back to the sync _TMDB functions in a worker thread.
+# File I/O and JSON parsing always go through asyncio.to_thread; only the network waits run on the loop.
+
+from __future__ import annotations
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+try:
+    import httpx
+except Exception:  # optional dependency
+    httpx = None  # type: ignore[assignment]
+
+import _TMDB as T
+
+MAX_INFLIGHT = 8
+META_DEADLINE = 8.0
+IMAGE_DEADLINE = 20.0
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 30.0
+STREAM_CHUNK = T.STREAM_CHUNK
+
+
+def _mktemp_beside(local: Path) -> Tuple[int, str]:
+    local.parent.mkdir(parents=True, exist_ok=True)
+    return tempfile.mkstemp(prefix=f".{local.name}.", suffix=".tmp", dir=str(local.parent))
+
+
+class TmdbUnavailable(RuntimeError):
+    """TMDb is failing (breaker open) or the call ran past its deadline."""
+
+
+class CircuitBreaker:
+    """closed -> (N consecutive failures) -> open -> (cooldown) -> half-open: one probe decides."""
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+
+    def allow(self) -> bool:
+        if self.failures < self.threshold:
+            return True
+        if time.time() - self.opened_at >= self.cooldown and not self.probing:
+            self.probing = True
+            return True
+        return False
+
+    def success(self) -> None:
+        self.failures = 0
+        self.probing = False
+
+    def failure(self) -> None:
+        self.failures += 1
+        self.probing = False
+        if self.failures >= self.threshold:
+            self.opened_at = time.time()
+
+    def state(self) -> Dict[str, Any]:
+        st = "closed" if self.failures < self.threshold else ("half-open" if self.probing else "open")
+        return {"state": st, "failures": self.failures, "opened_at": int(self.opened_at) if self.opened_at else 0}
+
+
+class AsyncSingleFlight:
+    """asyncio flavour of _TMDB.SingleFlight: concurrent awaits for one key share one task."""
+    def __init__(self) -> None:
+        self._tasks: Dict[Any, "asyncio.Future[Any]"] = {}
+
+    async def do(self, key: Any, fn: Callable[[], Awaitable[Any]]) -> Any:
+        fut = self._tasks.get(key)
+        if fut is None:
+            fut = asyncio.ensure_future(fn())
+            self._tasks[key] = fut
+            fut.add_done_callback(lambda _f, k=key: self._tasks.pop(k, None))
+        return await asyncio.shield(fut)
+
+
+class AsyncTmdbClient:
+    def __init__(
+        self,
+        max_inflight: int = MAX_INFLIGHT,
+        meta_deadline: float = META_DEADLINE,
+        image_deadline: float = IMAGE_DEADLINE,
+    ) -> None:
+        self.max_inflight = max(1, int(max_inflight))
+        self.meta_deadline = meta_deadline
+        self.image_deadline = image_deadline
+        self.breaker = CircuitBreaker()
+        self._flight = AsyncSingleFlight()
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._inflight = 0
+
+    # ---- plumbing ----
+    def _http(self) -> "httpx.AsyncClient":
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers={"User-Agent": "Mozilla/5.0"},
+                limits=httpx.Limits(max_connections=self.max_inflight, max_keepalive_connections=self.max_inflight),
+                timeout=httpx.Timeout(15.0),
+                follow_redirects=True,
+            )
+            self._sem = asyncio.Semaphore(self.max_inflight)
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            try:
+                await self._client.aclose()
+            finally:
+                self._client = None
+                self._sem = None
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "async": httpx is not None,
+            "inflight": self._inflight,
+            "max_inflight": self.max_inflight,
+            "breaker": self.breaker.state(),
+        }
+
+    async def _acquire(self, deadline: float) -> None:
+        if not self.breaker.allow():
+            raise TmdbUnavailable("TMDb temporarily unavailable")
+        self._http()
+        try:
+            await asyncio.wait_for(self._sem.acquire(), timeout=max(0.01, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            self.breaker.probing = False
+            raise TmdbUnavailable("TMDb request queue full")
+        self._inflight += 1
+
+    def _release(self) -> None:
+        self._inflight -= 1
+        self._sem.release()
+
+    def _note(self, code: Optional[int]) -> None:
+        # 404 is a valid answer; transport errors, 429 and 5xx count against TMDb
+        if code is not None and (code < 500 and code != 429):
+            self.breaker.success()
+        else:
+            self.breaker.failure()
+
+    async def _get(self, url: str, budget: float) -> Tuple[Optional[int], Optional[bytes], str]:
+        deadline = time.monotonic() + budget
+        await self._acquire(deadline)
+        try:
+            r = await self._http().get(url, timeout=max(0.01, deadline - time.monotonic()))
+            self._note(r.status_code)
+            return r.status_code, (r.content if r.status_code == 200 else None), ""
+        except Exception as e:
+            self._note(None)
+            return None, None, (str(e) or e.__class__.__name__)
+        finally:
+            self._release()
+
+    # ---- metadata ----
+    async def get_record(self, api_key: str, typ: str, tmdb_id: int, cache_dir: Path,
+                         fields: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+        if httpx is None:
+            return await asyncio.to_thread(T.get_record, api_key, typ, tmdb_id, cache_dir, fields)
+        typ = "tv" if typ == "tv" else "movie"
+        want = list(fields) if fields is not None else list(T.FIELD_TTL)
+        rec = await asyncio.to_thread(T._read_record, typ, tmdb_id, cache_dir)
+        if not api_key or not T._needs_fetch(rec, want, time.time()):
+            return rec
+
+        async def _refresh() -> Optional[Dict[str, Any]]:
+            cur = await asyncio.to_thread(T._read_record, typ, tmdb_id, cache_dir)
+            if not T._needs_fetch(cur, want, time.time()):
+                return cur
+            try:
+                code, body, err = await self._get(T._record_url(api_key, typ, tmdb_id), self.meta_deadline)
+            except TmdbUnavailable:
+                return cur  # serve stale (or nothing) without touching the record
+            cur = await asyncio.to_thread(T._merge_fetch, cur, typ, tmdb_id, code, body, err)
+            try:
+                await asyncio.to_thread(T._write_record, cur, cache_dir)
+            except Exception:
+                pass
+            return cur
+
+        return await self._flight.do(("meta", typ, int(tmdb_id), str(cache_dir)), _refresh)
+
+    async def get_meta(self, api_key: str, typ: str, tmdb_id: int, cache_dir: Path) -> Dict[str, Any]:
+        rec = await self.get_record(api_key, typ, tmdb_id, cache_dir)
+        out = T._summary(typ, tmdb_id, rec)
+        if out is None:
+            raise RuntimeError((rec or {}).get("error") or "metadata not available")
+        return out
+
+    # ---- posters ----
+    async def _target(self, api_key: str, typ: str, tmdb_id: int, size: str, cache_dir: Path) -> Tuple[Path, str]:
+        meta = await self.get_meta(api_key, typ, tmdb_id, cache_dir)
+        poster_path = meta.get("poster_path")
+        if not poster_path:
+            raise RuntimeError("no poster")
+        safe = T._safe_size(size)
+        return T._blob_path(cache_dir, poster_path, safe), f"{T.TMDB_IMG}/{safe}{poster_path}"
+
+    async def _wait_for(self, target: Path, timeout: float = T.LOCK_WAIT_SEC) -> bool:
+        lock = target.with_name(target.name + ".lock")
+        end = time.monotonic() + timeout
+        while time.monotonic() < end:
+            if await asyncio.to_thread(target.exists):
+                return True
+            if not await asyncio.to_thread(lock.exists):
+                break
+            await asyncio.sleep(0.05)
+        return await asyncio.to_thread(target.exists)
+
+    async def poster_file(self, api_key: str, typ: str, tmdb_id: int, size: str, cache_dir: Path) -> Path:
+        if httpx is None:
+            return (await asyncio.to_thread(T.get_poster_file, api_key, typ, tmdb_id, size, cache_dir))[0]
+        hit = await asyncio.to_thread(T.poster_cached, typ, tmdb_id, size, cache_dir)
+        if hit is not None:
+            return hit
+        local, url = await self._target(api_key, typ, tmdb_id, size, cache_dir)
+
+        async def _download() -> Path:
+            if await asyncio.to_thread(local.exists):
+                return local
+            lock = await asyncio.to_thread(T._lock, local)
+            if lock is None and await self._wait_for(local):
+                return local  # someone else (stream, warm-up, other process) finished it
+            try:
+                if not await asyncio.to_thread(local.exists):
+                    code, body, err = await self._get(url, self.image_deadline)
+                    if code != 200 or body is None:
+                        raise RuntimeError(err or f"HTTP {code}")
+                    await asyncio.to_thread(T.atomic_write_bytes, local, body)
+            finally:
+                await asyncio.to_thread(T._unlock, lock)
+            return local
+
+        return await self._flight.do(("img", str(local)), _download)
+
+    async def stream_poster(self, api_key: str, typ: str, tmdb_id: int, size: str,
+                            cache_dir: Path) -> Optional[Tuple["PosterStream", str]]:
+        """Miss fast path: forward TMDb's body chunk by chunk while teeing it into the blob.
+        None when cached or when someone else already holds the blob's download lock.
+        The caller must `await stream.aclose()` once done, iterated or not (see PosterStream)."""
+        if httpx is None:
+            return None
+        if await asyncio.to_thread(T.poster_cached, typ, tmdb_id, size, cache_dir) is not None:
+            return None
+        local, url = await self._target(api_key, typ, tmdb_id, size, cache_dir)
+        lock = await asyncio.to_thread(T._lock, local)
+        if lock is None:
+            return None
+
+        deadline = time.monotonic() + self.image_deadline
+        try:
+            await self._acquire(deadline)
+        except BaseException:
+            T._unlock(lock)
+            raise
+        try:
+            req = self._http().build_request("GET", url, timeout=max(0.01, deadline - time.monotonic()))
+            resp = await self._http().send(req, stream=True)
+        except BaseException as e:
+            self._note(None)
+            self._release()
+            T._unlock(lock)
+            if isinstance(e, Exception):
+                raise TmdbUnavailable(str(e) or e.__class__.__name__)
+            raise
+        self._note(resp.status_code)
+        stream = PosterStream(self, resp, lock, local)
+        if resp.status_code != 200:
+            await stream.aclose()
+            raise RuntimeError(f"HTTP {resp.status_code}")
+        return stream, (resp.headers.get("content-type") or "image/jpeg").split(";")[0].strip()
+
+
+class PosterStream:
+    """
+    Body of a streamed poster miss: iterate once, chunks are teed into the blob.
+    Holds an in-flight slot, the blob's .lock and the upstream response until aclose(),
+    which is idempotent and safe when the body was never iterated (client left first).
+    """
+    def __init__(self, client: AsyncTmdbClient, resp: Any, lock: Any, local: Path) -> None:
+        self._client = client
+        self._resp = resp
+        self._lock = lock
+        self._local = local
+        self._gen: Optional[AsyncIterator[bytes]] = None
+        self._released = False
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        if self._gen is None:
+            self._gen = self._tee()
+        return self._gen
+
+    def _release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._client._release()
+            T._unlock(self._lock)
+
+    async def aclose(self) -> None:
+        self._release()  # synchronous part first: nothing can cancel it
+        gen, self._gen = self._gen, None
+        resp, self._resp = self._resp, None
+        try:
+            if gen is not None:
+                await gen.aclose()  # drops a partial temp file
+        finally:
+            if resp is not None:
+                # shielded so a cancelled request still hands the connection back to the pool
+                await asyncio.shield(resp.aclose())
+
+    async def _tee(self) -> AsyncIterator[bytes]:
+        local = self._local
+        complete = False
+        tmp = None
+        try:
+            fd, tmp = await asyncio.to_thread(_mktemp_beside, local)
+            resp = self._resp
+            with os.fdopen(fd, "wb") as f:
+                async for chunk in resp.aiter_bytes(STREAM_CHUNK):
+                    await asyncio.to_thread(f.write, chunk)
+                    yield chunk
+            await asyncio.to_thread(os.replace, tmp, local)
+            complete = True
+        finally:
+            # client went away or upstream failed: never leave a partial file behind
+            if not complete and tmp:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+            self._release()
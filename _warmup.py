@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+_warmup.py
+
+Background TMDb warm-up: fills metadata + posters into the local cache so
+the wall/grid endpoints only ever read from disk. Newest items go first,
+at most `workers` TMDb lookups run at the same time.
+"""
+
+from __future__ import annotations
+import itertools
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from _TMDB import get_meta, get_poster_file, peek_record, poster_cached
+from _posters import Image, peek_lqip, warm_variants
+
+WallKey = Tuple[str, int]  # (typ, tmdb_id)
+
+PRIO_URGENT = -1  # someone is looking at it right now
+
+
+class TmdbWarmup:
+    def __init__(
+        self,
+        load_config: Callable[[], Dict[str, Any]],
+        items_fn: Callable[[], Iterable[WallKey]],
+        cache_dir: Path,
+        workers: int = 4,
+        poster_size: str = "w342",
+        on_warm: Optional[Callable[[str, int], None]] = None,
+        on_idle: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self.load_config_cb = load_config
+        self.items_fn = items_fn
+        self.on_warm_cb = on_warm  # called after a title's metadata/poster landed in the cache
+        self.on_idle_cb = on_idle  # called when the queue drained after a pass that wrote something
+        self.cache_dir = cache_dir
+        self.workers = max(1, int(workers))
+        self.poster_size = poster_size
+
+        self._q: "queue.PriorityQueue[Tuple[int, int, Optional[WallKey]]]" = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._pending: Set[WallKey] = set()
+        self._filled = False  # something landed in the cache since the queue was last empty
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._status: Dict[str, Any] = {
+            "running": False,
+            "queued": 0,
+            "done": 0,
+            "skipped": 0,
+            "errors": 0,
+            "last_trigger": 0,
+            "last_reason": "",
+        }
+
+    # ---- helpers ----
+    def _api_key(self) -> str:
+        cfg = self.load_config_cb() or {}
+        return ((cfg.get("tmdb") or {}).get("api_key") or "").strip()
+
+    def is_warm(self, typ: str, tmdb_id: int) -> bool:
+        rec = peek_record(typ, tmdb_id, self.cache_dir)
+        if rec is None:
+            return False
+        if rec.get("status") == "missing":
+            return True  # negatively cached; get_record decides when to ask TMDb again
+        fields = rec.get("fields") or {}
+        if not fields:
+            return False
+        if not fields.get("poster_path"):
+            return True
+        src = poster_cached(typ, tmdb_id, self.poster_size, self.cache_dir)
+        # with Pillow around, the resized variants + placeholder are part of "warm"
+        return src is not None and (Image is None or peek_lqip(src) is not None)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            st = dict(self._status)
+            st["queued"] = len(self._pending)
+        return st
+
+    def _bump(self, k: str) -> None:
+        with self._lock:
+            self._status[k] = int(self._status.get(k) or 0) + 1
+
+    # ---- control ----
+    def start(self) -> None:
+        if any(t.is_alive() for t in self._threads):
+            return
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"TmdbWarmup-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for t in self._threads:
+            t.start()
+        with self._lock:
+            self._status["running"] = True
+
+    def stop(self) -> None:
+        self._stop.set()
+        for _ in self._threads:
+            self._q.put((1 << 30, next(self._seq), None))  # wake-up sentinels
+        for t in self._threads:
+            t.join(timeout=2.0)
+        with self._lock:
+            self._status["running"] = False
+
+    def trigger(self, reason: str = "") -> None:
+        """Queue every not-yet-warm title, newest first. Never blocks the caller."""
+        threading.Thread(target=self._enumerate, args=(reason,), name="TmdbWarmup-scan", daemon=True).start()
+
+    def _enumerate(self, reason: str) -> int:
+        if not self._api_key():
+            return 0
+        try:
+            keys = list(self.items_fn() or [])
+        except Exception:
+            return 0
+        n = 0
+        for rank, (typ, tmdb_id) in enumerate(keys):
+            if self.is_warm(typ, int(tmdb_id)):
+                continue
+            if self.enqueue(typ, int(tmdb_id), rank):
+                n += 1
+        with self._lock:
+            self._status["last_trigger"] = int(time.time())
+            self._status["last_reason"] = reason
+        return n
+
+    def enqueue(self, typ: str, tmdb_id: int, priority: int = PRIO_URGENT) -> bool:
+        key = (typ, int(tmdb_id))
+        with self._lock:
+            if key in self._pending and priority != PRIO_URGENT:
+                return False
+            self._pending.add(key)
+        # an urgent re-queue of a pending key just adds a second, earlier ticket; the later one is skipped as warm
+        self._q.put((priority, next(self._seq), key))
+        return True
+
+    # ---- internals ----
+    def _worker(self) -> None:
+        while not self._stop.is_set():
+            _, _, key = self._q.get()
+            if key is None:
+                continue
+            try:
+                self._warm(*key)
+            finally:
+                with self._lock:
+                    self._pending.discard(key)
+                    idle = self._filled and not self._pending
+                    if idle:
+                        self._filled = False
+            if idle and self.on_idle_cb:
+                try:
+                    self.on_idle_cb()
+                except Exception:
+                    pass
+
+    def _warm(self, typ: str, tmdb_id: int) -> None:
+        if self.is_warm(typ, tmdb_id):
+            self._bump("skipped")
+            return
+        api_key = self._api_key()
+        if not api_key:
+            return
+        try:
+            meta = get_meta(api_key, typ, tmdb_id, self.cache_dir)
+            if meta.get("poster_path"):
+                src, _ = get_poster_file(api_key, typ, tmdb_id, self.poster_size, self.cache_dir)
+                cfg = self.load_config_cb() or {}
+                warm_variants(src, bool((cfg.get("tmdb") or {}).get("poster_avif")))
+            self._bump("done")
+            with self._lock:
+                self._filled = True
+        except Exception:
+            self._bump("errors")
+            return
+        if self.on_warm_cb:
+            try:
+                self.on_warm_cb(typ, tmdb_id)
+            except Exception:
+                pass
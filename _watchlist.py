@@ -2,12 +2,21 @@
 # Watchlist logic for Plex ⇄ SIMKL Web UI (PlexAPI-only, hide-overlay)
 
 from __future__ import annotations
-from typing import Any, Dict, List, Optional, Tuple, Set
-from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple, Set
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
 from pathlib import Path
+import base64
 import json
+import os
+import tempfile
+import threading
+import time
 
 # Requires: pip install PlexAPI
+import plexapi
+import requests
+from plexapi.exceptions import BadRequest
 from plexapi.myplex import MyPlexAccount
 
 
@@ -15,6 +24,23 @@ from plexapi.myplex import MyPlexAccount
 ROOT = Path(__file__).resolve().parent
 CONFIG_BASE = Path("/config") if str(ROOT).startswith("/app") else ROOT
 HIDE_PATH = CONFIG_BASE / "watchlist_hide.json"  # overlay: keys to hide in UI
+VIEW_PATH = CONFIG_BASE / "watchlist_view.json"  # materialized merged view (rebuilt per sync)
+VIEW_VERSION = 1
+
+# view sort orders; every tuple ends with the unique key so cursors are unambiguous
+def _year_of(it: Dict[str, Any]) -> int:
+    try:
+        return int(it.get("year") or 0)
+    except Exception:
+        return 0
+
+SORT_KEYS: Dict[str, Callable[[Dict[str, Any]], Tuple[Any, ...]]] = {
+    "added": lambda it: (int(it.get("added_epoch") or 0), _year_of(it), it["key"]),
+    "title": lambda it: ((it.get("title") or "").lower(), _year_of(it), it["key"]),
+    "year": lambda it: (_year_of(it), int(it.get("added_epoch") or 0), it["key"]),
+}
+FACETS = ("type", "status", "source")
+CHANGELOG_MAX = 256  # versions kept for /changes; older `since` values get {"full": true}
 
 
 # -------- Small helpers --------
@@ -37,6 +63,15 @@ def _save_hide_set(hide: Set[str]) -> None:
     except Exception as e:
         print(f"Error saving hide set: {e}")
 
+def _when_str(v: Any) -> str:
+    """Epoch numbers become ISO-8601 UTC ('...Z'); anything else is kept as text."""
+    if isinstance(v, (int, float)) and not isinstance(v, bool):
+        try:
+            return datetime.fromtimestamp(int(v), timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        except Exception:
+            pass
+    return str(v)
+
 def _pick_added(d: Dict[str, Any]) -> Optional[str]:
     """Return a plausible 'added at' timestamp from various shapes of input objects."""
     if not isinstance(d, dict):
@@ -44,13 +79,13 @@ def _pick_added(d: Dict[str, Any]) -> Optional[str]:
     for k in ("added", "added_at", "addedAt", "date_added", "created_at", "createdAt"):
         v = d.get(k)
         if v:
-            return str(v)
+            return _when_str(v)
     nested = d.get("dates") or d.get("meta") or d.get("attributes") or {}
     if isinstance(nested, dict):
         for k in ("added", "added_at", "created", "created_at"):
             v = nested.get(k)
             if v:
-                return str(v)
+                return _when_str(v)
     return None
 
 
@@ -59,7 +94,10 @@ def _iso_to_epoch(iso: Optional[str]) -> int:
     if not iso:
         return 0
     try:
-        s = str(iso).strip().replace("Z", "+00:00")
+        s = str(iso).strip()
+        if s.isdigit():
+            return int(s)
+        s = s.replace("Z", "+00:00")
         return int(datetime.fromisoformat(s).timestamp())
     except Exception:
         return 0
@@ -141,23 +179,16 @@ def _extract_plex_identifiers(item: Dict[str, Any]) -> Tuple[Optional[str], Opti
     return (str(guid) if guid else None, str(ratingKey) if ratingKey else None)
 
 
-# -------- Public: build watchlist (grid) --------
-def build_watchlist(state: Dict[str, Any], tmdb_api_key_present: bool) -> List[Dict[str, Any]]:
-    """
-    Build a merged watchlist view from state.json, newest-first.
-    Filters out items present in the local hide-overlay.
-    """
+# -------- Merged view --------
+def _view_items(state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Merged, status-tagged view of state.json (Plex ∪ SIMKL), newest-first. No hide overlay."""
     plex_items = (state.get("plex", {}) or {}).get("items", {}) or {}
     simkl_items = (state.get("simkl", {}) or {}).get("items", {}) or {}
-    hidden = _load_hide_set()
 
     out: List[Dict[str, Any]] = []
     all_keys = set(plex_items.keys()) | set(simkl_items.keys())
 
     for key in all_keys:
-        if key in hidden:
-            continue
-
         p = plex_items.get(key) or {}
         s = simkl_items.get(key) or {}
         info = p or s
@@ -208,80 +239,619 @@ def build_watchlist(state: Dict[str, Any], tmdb_api_key_present: bool) -> List[D
     out.sort(key=lambda x: (x.get("added_epoch") or 0, x.get("year") or 0), reverse=True)
     return out
 
+
+# -------- Public: build watchlist (grid) --------
+def build_watchlist(state: Dict[str, Any], tmdb_api_key_present: bool) -> List[Dict[str, Any]]:
+    """
+    Build a merged watchlist view from state.json, newest-first.
+    Filters out items present in the local hide-overlay.
+    """
+    hidden = _load_hide_set()
+    return [it for it in _view_items(state) if it["key"] not in hidden]
+
+
+# -------- Public: materialized view --------
+class WatchlistView:
+    """
+    The merged view, built once per state.json change instead of per request.
+
+    Base items are persisted to watchlist_view.json (so a restart doesn't re-merge
+    the state); in memory each item is also kept as pre-serialized JSON bytes.
+    `enrich(item, ctx)` adds cache-only TMDb fields (genres, poster version, LQIP); `ctx` comes
+    from `enrich_context()`, called once per (re)build rather than per row. Items are
+    re-enriched one by one via `refresh_tmdb` as the warm-up fills the cache.
+    The hide overlay is applied when serving, as a key filter.
+    """
+
+    def __init__(
+        self,
+        state_path: Callable[[], Optional[Path]],
+        path: Path = VIEW_PATH,
+        enrich: Optional[Callable[[Dict[str, Any], Any], Dict[str, Any]]] = None,
+        enrich_context: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        self.state_path_cb = state_path
+        self.path = path
+        self.enrich_cb = enrich
+        self.enrich_context_cb = enrich_context
+        self.lock = threading.RLock()
+        self._base: List[Dict[str, Any]] = []
+        self._items: List[Dict[str, Any]] = []
+        self._blobs: List[bytes] = []
+        self._by_tmdb: Dict[Tuple[str, int], List[int]] = {}
+        self._pos: Dict[str, int] = {}
+        self._index([])
+        self._state_mtime: Optional[float] = None  # None: not loaded yet
+        self._hidden: Set[str] = set()
+        self._hidden_mtime: Optional[float] = None
+        self.last_sync_epoch: Optional[int] = None
+        self.built_at = 0
+        # monotonic version (ms-based, so it keeps growing across restarts) + per-version key ops
+        self.version = 0
+        self._floor = int(time.time() * 1000)  # oldest `since` changes() can answer
+        self._log: List[Tuple[int, Dict[str, str]]] = []
+
+    # ---- build ----
+    def _state_stat(self) -> Tuple[Optional[Path], float]:
+        sp = self.state_path_cb()
+        try:
+            return sp, (sp.stat().st_mtime if sp else 0.0)
+        except OSError:
+            return sp, 0.0
+
+    def _materialize(self, base: List[Dict[str, Any]]) -> None:
+        items: List[Dict[str, Any]] = []
+        by_tmdb: Dict[Tuple[str, int], List[int]] = {}
+        ctx = self._enrich_context()
+        for i, it in enumerate(base):
+            items.append(self._enriched(it, ctx))
+            try:
+                if it.get("tmdb"):
+                    by_tmdb.setdefault((it["type"], int(it["tmdb"])), []).append(i)
+            except Exception:
+                pass
+        self._base = base
+        self._items = items
+        self._blobs = [json.dumps(it, separators=(",", ":")).encode("utf-8") for it in items]
+        self._by_tmdb = by_tmdb
+        self._pos = {it["key"]: i for i, it in enumerate(base)}
+        self._index(base)
+
+    def _index(self, base: List[Dict[str, Any]]) -> None:
+        """Per-sort orderings (ascending; with their sort tuples for cursor bisects), facet sets, titles."""
+        self._order: Dict[str, List[int]] = {}
+        self._sortkeys: Dict[str, List[Tuple[Any, ...]]] = {}
+        for name, fn in SORT_KEYS.items():
+            keyed = sorted((fn(it), i) for i, it in enumerate(base))
+            self._sortkeys[name] = [k for k, _ in keyed]
+            self._order[name] = [i for _, i in keyed]
+        facets: Dict[str, Dict[str, Set[int]]] = {f: {} for f in FACETS}
+        for i, it in enumerate(base):
+            st = it.get("status") or ""
+            facets["type"].setdefault(it.get("type") or "", set()).add(i)
+            facets["status"].setdefault(st, set()).add(i)
+            if st in ("both", "plex_only"):
+                facets["source"].setdefault("plex", set()).add(i)
+            if st in ("both", "simkl_only"):
+                facets["source"].setdefault("simkl", set()).add(i)
+        self._facets = facets
+        self._title_lc = [(it.get("title") or "").lower() for it in base]
+
+    def _enrich_context(self) -> Any:
+        if not (self.enrich_cb and self.enrich_context_cb):
+            return None
+        try:
+            return self.enrich_context_cb()
+        except Exception:
+            return None
+
+    def _enriched(self, it: Dict[str, Any], ctx: Any = None) -> Dict[str, Any]:
+        if not self.enrich_cb:
+            return dict(it)
+        try:
+            return self.enrich_cb(dict(it), ctx)
+        except Exception:
+            return dict(it)
+
+    # ---- versioning ----
+    def _snapshot(self) -> Dict[str, bytes]:
+        return {it["key"]: b for it, b in zip(self._items, self._blobs)}
+
+    def _diff(self, before: Dict[str, bytes]) -> Dict[str, str]:
+        after = self._snapshot()
+        ops = {k: "removed" for k in before if k not in after}
+        for k, b in after.items():
+            if k not in before:
+                ops[k] = "added"
+            elif before[k] != b:
+                ops[k] = "changed"
+        return ops
+
+    def _bump(self, ops: Dict[str, str]) -> None:
+        if not ops:
+            return
+        self.version = max(self.version + 1, int(time.time() * 1000))
+        self._log.append((self.version, ops))
+        if len(self._log) > CHANGELOG_MAX:
+            self._floor = self._log[-CHANGELOG_MAX - 1][0]
+            del self._log[:-CHANGELOG_MAX]
+
+    def rebuild(self) -> int:
+        """Re-merge from state.json and persist; returns the item count."""
+        with self.lock:
+            sp, mtime = self._state_stat()
+            state: Dict[str, Any] = {}
+            try:
+                if sp:
+                    state = json.loads(sp.read_text(encoding="utf-8"))
+            except Exception:
+                state = {}
+            before = self._snapshot()
+            self._materialize(_view_items(state))
+            self._bump(self._diff(before))
+            self._state_mtime = mtime
+            self.last_sync_epoch = state.get("last_sync_epoch")
+            self.built_at = int(time.time())
+            try:
+                self._persist()
+            except Exception as e:
+                print(f"Error saving watchlist view: {e}")
+            return len(self._items)
+
+    def _persist(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "version": VIEW_VERSION,
+            "view_version": self.version,
+            "state_mtime": self._state_mtime,
+            "last_sync_epoch": self.last_sync_epoch,
+            "built_at": self.built_at,
+            "items": self._base,
+        }
+        fd, tmp = tempfile.mkstemp(prefix=f".{self.path.name}.", suffix=".tmp", dir=str(self.path.parent))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f, separators=(",", ":"))
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def _load_persisted(self, mtime: float) -> bool:
+        try:
+            d = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception:
+            return False
+        if d.get("version") != VIEW_VERSION or d.get("state_mtime") != mtime:
+            return False
+        self._materialize(list(d.get("items") or []))
+        # only `since == version` is answerable for what happened before this process
+        self.version = int(d.get("view_version") or 0)
+        self._state_mtime = mtime
+        self.last_sync_epoch = d.get("last_sync_epoch")
+        self.built_at = int(d.get("built_at") or 0)
+        return True
+
+    def ensure(self) -> None:
+        """Cheap freshness check (one stat): rebuild only when state.json changed underneath us."""
+        with self.lock:
+            _, mtime = self._state_stat()
+            if self._state_mtime == mtime:
+                return
+            if self._state_mtime is None and self._load_persisted(mtime):
+                return
+            self.rebuild()
+
+    def refresh_tmdb(self, typ: str, tmdb_id: int) -> None:
+        """TMDb cache changed for one title: re-enrich just its rows."""
+        with self.lock:
+            ops: Dict[str, str] = {}
+            rows = self._by_tmdb.get(("tv" if typ in ("tv", "show") else "movie", int(tmdb_id))) or []
+            ctx = self._enrich_context() if rows else None
+            for i in rows:
+                it = self._enriched(self._base[i], ctx)
+                blob = json.dumps(it, separators=(",", ":")).encode("utf-8")
+                if blob != self._blobs[i]:
+                    ops[it["key"]] = "changed"
+                self._items[i] = it
+                self._blobs[i] = blob
+            self._bump(ops)
+
+    def refresh_enrichment(self) -> None:
+        """Re-enrich every row (e.g. after the TMDb key or the cache was changed wholesale)."""
+        with self.lock:
+            before = self._snapshot()
+            self._materialize(self._base)
+            self._bump(self._diff(before))
+
+    # ---- hide overlay ----
+    def hidden(self) -> Set[str]:
+        try:
+            mtime = HIDE_PATH.stat().st_mtime
+        except OSError:
+            mtime = 0.0
+        with self.lock:
+            if mtime != self._hidden_mtime:
+                hidden = _load_hide_set() if mtime else set()
+                if self._hidden_mtime is not None:
+                    # for the hide-filtered watchlist: newly hidden rows vanish, unhidden ones come back
+                    ops = {k: "removed" for k in hidden - self._hidden if k in self._pos}
+                    ops.update({k: "added" for k in self._hidden - hidden if k in self._pos})
+                    self._bump(ops)
+                self._hidden = hidden
+                self._hidden_mtime = mtime
+            return self._hidden
+
+    # ---- serve ----
+    def items(self, apply_hide: bool = False) -> List[Dict[str, Any]]:
+        self.ensure()
+        hidden = self.hidden() if apply_hide else set()
+        with self.lock:
+            return [dict(it) for it in self._items if it["key"] not in hidden]
+
+    def page(
+        self,
+        *,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        sort: str = "added",
+        order: str = "desc",
+        filters: Optional[Dict[str, List[str]]] = None,
+        q: str = "",
+        fields: Optional[List[str]] = None,
+        apply_hide: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        One page of the view as {"items": <JSON array bytes>, "count", "total", "next"}.
+        `filters` maps type/status/source to allowed values (source: plex|simkl = present on that side),
+        `q` is a case-insensitive title substring, `fields` projects each row, `next` is the cursor
+        for the following page (None at the end). Cursors survive rebuilds: they carry the sort
+        tuple of the last row, not an offset.
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"sort must be one of {', '.join(SORT_KEYS)}")
+        if order not in ("asc", "desc"):
+            raise ValueError("order must be asc or desc")
+        self.ensure()
+        hidden = self.hidden() if apply_hide else set()
+        ql = (q or "").strip().lower()
+        with self.lock:
+            allowed: Optional[Set[int]] = None
+            for facet, values in (filters or {}).items():
+                if facet not in self._facets or not values:
+                    continue
+                sel: Set[int] = set()
+                for v in values:
+                    sel |= self._facets[facet].get(v, set())
+                allowed = sel if allowed is None else (allowed & sel)
+
+            def ok(i: int) -> bool:
+                return ((allowed is None or i in allowed)
+                        and (not hidden or self._items[i]["key"] not in hidden)
+                        and (not ql or ql in self._title_lc[i]))
+
+            order_idx, skeys = self._order[sort], self._sortkeys[sort]
+            n, desc = len(order_idx), order == "desc"
+            if cursor:
+                after = _decode_cursor(cursor)
+                try:
+                    pos = (bisect_left(skeys, after) - 1) if desc else bisect_right(skeys, after)
+                except TypeError:
+                    raise ValueError("cursor does not match this sort")
+            else:
+                pos = n - 1 if desc else 0
+            step = -1 if desc else 1
+            want = n if limit is None else max(1, int(limit))
+
+            picked: List[int] = []
+            last_pos = pos
+            while 0 <= pos < n and len(picked) < want:
+                i = order_idx[pos]
+                if ok(i):
+                    picked.append(i)
+                    last_pos = pos
+                pos += step
+            more = False
+            while 0 <= pos < n:
+                if ok(order_idx[pos]):
+                    more = True
+                    break
+                pos += step
+
+            pool = allowed if allowed is not None else range(n)
+            total = n if (allowed is None and not hidden and not ql) else sum(1 for i in pool if ok(i))
+
+            return {
+                "items": self._rows(picked, fields),
+                "count": len(picked),
+                "total": total,
+                "next": _encode_cursor(skeys[last_pos]) if (more and picked) else None,
+            }
+
+
+    def _rows(self, picked: List[int], fields: Optional[List[str]]) -> bytes:
+        if fields:
+            rows = [json.dumps({f: self._items[i].get(f) for f in fields}, separators=(",", ":")).encode("utf-8")
+                    for i in picked]
+        else:
+            rows = [self._blobs[i] for i in picked]
+        return b"[" + b",".join(rows) + b"]"
+
+    def changes(self, since: int, fields: Optional[List[str]] = None, apply_hide: bool = True) -> Dict[str, Any]:
+        """
+        What changed after version `since`: {"version", "full", "added", "changed", "removed"}.
+        added/changed are JSON array bytes of rows (same projection as page()), removed is a key list.
+        full=True means `since` is unknown or too old; the client should reload.
+        """
+        self.ensure()
+        hidden = self.hidden() if apply_hide else set()
+        with self.lock:
+            out: Dict[str, Any] = {"version": self.version, "full": False, "added": b"[]", "changed": b"[]", "removed": []}
+            if since == self.version:
+                return out
+            if since > self.version or since < self._floor:
+                out["full"] = True
+                return out
+            first: Dict[str, str] = {}  # first op after `since` tells whether the key was visible then
+            for v, ops in self._log:
+                if v > since:
+                    for k, op in ops.items():
+                        first.setdefault(k, op)
+            added: List[int] = []
+            changed: List[int] = []
+            removed: List[str] = []
+            for k, op in first.items():
+                i = self._pos.get(k)
+                if i is not None and k not in hidden:
+                    (added if op == "added" else changed).append(i)
+                elif op != "added":
+                    removed.append(k)
+            out["added"] = self._rows(sorted(added), fields)
+            out["changed"] = self._rows(sorted(changed), fields)
+            out["removed"] = sorted(removed)
+            return out
+
+
+def _encode_cursor(sort_tuple: Tuple[Any, ...]) -> str:
+    raw = json.dumps(list(sort_tuple), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def _decode_cursor(cursor: str) -> Tuple[Any, ...]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        val = json.loads(raw.decode("utf-8"))
+        if not isinstance(val, list) or not val:
+            raise ValueError
+        return tuple(val)
+    except Exception:
+        raise ValueError("invalid cursor")
+
+
 # -------- Public: delete one item (PlexAPI only) --------
-def delete_watchlist_item(key: str, state_path: Path, cfg: Dict[str, Any], log=None) -> Dict[str, Any]:
+def _targets_for(key: str, item: Dict[str, Any]) -> Set[Tuple[str, str]]:
+    """Normalized GUIDs a Plex watchlist entry may carry for this state key/item."""
+    guid, _ = _extract_plex_identifiers(item)
+    variants = _guid_variants_from_key_or_item(key, item)
+    if guid:
+        variants = list(dict.fromkeys(variants + [guid]))  # Remove duplicates
+    return {_norm_guid(v) for v in variants if v}
+
+
+def _media_guids(media: Any) -> Set[Tuple[str, str]]:
+    cand_guids = set()
+    primary = (getattr(media, "guid", "") or "").split("?", 1)[0]
+    if primary:
+        cand_guids.add(primary)
+    try:
+        for gg in getattr(media, "guids", []) or []:
+            gid = str(getattr(gg, "id", gg) or "")
+            if gid:
+                cand_guids.add(gid.split("?", 1)[0])
+    except Exception:
+        pass
+    return {_norm_guid(cg) for cg in cand_guids}
+
+
+def _rating_key(media: Any) -> str:
+    return str(getattr(media, "ratingKey", "") or "")
+
+
+class PlexWatchlistSession:
     """
-    Remove the item from the user's *online* Plex watchlist using PlexAPI.
-    On success, add the key to the local hide-overlay (so the UI stays consistent across refreshes).
-    This will update the local hidden items set, but state.json is not modified.
-    The next sync will reconcile state.
+    Warm MyPlexAccount (kept per token) plus a GUID -> ratingKey index of the online watchlist,
+    so a UI delete is one PUT to Discover. refresh() rebuilds the index (after each sync); any full
+    watchlist download done for a delete refreshes it too. A token change drops both.
+    """
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self._token = ""
+        self._account: Optional[MyPlexAccount] = None
+        self._index: Dict[Tuple[str, str], str] = {}
+        self._http = requests.Session()  # keep-alive to Discover for index-hit removes
+        self.built_at = 0.0
+
+    def account(self, token: str) -> MyPlexAccount:
+        with self.lock:
+            if self._account is None or token != self._token:
+                self._account = MyPlexAccount(token=token)
+                self._token = token
+                self._index = {}
+                self.built_at = 0.0
+            return self._account
+
+    def invalidate(self) -> None:
+        with self.lock:
+            self._account = None
+            self._token = ""
+            self._index = {}
+            self.built_at = 0.0
+
+    def index_from(self, token: str, watchlist: List[Any]) -> None:
+        idx: Dict[Tuple[str, str], str] = {}
+        for media in watchlist:
+            rk = _rating_key(media)
+            if rk:
+                for g in _media_guids(media):
+                    idx.setdefault(g, rk)
+        with self.lock:
+            if token == self._token:
+                self._index = idx
+                self.built_at = time.time()
+
+    def refresh(self, token: str) -> int:
+        """Download the watchlist once and rebuild the index; returns the number of entries."""
+        if not token:
+            self.invalidate()
+            return 0
+        watchlist = self.account(token).watchlist()
+        self.index_from(token, watchlist)
+        return len(watchlist)
+
+    def lookup(self, token: str, targets: Set[Tuple[str, str]]) -> Optional[str]:
+        with self.lock:
+            if token != self._token:
+                return None
+            return next((self._index[g] for g in targets if g in self._index), None)
+
+    def remove(self, token: str, rating_key: str) -> None:
+        """One Plex write; what removeFromWatchlist does per item, minus its onWatchlist() round trip."""
+        r = self._http.put(
+            f"{MyPlexAccount.DISCOVER}/actions/removeFromWatchlist",
+            params={"ratingKey": rating_key},
+            headers={**plexapi.BASE_HEADERS, "X-Plex-Token": token, "Accept": "application/json"},
+            timeout=plexapi.TIMEOUT,
+        )
+        r.raise_for_status()
+        with self.lock:
+            self._index = {g: rk for g, rk in self._index.items() if rk != rating_key}
+
+    def status(self) -> Dict[str, Any]:
+        with self.lock:
+            return {"warm": self._account is not None, "entries": len(set(self._index.values())),
+                    "built_at": int(self.built_at)}
+
+
+def delete_watchlist_items(keys: List[str], state_path: Path, cfg: Dict[str, Any], log=None,
+                           session: Optional[PlexWatchlistSession] = None) -> Dict[str, Any]:
     """
+    Remove several items from the user's *online* Plex watchlist. With a warm `session`, keys found
+    in its GUID index cost one PUT each and nothing else; the rest (or everything, without a session)
+    go through one sign-in, one watchlist download and one removeFromWatchlist call.
+    Keys that were removed go into the hide-overlay (saved once); state.json is not modified,
+    the next sync reconciles it.
+    Returns {"ok", "deleted": [keys], "failed": {key: error}}; ok means nothing failed.
+    """
+    keys = list(dict.fromkeys(k for k in keys if k))
+    failed: Dict[str, str] = {}
+    if not keys:
+        return {"ok": False, "deleted": [], "failed": failed, "error": "no keys"}
     try:
         token = ((cfg.get("plex", {}) or {}).get("account_token") or "").strip()
         if not token:
-            return {"ok": False, "error": "missing plex token"}
+            return {"ok": False, "deleted": [], "failed": {k: "missing plex token" for k in keys}, "error": "missing plex token"}
 
-        # Build GUID candidates for matching
         state = {}
         try:
             if state_path and state_path.exists():
                 state = json.loads(state_path.read_text(encoding="utf-8"))
         except Exception:
             state = {}
-
         plex_items = (state.get("plex", {}) or {}).get("items", {}) or {}
         simkl_items = (state.get("simkl", {}) or {}).get("items", {}) or {}
-        item = plex_items.get(key) or simkl_items.get(key) or {}
-
-        guid, _ = _extract_plex_identifiers(item)
-        variants = _guid_variants_from_key_or_item(key, item)
-        if guid:
-            variants = list(dict.fromkeys(variants + [guid]))  # Remove duplicates
 
-        targets = {_norm_guid(v) for v in variants if v}
-        if not targets:
-            return {"ok": False, "error": "cannot derive a valid GUID for this key"}
-
-        # Match against Plex online watchlist
-        account = MyPlexAccount(token=token)
-        watchlist = account.watchlist()
-
-        found = None
-        for media in watchlist:
-            cand_guids = set()
-            primary = (getattr(media, "guid", "") or "").split("?", 1)[0]
-            if primary:
-                cand_guids.add(primary)
+        targets: Dict[str, Set[Tuple[str, str]]] = {}
+        for key in keys:
+            t = _targets_for(key, plex_items.get(key) or simkl_items.get(key) or {})
+            if t:
+                targets[key] = t
+            else:
+                failed[key] = "cannot derive a valid GUID for this key"
+
+        deleted: List[str] = []
+        if session is not None:
+            for key, t in targets.items():
+                rk = session.lookup(token, t)
+                if not rk:
+                    continue
+                try:
+                    session.remove(token, rk)
+                    deleted.append(key)
+                except Exception:
+                    pass  # stale index or a hiccup: the scan below settles it
+        rest = {k: t for k, t in targets.items() if k not in deleted}
+
+        # index misses: one watchlist download, indexed by every GUID each entry carries
+        by_guid: Dict[Tuple[str, str], Any] = {}
+        if rest:
+            account = session.account(token) if session is not None else MyPlexAccount(token=token)
+            watchlist = account.watchlist()
+            if session is not None:
+                session.index_from(token, watchlist)
+            for media in watchlist:
+                for g in _media_guids(media):
+                    by_guid.setdefault(g, media)
+
+        found: Dict[str, Any] = {}
+        for key, t in rest.items():
+            media = next((by_guid[g] for g in t if g in by_guid), None)
+            if media is None:
+                failed[key] = "item not found in Plex online watchlist"
+            else:
+                found[key] = media
+
+        if found:
+            medias = list({id(m): m for m in found.values()}.values())
             try:
-                for gg in getattr(media, "guids", []) or []:
-                    gid = str(getattr(gg, "id", gg) or "")
-                    if gid:
-                        cand_guids.add(gid.split("?", 1)[0])
+                account.removeFromWatchlist(medias)
+                deleted.extend(found)
             except Exception:
-                pass
-
-            if any(_norm_guid(cg) in targets for cg in cand_guids):
-                found = media
-                break
-
-        if not found:
-            return {"ok": False, "error": "item not found in Plex online watchlist"}
-
-        # Delete on Plex (will raise on failure)
-        account.removeFromWatchlist([found])
-
-        # Only on success: add to hide-overlay (local hidden set)
-        hide = _load_hide_set()  # Load current hidden keys
-        if key not in hide:
-            hide.add(key)  # Mark this key as deleted (hidden)
-            _save_hide_set(hide)  # Save the updated hidden keys list
-
-        if log:
-            log("WATCHLIST", f"[WATCHLIST] deleted {key} via PlexAPI")
-
-        return {"ok": True, "deleted": key}
+                # PlexAPI stops at the first failure: settle the rest one by one
+                for key, media in found.items():
+                    try:
+                        account.removeFromWatchlist([media])
+                        deleted.append(key)
+                    except BadRequest as e:
+                        try:
+                            gone = not account.onWatchlist(media)
+                        except Exception:
+                            gone = False
+                        if gone:
+                            deleted.append(key)  # went out with the batch (or was already gone)
+                        else:
+                            failed[key] = str(e)
+                    except Exception as e:
+                        failed[key] = str(e)
+
+        if deleted:
+            hide = _load_hide_set()
+            if not hide.issuperset(deleted):
+                _save_hide_set(hide | set(deleted))
+            if log:
+                log("WATCHLIST", f"[WATCHLIST] deleted {len(deleted)} item(s) via PlexAPI: {', '.join(deleted)}")
+        for key, err in failed.items():
+            if log:
+                log("TRBL", f"[WATCHLIST] {key}: {err}")
+
+        return {"ok": not failed, "deleted": deleted, "failed": failed}
 
     except Exception as e:
         if log:
             log("TRBL", f"[WATCHLIST] ERROR: {e}")
-        return {"ok": False, "error": str(e)}
+        return {"ok": False, "deleted": [], "failed": {k: str(e) for k in keys if k not in failed} | failed, "error": str(e)}
+
+
+def delete_watchlist_item(key: str, state_path: Path, cfg: Dict[str, Any], log=None,
+                          session: Optional[PlexWatchlistSession] = None) -> Dict[str, Any]:
+    """
+    Remove the item from the user's *online* Plex watchlist using PlexAPI.
+    On success, add the key to the local hide-overlay (so the UI stays consistent across refreshes).
+    This will update the local hidden items set, but state.json is not modified.
+    The next sync will reconcile state.
+    """
+    res = delete_watchlist_items([key], state_path, cfg, log=log, session=session)
+    if res.get("deleted"):
+        return {"ok": True, "deleted": key}
+    return {"ok": False, "error": (res.get("failed") or {}).get(key) or res.get("error") or "delete failed"}
@@ -3,7 +3,7 @@
   let lastStatusMs = 0;
   const STATUS_MIN_INTERVAL = 120000; // ms
 
-  let busy=false, esDet=null, esSum=null, plexPoll=null, simklPoll=null, appDebug=false, currentSummary=null;
+  let busy=false, esBus=null, busLogs=false, plexPoll=null, simklPoll=null, appDebug=false, currentSummary=null;
   let detStickBottom = true;  // auto-stick to bottom voor details-log
   let wallLoaded=false, _lastSyncEpoch=null, _wasRunning=false;
   window._ui = { status: null, summary: null };
@@ -161,11 +161,8 @@
     if (n === 'main') {
       layout.classList.remove('single');
       layout.classList.toggle('full', !appDebug && !hasStats);
-      refreshStatus();
-      if (!esSum) openSummaryStream();
+      if (!esBus) openEventStream();
       await updatePreviewVisibility();
-      refreshSchedulingBanner();
-      refreshStats(true);
     } else {
       layout.classList.add('single');
       layout.classList.remove('full');
@@ -201,12 +198,10 @@
     } finally {
       setBusy(false);
       recomputeRunDisabled();
-      refreshStatus();
     }
   }
 
   /* Version check + update notification */
-  const UPDATE_CHECK_INTERVAL_MS = 12 * 60 * 60 * 1000;
   let _updInfo = null;
 
   function openUpdateModal(){
@@ -366,8 +361,15 @@ async function checkForUpdate() {
   try {
     const r = await fetch('/api/version', { cache: 'no-store' });
     if (!r.ok) throw new Error('HTTP ' + r.status);
-    const j = await r.json();
+    renderVersion(await r.json());
+  } catch (err) {
+    console.debug('Version check failed:', err);
+  }
+}
 
+// pushed via /api/events (topic "version") or called by checkForUpdate()
+function renderVersion(j) {
+  try {
     const cur     = j.current || '0.0.0';
     const latest  = j.latest  || null;
     const url     = j.html_url || 'https://github.com/cenodude/plex-simkl-watchlist-sync/releases';
@@ -416,14 +418,6 @@ async function checkForUpdate() {
   }
 }
 
-// Run once after DOM is ready
-document.addEventListener('DOMContentLoaded', () => {
-  checkForUpdate();
-  // Optional: re-check when the tab becomes visible again
-  // document.addEventListener('visibilitychange', () => {
-  //   if (!document.hidden) checkForUpdate();
-  // });
-});
 
   // tiny toast 
   function showToast(text, onClick){
@@ -438,10 +432,6 @@ document.addEventListener('DOMContentLoaded', () => {
     setTimeout(()=>toast.classList.add('hidden'), 3000);
   }
 
-  // call at boot, and on a timer
-  checkForUpdate(true);
-  setInterval(()=>checkForUpdate(false), UPDATE_CHECK_INTERVAL_MS);
-
   /* ====== Summary stream + details log ====== */
   function renderSummary(sum){
     currentSummary = sum;
@@ -499,15 +489,25 @@ document.addEventListener('DOMContentLoaded', () => {
       window.wallLoaded = false;
       updatePreviewVisibility?.();
       loadWatchlist?.();
-      refreshSchedulingBanner?.();
     }
     _wasRunning = !!sum.running;
   }
 
-  function openSummaryStream(){
-    esSum = new EventSource('/api/run/summary/stream');
-    esSum.onmessage = (ev)=>{ try{ renderSummary(JSON.parse(ev.data)); }catch(_){} };
-    fetch('/api/run/summary').then(r=>r.json()).then(renderSummary).catch(()=>{});
+  /* ====== Event stream (one connection for summary, stats, scheduler, status, version, logs) ====== */
+  function openEventStream(){
+    if (esBus) { try { esBus.close(); } catch(_){} }
+    const topics = ['summary','stats','scheduler','status','version'];
+    if (busLogs) topics.push('logs:SYNC');
+    esBus = new EventSource('/api/events?topics=' + encodeURIComponent(topics.join(',')));
+    const on = (topic, fn) => esBus.addEventListener(topic, (ev) => { try { fn(JSON.parse(ev.data)); } catch(_){} });
+    on('summary',   renderSummary);
+    on('stats',     renderStats);
+    on('scheduler', renderSchedulingBanner);
+    on('status',    renderStatus);
+    on('version',   renderVersion);
+    // the server replays the log buffer on every (re)connect
+    esBus.onopen = () => { if (busLogs) { const el = document.getElementById('det-log'); if (el) el.innerHTML = ''; } };
+    esBus.addEventListener('logs:SYNC', (ev) => appendDetailsLog(ev.data));
   }
 
     let _lastStatsFetch = 0;
@@ -544,7 +544,13 @@ document.addEventListener('DOMContentLoaded', () => {
       _lastStatsFetch = nowT;
 
       try{
-        const j = await fetch('/api/stats', { cache:'no-store' }).then(r=>r.json());
+        renderStats(await fetch('/api/stats', { cache:'no-store' }).then(r=>r.json()));
+      }catch(_){}
+    }
+
+    // pushed via /api/events (topic "stats") or called by refreshStats()
+    function renderStats(j){
+      try{
         if (!j?.ok) return;
 
         const elNow = document.getElementById('stat-now');
@@ -674,16 +680,6 @@ document.addEventListener('DOMContentLoaded', () => {
     // Call once on boot
     document.addEventListener('DOMContentLoaded', _initStatsTooltip);
 
-  // Call at boot
-  document.addEventListener('DOMContentLoaded', () => { refreshStats(true); });
-
-  // Nudge the stats whenever the summary updates or a run finishes
-  const _origRenderSummary = (typeof renderSummary === 'function') ? renderSummary : null;
-  window.renderSummary = function(sum){
-    if (_origRenderSummary) _origRenderSummary(sum);
-    refreshStats(false);
-  };
-
 
   function openDetailsLog(){
     const el = document.getElementById('det-log');
@@ -691,7 +687,6 @@ document.addEventListener('DOMContentLoaded', () => {
     if (!el) return;
     el.innerHTML = '';
     detStickBottom = true;
-    if (esDet) { try{ esDet.close(); }catch(_){} esDet = null; }
 
     const updateSlider = () => {
       if (!slider) return;
@@ -713,25 +708,35 @@ document.addEventListener('DOMContentLoaded', () => {
       });
     }
 
-    esDet = new EventSource('/api/logs/stream?tag=SYNC');
-    esDet.onmessage = (ev) => {
-      if (!ev?.data) return;
-      el.insertAdjacentHTML('beforeend', ev.data + '<br>');
-      if (detStickBottom) el.scrollTop = el.scrollHeight;
-      updateSlider();
-    };
-
-    esDet.onerror = () => { try { esDet?.close(); } catch(_){} esDet = null; };
+    // re-subscribe the shared event stream with the SYNC log topic added
+    busLogs = true;
+    openEventStream();
     requestAnimationFrame(() => { el.scrollTop = el.scrollHeight; updateSlider(); });
   }
 
-  function closeDetailsLog(){ try { esDet?.close(); } catch(_){ } esDet=null; }
+  function appendDetailsLog(html){
+    const el = document.getElementById('det-log');
+    if (!el || !html) return;
+    el.insertAdjacentHTML('beforeend', html + '<br>');
+    if (detStickBottom) el.scrollTop = el.scrollHeight;
+    const slider = document.getElementById('det-scrub');
+    if (slider){
+      const max = el.scrollHeight - el.clientHeight;
+      slider.value = max <= 0 ? 100 : Math.round((el.scrollTop / max) * 100);
+    }
+  }
+
+  function closeDetailsLog(){
+    if (!busLogs) return;
+    busLogs = false;
+    if (esBus) openEventStream();
+  }
   function toggleDetails(){
     const d = document.getElementById('details');
     d.classList.toggle('hidden');
     if (!d.classList.contains('hidden')) openDetailsLog(); else closeDetailsLog();
   }
-  window.addEventListener('beforeunload', closeDetailsLog);
+  window.addEventListener('beforeunload', () => { try { esBus?.close(); } catch(_){} });
 
   /* ====== Summary copy / download ====== */
   async function copySummary(btn){
@@ -793,7 +798,12 @@ document.addEventListener('DOMContentLoaded', () => {
     if (!force && now - lastStatusMs < STATUS_MIN_INTERVAL) return;
     lastStatusMs = now;
 
-    const r = await fetch('/api/status' + (force ? '?fresh=1' : '')).then(r=>r.json());
+    renderStatus(await fetch('/api/status' + (force ? '?fresh=1' : '')).then(r=>r.json()));
+  }
+
+  // pushed via /api/events (topic "status") or called by refreshStatus()
+  function renderStatus(r){
+    if (!r) return;
     appDebug = !!r.debug;
 
     const pb = document.getElementById('badge-plex');
@@ -1018,22 +1028,22 @@ document.addEventListener('DOMContentLoaded', () => {
   function refreshSchedulingBanner(){
     fetch('/api/scheduling/status')
       .then(r => r.json())
-      .then(j => {
-        const span = document.getElementById('sched-inline');
-        if (!span) return;
-        if (j && j.config && j.config.enabled) {
-          const nextRun = j.next_run_at ? new Date(j.next_run_at*1000).toLocaleString() : '—';
-          span.textContent = `—   Scheduler running (next ${nextRun})`;
-          span.style.display = 'inline';
-        } else {
-          span.textContent = '';
-          span.style.display = 'none';
-        }
-      })
-      .catch(() => {
-        const span = document.getElementById('sched-inline');
-        if (span){ span.textContent = ''; span.style.display = 'none'; }
-      });
+      .then(renderSchedulingBanner)
+      .catch(() => renderSchedulingBanner(null));
+  }
+
+  // pushed via /api/events (topic "scheduler") or called by refreshSchedulingBanner()
+  function renderSchedulingBanner(j){
+    const span = document.getElementById('sched-inline');
+    if (!span) return;
+    if (j && j.config && j.config.enabled) {
+      const nextRun = j.next_run_at ? new Date(j.next_run_at*1000).toLocaleString() : '—';
+      span.textContent = `—   Scheduler running (next ${nextRun})`;
+      span.style.display = 'inline';
+    } else {
+      span.textContent = '';
+      span.style.display = 'none';
+    }
   }
 
   /* Troubleshooting actions */
@@ -1231,18 +1241,274 @@ document.addEventListener('DOMContentLoaded', () => {
   }
 
   /* ====== Watchlist (grid) ====== */
-  function artUrl(item, size){
+  const POSTER_WIDTHS = [160, 240, 342];
+  const POSTER_SIZES = '(max-width: 600px) 33vw, 180px';
+
+  function artUrl(item, size, w){
     const typ  = (item.type === 'tv' || item.type === 'show') ? 'tv' : 'movie';
     const tmdb = item.tmdb;
     if(!tmdb) return null;
-    const cb = window._lastSyncEpoch || 0;
-    return `/art/tmdb/${typ}/${tmdb}?size=${encodeURIComponent(size || 'w342')}&cb=${cb}`;
+    // versioned URLs are served immutable; no per-render cache-buster
+    const v = item.poster_v ? `&v=${encodeURIComponent(item.poster_v)}` : '';
+    const wq = w ? `&w=${w}` : '';
+    return `/art/tmdb/${typ}/${tmdb}?size=${encodeURIComponent(size || 'w342')}${wq}${v}`;
+  }
+
+  // resized WebP variants (server negotiates on Accept); the plain JPEG stays as src fallback
+  function artSrcset(item){
+    if(!item.tmdb) return '';
+    return POSTER_WIDTHS.map(w => `${artUrl(item, 'w342', w)} ${w}w`).join(', ');
+  }
+
+  // goes inside a double-quoted style="" attribute: single-quoted url(), and nothing that could close either
+  function lqipStyle(item){
+    const uri = item.lqip || '';
+    return uri && !/["'<>]/.test(uri) ? `background-image:url('${uri}');background-size:cover;` : '';
+  }
+
+  /* ====== Watchlist view paging ====== */
+  // the server keeps the merged view sorted/indexed; we page through it and only ask for the fields we render
+  const VIEW_PAGE = 300;
+  const VIEW_FIELDS = 'key,type,tmdb,status,title,year,added_epoch,poster_v,lqip';
+
+  function viewPager(url, params){
+    let cursor = null, done = false;
+    return {
+      get done(){ return done; },
+      async next(){
+        const q = new URLSearchParams({ limit: String(VIEW_PAGE), fields: VIEW_FIELDS, ...(params || {}) });
+        if (cursor) q.set('cursor', cursor);
+        const data = await fetch(`${url}?${q}`).then(r => r.json());
+        cursor = data.ok ? data.next : null;
+        done = !cursor;
+        return data;
+      }
+    };
+  }
+
+  async function fetchViewPages(url, params, onPage){
+    const pager = viewPager(url, params);
+    let first = null;
+    do {
+      const data = await pager.next();
+      if (!first) first = data;
+      if (!data.ok) return data;
+      if ((await onPage(data.items || [], data)) === false) break;  // caller has seen enough
+      if (!pager.done) await new Promise(r => requestAnimationFrame(r));  // let the page paint between chunks
+    } while (!pager.done);
+    return first;
+  }
+
+  /* ====== Batched localStorage writes ====== */
+  // many updates during one render become one setItem once the browser is idle
+  const lsPending = new Map();   // key -> () => value
+  function lsWriteSoon(key, valueFn){
+    const first = lsPending.size === 0;
+    lsPending.set(key, valueFn);
+    if (first) (window.requestIdleCallback || ((f) => setTimeout(f, 300)))(lsFlush);
+  }
+  function lsFlush(){
+    for (const [k, fn] of lsPending) { try { localStorage.setItem(k, JSON.stringify(fn())); } catch {} }
+    lsPending.clear();
+  }
+  window.addEventListener('pagehide', lsFlush);
+
+  let firstSeenMap = null;
+  function markFirstSeen(items){
+    if (!firstSeenMap) { try { firstSeenMap = JSON.parse(localStorage.getItem('wl_first_seen') || '{}') || {}; } catch { firstSeenMap = {}; } }
+    const now = Date.now();
+    let changed = false;
+    for (const it of items) if (!firstSeenMap[it.key]) { firstSeenMap[it.key] = now; changed = true; }
+    if (changed) lsWriteSoon('wl_first_seen', () => firstSeenMap);
+    return firstSeenMap;
+  }
+
+  /* ====== Windowed rendering ====== */
+  // Only the on-screen slice of a long list (plus `overscan` lines) lives in the DOM; cards that scroll
+  // out are recycled for the ones scrolling in. Two spacer elements stand in for everything else, so
+  // the scrollbar keeps its full length. axis 'y': multi-column grid scrolled by the page;
+  // axis 'x': single-row strip scrolled by the container itself.
+  function createVirtualList({ container, axis, make, fill, minWidth = 148, overscan = 2 }){
+    const st = { items: [], nodes: new Map(), pool: [], start: -1, end: -1, raf: 0, measured: false, card: 0 };
+    const head = document.createElement('div'), tail = document.createElement('div');
+    for (const sp of [head, tail]) { sp.className = 'vl-spacer'; sp.setAttribute('aria-hidden', 'true'); }
+    container.replaceChildren(head, tail);
+
+    const gapOf = () => {
+      const cs = getComputedStyle(container);
+      return parseFloat(axis === 'y' ? cs.rowGap : cs.columnGap) || 12;
+    };
+
+    function measure(){
+      const gap = gapOf();
+      const sample = st.nodes.values().next().value;
+      const w = container.clientWidth || 1;
+      if (sample) st.card = axis === 'y' ? sample.offsetHeight : sample.offsetWidth;
+      if (axis === 'y') {
+        const per = Math.max(1, Math.floor((w + gap) / (minWidth + gap)));
+        const cardH = st.card || ((w - (per - 1) * gap) / per) * 1.5;
+        const r = container.getBoundingClientRect();
+        return { per, gap, line: cardH + gap, from: -r.top, to: -r.top + window.innerHeight };
+      }
+      const cardW = st.card || Math.max(minWidth, w / 7);
+      return { per: 1, gap, line: cardW + gap, from: container.scrollLeft, to: container.scrollLeft + container.clientWidth };
+    }
+
+    function render(){
+      st.raf = 0;
+      const n = st.items.length;
+      if (!n) { for (const node of st.nodes.values()) node.remove(); st.nodes.clear(); head.style.display = tail.style.display = 'none'; return; }
+      const m = measure();
+      const lines = Math.ceil(n / m.per);
+      const first = Math.min(lines - 1, Math.max(0, Math.floor(m.from / m.line) - overscan));
+      const last = Math.max(first, Math.min(lines - 1, Math.ceil(m.to / m.line) + overscan));
+      const start = Math.min(n, first * m.per), end = Math.min(n, (last + 1) * m.per);
+
+      for (const [i, node] of st.nodes) {
+        if (i < start || i >= end) { st.nodes.delete(i); node.remove(); st.pool.push(node); }
+      }
+      const ordered = [];
+      for (let i = start; i < end; i++) {
+        let node = st.nodes.get(i);
+        if (!node) { node = st.pool.pop() || make(); fill(node, st.items[i], i); st.nodes.set(i, node); }
+        ordered.push(node);
+      }
+      const skipped = first, rest = Math.max(0, lines - last - 1);
+      if (axis === 'y') {
+        for (const [sp, k] of [[head, skipped], [tail, rest]]) {
+          sp.style.display = k ? '' : 'none';
+          sp.style.gridColumn = '1 / -1';
+          sp.style.height = k ? `${k * m.line - m.gap}px` : '0';
+        }
+      } else {
+        head.style.display = start ? '' : 'none'; head.style.gridColumn = `span ${Math.max(1, start)}`;
+        tail.style.display = n - end ? '' : 'none'; tail.style.gridColumn = `span ${Math.max(1, n - end)}`;
+      }
+      if (start !== st.start || end !== st.end) container.replaceChildren(head, ...ordered, tail);
+      st.start = start; st.end = end;
+      // the first pass sized lines from an estimate; re-run once a real card can be measured
+      if (!st.measured && st.nodes.size) { st.measured = true; schedule(); }
+    }
+
+    function schedule(){ if (!st.raf) st.raf = requestAnimationFrame(render); }
+    const scroller = axis === 'y' ? window : container;
+    scroller.addEventListener('scroll', schedule, { passive: true });
+    window.addEventListener('resize', schedule, { passive: true });
+
+    return {
+      get items(){ return st.items; },
+      append(items){ st.items.push(...items); st.start = st.end = -1; schedule(); },
+      remove(pred){
+        const keep = st.items.filter(it => !pred(it));
+        if (keep.length === st.items.length) return;
+        st.items = keep;
+        for (const node of st.nodes.values()) { node.remove(); st.pool.push(node); }
+        st.nodes.clear(); st.start = st.end = -1; schedule();
+      },
+      refresh: schedule,
+      destroy(){
+        scroller.removeEventListener('scroll', schedule);
+        window.removeEventListener('resize', schedule);
+        if (st.raf) cancelAnimationFrame(st.raf);
+      }
+    };
+  }
+
+  /* ====== TMDb descriptions (batched) ====== */
+  // cards register their .desc element; the ones scrolled into view are fetched together in one POST
+  const metaWaiting = new Map();   // "type:tmdb" -> [descEl, ...]
+  let metaTimer = null;
+  let metaObserver = null;
+
+  function queueMeta(type, tmdb, descEl){
+    if (!descEl || descEl.dataset.loaded || descEl.dataset.queued) return;
+    descEl.dataset.queued = '1';
+    const k = `${type}:${tmdb}`;
+    if (!metaWaiting.has(k)) metaWaiting.set(k, []);
+    metaWaiting.get(k).push(descEl);
+    if (!metaTimer) metaTimer = setTimeout(flushMeta, 60);
+  }
+
+  async function flushMeta(){
+    metaTimer = null;
+    const batch = new Map(metaWaiting); metaWaiting.clear();
+    const keys = [...batch.keys()];
+    for (let i = 0; i < keys.length; i += 200) {
+      const chunk = keys.slice(i, i + 200);
+      let found = {};
+      try {
+        const body = { items: chunk.map(k => { const [type, tmdb] = k.split(':'); return { type, tmdb: Number(tmdb) }; }) };
+        const r = await fetch('/api/tmdb/meta/batch', {
+          method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify(body)
+        }).then(r => r.json());
+        found = r?.items || {};
+      } catch {}
+      for (const k of chunk) {
+        for (const el of batch.get(k) || []) {
+          el.textContent = found[k]?.overview || '—';
+          el.dataset.loaded = '1';
+        }
+      }
+    }
+  }
+
+  function watchMeta(card, type, tmdb, descEl){
+    if (!descEl) return;
+    if (!('IntersectionObserver' in window)) { queueMeta(type, tmdb, descEl); return; }
+    if (!metaObserver) {
+      metaObserver = new IntersectionObserver((entries) => {
+        for (const e of entries) {
+          if (!e.isIntersecting) continue;
+          metaObserver.unobserve(e.target);
+          const d = e.target._meta; if (d) queueMeta(d.type, d.tmdb, d.el);
+        }
+      }, { rootMargin: '200px' });
+    }
+    card._meta = { type, tmdb, el: descEl };
+    metaObserver.observe(card);
+    if (!card._metaHover) {
+      // cards are recycled: bind once, read whatever the card shows now
+      card._metaHover = true;
+      card.addEventListener('mouseenter', () => { const d = card._meta; if (d) queueMeta(d.type, d.tmdb, d.el); }, { passive: true });
+    }
+  }
+
+  let wallList = null, wallLoad = 0;
+
+  function wallFill(a, it, uiStatus){
+    a.href = `https://www.themoviedb.org/${it.type}/${it.tmdb}`;
+    a.dataset.type = it.type; a.dataset.tmdb = String(it.tmdb); a.dataset.key = it.key || '';
+    a.dataset.source = uiStatus;
+
+    let pillText, pillClass;
+    if (uiStatus === 'deleted')      { pillText = 'DELETED';  pillClass = 'p-del'; }
+    else if (uiStatus === 'both')    { pillText = 'SYNCED';   pillClass = 'p-syn'; }
+    else if (uiStatus === 'plex_only'){ pillText = 'PLEX';     pillClass = 'p-px'; }
+    else                              { pillText = 'SIMKL';    pillClass = 'p-sk'; }
+
+    const esc = (v) => String(v ?? '').replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/"/g, '&quot;');
+    a.innerHTML = `
+      <img loading="lazy" decoding="async" alt="${esc(`${it.title || ''} (${it.year || ''})`)}"
+           srcset="${artSrcset(it)}" sizes="${POSTER_SIZES}" src="${artUrl(it, 'w342')}" style="${lqipStyle(it)}">
+      <div class="ovr"><div class="pill ${pillClass}">${pillText}</div></div>
+      <div class="cap">${esc(`${it.title || ''} ${it.year ? '· ' + it.year : ''}`)}</div>
+      <div class="hover">
+        <div class="titleline">${it.title || ''}</div>
+        <div class="meta">
+          <div class="chip src">${uiStatus === 'deleted' ? 'Status: Deleted' : (uiStatus === 'both' ? 'Source: Synced' : (uiStatus === 'plex_only' ? 'Source: Plex' : 'Source: SIMKL'))}</div>
+          <div class="chip time" id="time-${it.type}-${it.tmdb}">${_lastSyncEpoch ? ('updated ' + relTimeFromEpoch(_lastSyncEpoch)) : ''}</div>
+        </div>
+        <div class="desc" id="desc-${it.type}-${it.tmdb}">Fetching description…</div>
+      </div>`;
+    watchMeta(a, it.type, it.tmdb, a.querySelector('.desc'));
   }
 
   async function loadWall() {
     const card = document.getElementById('placeholder-card');
     const msg = document.getElementById('wall-msg');
     const row = document.getElementById('poster-row');
+    wallList?.destroy(); wallList = null;
+    const load = ++wallLoad;
     msg.textContent = 'Loading…'; row.innerHTML = ''; row.classList.add('hidden'); card.classList.remove('hidden');
 
     const hiddenMap = new Map(
@@ -1254,154 +1520,232 @@ document.addEventListener('DOMContentLoaded', () => {
       if (isLocallyHidden(item.key) && item.status === 'deleted') return true;
       if (isLocallyHidden(item.key) && item.status !== 'deleted') {
         hiddenMap.delete(item.key);
-        localStorage.setItem('wl_hidden', JSON.stringify([...hiddenMap.keys()]));
+        lsWriteSoon('wl_hidden', () => [...hiddenMap.keys()]);
       }
       return (window._deletedKeys && window._deletedKeys.has(item.key)) || false;
     };
 
     try {
-      const data = await fetch('/api/state/wall').then(r => r.json());
+      let list = null, shown = 0;
+      // pages come newest-first from the server: the first one paints right away, later ones are appended
+      const data = await fetchViewPages('/api/state/wall', null, (page, d) => {
+        if (d.missing_tmdb_key) return false;
+        if (load !== wallLoad) return false;  // reloaded meanwhile
+        _lastSyncEpoch = d.last_sync_epoch || null;
+        const firstSeen = markFirstSeen(page);
+        const getTs = (it) => {
+          const s =
+            it.added_epoch ?? it.added_ts ?? it.created_ts ?? it.created ?? it.epoch ?? null;
+          return Number(s || firstSeen[it.key] || 0);
+        };
+        const items = page.filter(it => it.tmdb).sort((a, b) => getTs(b) - getTs(a));
+        if (!items.length) return;
+        if (!list) {
+          msg.classList.add('hidden'); row.classList.remove('hidden');
+          // only the posters in (or near) the visible strip exist as DOM nodes
+          list = wallList = createVirtualList({
+            container: row,
+            axis: 'x',
+            overscan: 4,
+            make: () => {
+              const a = document.createElement('a');
+              a.className = 'poster'; a.target = '_blank'; a.rel = 'noopener';
+              return a;
+            },
+            fill: (a, it) => wallFill(a, it, isDeleted(it) ? 'deleted' : it.status),
+          });
+        }
+        list.append(items);
+        shown += items.length;
+        if (!row._wallWired) { row._wallWired = true; initWallInteractions(); }
+        else updateEdges();
+      });
+      if (load !== wallLoad) return;
       if (data.missing_tmdb_key) { card.classList.add('hidden'); return; }
       if (!data.ok) { msg.textContent = data.error || 'No state data found.'; return; }
-      let items = data.items || [];
-      _lastSyncEpoch = data.last_sync_epoch || null;
-      if (items.length === 0) { msg.textContent = 'No items to show yet.'; return; }
-      msg.classList.add('hidden'); row.classList.remove('hidden');
-
-      const firstSeen = (() => { try { return JSON.parse(localStorage.getItem('wl_first_seen') || '{}'); } catch { return {}; } })();
-      const getTs = (it) => {
-        const s =
-          it.added_epoch ?? it.added_ts ?? it.created_ts ?? it.created ?? it.epoch ?? null;
-        return Number(s || firstSeen[it.key] || 0);
-      };
+      if (!shown) { msg.textContent = 'No items to show yet.'; return; }
+    } catch { msg.textContent = 'Failed to load preview.'; }
+  }
+
 
-      const now = Date.now();
-      for (const it of items) {
-        if (!firstSeen[it.key]) firstSeen[it.key] = now;
+  function wlFill(node, it, hidden) {
+    node.classList.remove('wl-removing');
+    node.classList.toggle('wl-selected', wlSelected.has(it.key));
+    node.dataset.key = it.key;
+    node.dataset.type = it.type === 'tv' || it.type === 'show' ? 'tv' : 'movie';
+    node.dataset.tmdb = String(it.tmdb || '');
+    node.dataset.status = it.status;
+    const pillText = it.status === 'both' ? 'SYNCED' : (it.status === 'plex_only' ? 'PLEX' : 'SIMKL');
+    const pillClass = it.status === 'both' ? 'p-syn' : (it.status === 'plex_only' ? 'p-px' : 'p-sk');
+    
+    node.innerHTML = `
+      <img alt="" loading="lazy" decoding="async" style="${lqipStyle(it)}"
+           srcset="${artSrcset(it)}" sizes="${POSTER_SIZES}"
+           src="${artUrl(it, 'w342') || ''}" onerror="this.style.display='none'">
+      <button class="wl-del icon-btn trash"
+              type="button"
+              title="Remove from Plex watchlist"
+              aria-label="Remove from Plex watchlist"
+              onclick="deletePoster(event, '${encodeURIComponent(it.key)}', this)">
+        <svg class="ico" viewBox="0 0 24 24" aria-hidden="true">
+          <path class="lid" d="M9 4h6l1 2H8l1-2z"/>
+          <path d="M6 7h12l-1 13H7L6 7z"/>
+          <path d="M10 11v6M14 11v6"/>
+        </svg>
+      </button>
+
+      <div class="wl-ovr ovr"><span class="pill ${pillClass}">${pillText}</span></div>
+      <div class="wl-cap cap">${(it.title || '').replace(/"/g, '&quot;')} ${it.year ? '· ' + it.year : ''}</div>
+      <div class="wl-hover hover">
+        <div class="titleline">${(it.title || '')}</div>
+        <div class="meta">
+          <div class="chip src">${it.status === 'both' ? 'Source: Synced' : (it.status === 'plex_only' ? 'Source: Plex' : 'Source: SIMKL')}</div>
+          <div class="chip time">${relTimeFromEpoch(it.added_epoch)}</div>
+        </div>
+        <div class="desc" id="wldesc-${node.dataset.type}-${node.dataset.tmdb}">${it.tmdb ? 'Fetching description…' : '—'}</div>
+      </div>`;
+
+    if (hidden.has(it.key)) {
+      const pill = node.querySelector('.pill');
+      // Instead of forcing DELETED, mark visually
+      pill.classList.add('p-del');
+      // keep original text (SYNCED, PLEX, SIMKL, …)
+      // or optionally append marker
+      // pill.textContent = pill.textContent + ' (hidden)';
+    }
+    watchMeta(node, node.dataset.type, it.tmdb, node.querySelector('.wl-hover .desc'));
+  }
+
+  let wlList = null, wlMore = null;
+
+  /* ====== Multi-select (bulk delete) ====== */
+  const wlSelected = new Set();   // keys, not nodes: cards are recycled by the virtual grid
+  let wlSelecting = false;
+
+  function updateWlSelUi() {
+    const n = wlSelected.size;
+    const count = document.getElementById('wl-sel-count');
+    const del = document.getElementById('wl-del-selected');
+    document.getElementById('wl-select')?.classList.toggle('active', wlSelecting);
+    document.getElementById('wl-grid')?.classList.toggle('selecting', wlSelecting);
+    if (count) { count.textContent = n + ' selected'; count.classList.toggle('hidden', !wlSelecting); }
+    if (del) { del.classList.toggle('hidden', !wlSelecting); del.disabled = !n; }
+  }
+
+  function toggleWlSelect(force) {
+    wlSelecting = typeof force === 'boolean' ? force : !wlSelecting;
+    if (!wlSelecting) {
+      wlSelected.clear();
+      document.querySelectorAll('#wl-grid .wl-selected').forEach(n => n.classList.remove('wl-selected'));
+    }
+    updateWlSelUi();
+  }
+
+  function wireWlSelect(grid) {
+    if (grid._selWired) return;
+    grid._selWired = true;
+    grid.addEventListener('click', (ev) => {
+      if (!wlSelecting) return;
+      const card = ev.target.closest('.wl-poster');
+      if (!card || ev.target.closest('.wl-del')) return;
+      ev.preventDefault();
+      const key = card.dataset.key;
+      if (wlSelected.has(key)) wlSelected.delete(key); else wlSelected.add(key);
+      card.classList.toggle('wl-selected', wlSelected.has(key));
+      updateWlSelUi();
+    });
+  }
+
+  // Delete every selected title in one request; failures stay selected for a retry
+  async function deleteSelected() {
+    const keys = [...wlSelected];
+    const btn = document.getElementById('wl-del-selected');
+    if (!keys.length || !btn) return;
+    btn.disabled = true;
+    btn.classList.add('loading');
+    try {
+      const res = await fetch('/api/watchlist/delete', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ keys }),
+      });
+      const j = await res.json().catch(() => ({}));
+      const gone = new Set(j.deleted || []);
+      if (gone.size) {
+        gone.forEach(k => wlSelected.delete(k));
+        if (wlList) wlList.remove(it => gone.has(it.key));
+        const hidden = new Set(JSON.parse(localStorage.getItem('wl_hidden') || '[]'));
+        gone.forEach(k => hidden.add(k));
+        localStorage.setItem('wl_hidden', JSON.stringify([...hidden]));
+        window.dispatchEvent(new Event('storage'));
       }
-      localStorage.setItem('wl_first_seen', JSON.stringify(firstSeen));
-
-      items = items.slice().sort((a, b) => getTs(b) - getTs(a));
-
-      for (const it of items) {
-        if (!it.tmdb) continue;
-        const a = document.createElement('a');
-        a.className = 'poster';
-        a.href = `https://www.themoviedb.org/${it.type}/${it.tmdb}`; a.target = '_blank'; a.rel = 'noopener';
-        a.dataset.type = it.type; a.dataset.tmdb = String(it.tmdb); a.dataset.key = it.key || '';
-        const uiStatus = isDeleted(it) ? 'deleted' : it.status; a.dataset.source = uiStatus;
-
-        const img = document.createElement('img');
-        img.loading = 'lazy'; img.alt = `${it.title || ''} (${it.year || ''})`; img.src = artUrl(it, 'w342'); a.appendChild(img);
-
-        const ovr = document.createElement('div'); ovr.className = 'ovr';
-        let pillText, pillClass;
-        if (uiStatus === 'deleted')      { pillText = 'DELETED';  pillClass = 'p-del'; }
-        else if (uiStatus === 'both')    { pillText = 'SYNCED';   pillClass = 'p-syn'; }
-        else if (uiStatus === 'plex_only'){ pillText = 'PLEX';     pillClass = 'p-px'; }
-        else                              { pillText = 'SIMKL';    pillClass = 'p-sk'; }
-        const pill = document.createElement('div'); pill.className = 'pill ' + pillClass; pill.textContent = pillText; ovr.appendChild(pill); a.appendChild(ovr);
-
-        const cap = document.createElement('div'); cap.className = 'cap'; cap.textContent = `${it.title || ''} ${it.year ? '· ' + it.year : ''}`; a.appendChild(cap);
-
-        const hover = document.createElement('div'); hover.className = 'hover';
-        hover.innerHTML = `
-          <div class="titleline">${it.title || ''}</div>
-          <div class="meta">
-            <div class="chip src">${uiStatus === 'deleted' ? 'Status: Deleted' : (uiStatus === 'both' ? 'Source: Synced' : (uiStatus === 'plex_only' ? 'Source: Plex' : 'Source: SIMKL'))}</div>
-            <div class="chip time" id="time-${it.type}-${it.tmdb}">${_lastSyncEpoch ? ('updated ' + relTimeFromEpoch(_lastSyncEpoch)) : ''}</div>
-          </div>
-          <div class="desc" id="desc-${it.type}-${it.tmdb}">Fetching description…</div>
-        `;
-        a.appendChild(hover);
-
-        a.addEventListener('mouseenter', async () => {
-          const descEl = document.getElementById(`desc-${it.type}-${it.tmdb}`);
-          if (!descEl || descEl.dataset.loaded) return;
-          try {
-            const cb = window._lastSyncEpoch || 0;
-            const meta = await fetch(`/api/tmdb/meta/${it.type}/${it.tmdb}?cb=${cb}`).then(r => r.json());
-            descEl.textContent = meta?.overview || '—';
-            descEl.dataset.loaded = '1';
-          } catch { descEl.textContent = '—'; descEl.dataset.loaded = '1'; }
-        }, { passive: true });
-
-        row.appendChild(a);
+      const failed = Object.keys(j.failed || {});
+      if (failed.length || !res.ok) {
+        console.warn('deleteSelected: not removed', j.failed || j.error);
+        showToast(`${failed.length || keys.length} item(s) could not be removed`);
       }
-      initWallInteractions();
-    } catch { msg.textContent = 'Failed to load preview.'; }
+    } catch (e) {
+      console.warn('deleteSelected error', e);
+    } finally {
+      btn.classList.remove('loading');
+      updateWlSelUi();
+    }
   }
 
-
   async function loadWatchlist() {
     const grid = document.getElementById('wl-grid');
     const msg = document.getElementById('wl-msg');
+    wlList?.destroy(); wlList = null;
+    wlMore?.disconnect(); wlMore = null;
+    wlSelected.clear(); updateWlSelUi();
+    wireWlSelect(grid);
     grid.innerHTML = ''; grid.classList.add('hidden'); msg.textContent = 'Loading…'; msg.classList.remove('hidden');
     try {
-      const data = await fetch('/api/watchlist').then(r => r.json());
+      const hidden = new Set(JSON.parse(localStorage.getItem('wl_hidden') || '[]'));
+      const pager = viewPager('/api/watchlist');
+      const data = await pager.next();
       if (data.missing_tmdb_key) { msg.textContent = 'Set a TMDb API key to see posters.'; return; }
       if (!data.ok) { msg.textContent = data.error || 'No state data found.'; return; }
-      const items = data.items || [];
-      if (items.length === 0) { msg.textContent = 'No items on your watchlist yet.'; return; }
+      if (!data.total) { msg.textContent = 'No items on your watchlist yet.'; return; }
       msg.classList.add('hidden'); grid.classList.remove('hidden');
-      for (const it of items) {
-        if (!it.tmdb) continue;
-        const node = document.createElement('div');
-        node.className = 'wl-poster poster';
-        node.dataset.key = it.key;
-        node.dataset.type = it.type === 'tv' || it.type === 'show' ? 'tv' : 'movie';
-        node.dataset.tmdb = String(it.tmdb || '');
-        node.dataset.status = it.status;
-        const pillText = it.status === 'both' ? 'SYNCED' : (it.status === 'plex_only' ? 'PLEX' : 'SIMKL');
-        const pillClass = it.status === 'both' ? 'p-syn' : (it.status === 'plex_only' ? 'p-px' : 'p-sk');
-        
-        node.innerHTML = `
-          <img alt="" src="${artUrl(it, 'w342') || ''}" onerror="this.style.display='none'">
-          <button class="wl-del icon-btn trash"
-                  type="button"
-                  title="Remove from Plex watchlist"
-                  aria-label="Remove from Plex watchlist"
-                  onclick="deletePoster(event, '${encodeURIComponent(it.key)}', this)">
-            <svg class="ico" viewBox="0 0 24 24" aria-hidden="true">
-              <path class="lid" d="M9 4h6l1 2H8l1-2z"/>
-              <path d="M6 7h12l-1 13H7L6 7z"/>
-              <path d="M10 11v6M14 11v6"/>
-            </svg>
-          </button>
-
-          <div class="wl-ovr ovr"><span class="pill ${pillClass}">${pillText}</span></div>
-          <div class="wl-cap cap">${(it.title || '').replace(/"/g, '&quot;')} ${it.year ? '· ' + it.year : ''}</div>
-          <div class="wl-hover hover">
-            <div class="titleline">${(it.title || '')}</div>
-            <div class="meta">
-              <div class="chip src">${it.status === 'both' ? 'Source: Synced' : (it.status === 'plex_only' ? 'Source: Plex' : 'Source: SIMKL')}</div>
-              <div class="chip time">${relTimeFromEpoch(it.added_epoch)}</div>
-            </div>
-            <div class="desc" id="wldesc-${node.dataset.type}-${node.dataset.tmdb}">${it.tmdb ? 'Fetching description…' : '—'}</div>
-          </div>`;
 
-        const hidden = new Set(JSON.parse(localStorage.getItem('wl_hidden') || '[]'));
-        if (hidden.has(it.key)) {
-          const pill = node.querySelector('.pill');
-          // Instead of forcing DELETED, mark visually
-          pill.classList.add('p-del');
-          // keep original text (SYNCED, PLEX, SIMKL, …)
-          // or optionally append marker
-          // pill.textContent = pill.textContent + ' (hidden)';
-        }
-
-        node.addEventListener('mouseenter', async () => {
-          const descEl = document.getElementById(`wldesc-${it.type}-${it.tmdb}`);
-          if (!descEl || descEl.dataset.loaded) return;
-          try {
-            const cb = window._lastSyncEpoch || Date.now();
-            const meta = await fetch(`/api/tmdb/meta/${it.type}/${it.tmdb}?cb=${cb}`).then(r => r.json());
-            descEl.textContent = meta?.overview || '—';
-            descEl.dataset.loaded = '1';
-          } catch { descEl.textContent = '—'; descEl.dataset.loaded = '1'; }
-        }, { passive: true });
-
-        grid.appendChild(node);
+      // only on-screen rows are in the DOM; cards are recycled while scrolling
+      wlList = createVirtualList({
+        container: grid,
+        axis: 'y',
+        make: () => { const node = document.createElement('div'); node.className = 'wl-poster poster'; return node; },
+        fill: (node, it) => wlFill(node, it, hidden),
+      });
+      const take = (page) => wlList?.append((page.items || []).filter(it => it.tmdb));
+      take(data);
+
+      // further pages load when the end of the grid comes near
+      let sentinel = grid.nextElementSibling;
+      if (!sentinel || !sentinel.classList.contains('wl-more')) {
+        sentinel = document.createElement('div'); sentinel.className = 'wl-more'; sentinel.setAttribute('aria-hidden', 'true');
+        grid.after(sentinel);
+      }
+      const near = () => sentinel.getBoundingClientRect().top < window.innerHeight + 800;
+      let busy = false;
+      const more = async () => {
+        if (busy) return;
+        busy = true;
+        try {
+          while (wlList && !pager.done) {
+            const d = await pager.next();
+            if (!d.ok) break;
+            take(d);
+            await new Promise(r => requestAnimationFrame(r));
+            if (!('IntersectionObserver' in window)) continue;   // no observer: just load everything
+            if (!near()) break;
+          }
+        } finally { busy = false; }
+      };
+      if ('IntersectionObserver' in window) {
+        wlMore = new IntersectionObserver((entries) => { if (entries.some(e => e.isIntersecting)) more(); }, { rootMargin: '800px' });
+        wlMore.observe(sentinel);
+      } else {
+        more();
       }
     } catch (error) {
       console.error('Error loading watchlist:', error);
@@ -1427,7 +1771,10 @@ document.addEventListener('DOMContentLoaded', () => {
       // fade out and remove
       if (card) {
         card.classList.add('wl-removing');
-        setTimeout(() => { card.remove(); }, 350);
+        setTimeout(() => {
+          // the card node is recycled by the virtual grid; drop the item, not the element
+          if (wlList) wlList.remove(it => it.key === key); else card.remove();
+        }, 350);
       }
 
       // persist hidden key (your existing behavior)
@@ -1479,6 +1826,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
   /* ====== Boot ====== */
   showTab('main');
+  refreshStatus(); // first probe result; later changes arrive on the event stream
   updateWatchlistTabVisibility();
   window.addEventListener('storage', (event) => { if (event.key === 'wl_hidden') { loadWatchlist(); } });
 
@@ -36,6 +36,7 @@ GitHub: https://github.com/cenodude/Plex-SIMKL-Watchlist-Sync
 """
 
 import argparse
+import hashlib
 import json
 import re
 import time
@@ -49,6 +50,8 @@ from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
 from typing import Any, Sequence, Tuple, List, Dict, Set, Optional, NoReturn, cast
 
+from _statistics import Stats  # canonical item keys, shared with the web app's statistics
+
 __VERSION__ = "v0.4.5"
 
 # --- timestamped & colored print ---
@@ -155,10 +158,39 @@ def load_state(path: Path) -> Optional[dict]:
     except Exception:
         return None
 
+# state.json as it was before this run's first save; every save records its key delta against it
+_STATE_BASE: Optional[dict] = None
+
+def _state_keys(data: dict) -> Dict[str, Set[str]]:
+    return {side: set(((data.get(side) or {}).get("items") or {}).keys()) for side in ("plex", "simkl")}
+
+def state_checksum(data: dict) -> str:
+    items = {side: (data.get(side) or {}).get("items") or {} for side in ("plex", "simkl")}
+    return hashlib.sha1(json.dumps(items, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
 def save_state(path: Path, data: dict) -> None:
+    global _STATE_BASE
+    if _STATE_BASE is None:
+        prev = load_state(path) or {}
+        _STATE_BASE = {
+            "epoch": int(prev.get("last_sync_epoch") or 0),
+            "checksum": prev.get("checksum"),
+            "keys": _state_keys(prev),
+        }
     data = dict(data)
     data["version"] = 2
     data["last_sync_epoch"] = int(time.time())
+    # per-side added/removed keys since the base state, so readers (web app stats) can update
+    # incrementally when they last saw exactly that base (base_checksum)
+    cur_keys = _state_keys(data)
+    delta: Dict[str, Any] = {"base_epoch": _STATE_BASE["epoch"], "base_checksum": _STATE_BASE["checksum"]}
+    for side in ("plex", "simkl"):
+        delta[side] = {
+            "added": sorted(cur_keys[side] - _STATE_BASE["keys"][side]),
+            "removed": sorted(_STATE_BASE["keys"][side] - cur_keys[side]),
+        }
+    data["delta"] = delta
+    data["checksum"] = state_checksum(data)
     _write_text(path, json.dumps(data, indent=2))
 
 def clear_state(path: Path) -> None:
@@ -809,6 +841,13 @@ def neutral_precheck_msg(plex_total: int, simkl_total: int) -> None:
     else:
         print(f"[i] Pre-sync counts: Plex={plex_total} vs SIMKL={simkl_total} (differences)")
 
+def live_counts_msg(plex_idx: Dict[str, dict], simkl_idx: Dict[str, dict]) -> None:
+    # parsed by the web app: running Plex ∪ SIMKL size without re-reading state.json.
+    # Counted under the same canonical keys as Stats, so the live numbers match the final ones.
+    plex_keys = {k for k in map(Stats.canonical_key, plex_idx.values()) if k}
+    simkl_keys = {k for k in map(Stats.canonical_key, simkl_idx.values()) if k}
+    print(f"[i] Live counts: union={len(plex_keys | simkl_keys)} plex={len(plex_keys)} simkl={len(simkl_keys)}")
+
 def colored_postcheck(plex_total: int, simkl_total: int) -> None:
     ok = plex_total == simkl_total
     msg = "EQUAL" if ok else "NOT EQUAL"
@@ -1116,6 +1155,7 @@ def main() -> None:
     plex_total = len(plex_idx)
     simkl_total = len(simkl_idx)
     neutral_precheck_msg(plex_total, simkl_total)
+    live_counts_msg(plex_idx, simkl_idx)
 
     # 3) Plan differences for two-way / mirror
     def keyset(idx: Dict[str, dict], typ: str) -> Set[str]:
@@ -1244,6 +1284,7 @@ def main() -> None:
                 
                 # Save updated state after removal
                 save_state(STATE_PATH, snapshot_for_state(plex_idx, simkl_idx, curr_acts or prev_acts or {}))
+                live_counts_msg(plex_idx, simkl_idx)
 
             # SIMKL → Plex (adds)
             if enable_add and simkl_added_keys:
@@ -1358,6 +1399,7 @@ def main() -> None:
         print(ANSI_R + "[!] Some actions failed; NOT saving state." + ANSI_X)
     elif equal_now:
         save_state(STATE_PATH, snapshot_for_state(plex_idx, simkl_idx, curr_acts or prev_acts or {}))
+        live_counts_msg(plex_idx, simkl_idx)
         if debug:
             print("[debug] State updated.")
     else:
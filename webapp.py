@@ -4,6 +4,7 @@
 Web UI backend (FastAPI)
 """
 import requests
+import hashlib
 import json
 import re
 import secrets
@@ -18,15 +19,14 @@ import shlex
 import urllib.request
 import urllib.error
 import urllib.parse
+from email.utils import formatdate, parsedate_to_datetime
 from _statistics import Stats
 from fastapi import Query
 from fastapi.responses import StreamingResponse
-from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse, Response
 from fastapi.responses import JSONResponse
-from _watchlist import build_watchlist, delete_watchlist_item
+from _watchlist import PlexWatchlistSession, WatchlistView, delete_watchlist_item, delete_watchlist_items
 from _FastAPI import get_index_html
-from functools import lru_cache
 from packaging.version import Version, InvalidVersion
 from fastapi import APIRouter, HTTPException
 from datetime import datetime, timezone
@@ -34,6 +34,8 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 from contextlib import asynccontextmanager
 from typing import Optional
+import asyncio
+from starlette.concurrency import run_in_threadpool
 
 import uvicorn
 from fastapi import Body, FastAPI, Request, Path as FPath, Query
@@ -52,8 +54,16 @@ from _auth_helper import (
     simkl_build_authorize_url,
     simkl_exchange_code,
 )
-from _TMDB import get_poster_file, get_meta, get_runtime
+from _TMDB import add_meta_listener, peek_meta, poster_version, poster_cached
+from _posters import get_variant, peek_lqip, pick_format
 from _scheduling import SyncScheduler
+from _events import EventHub, sse_stream
+from _warmup import PRIO_URGENT, TmdbWarmup
+from _cache import CacheManager
+from _reports import ReportStore
+from _tmdb_async import AsyncTmdbClient
+from _compress import AssetBundle, BundledStaticFiles, CompressionMiddleware
+from _monitor import ConnectivityMonitor
 
 ROOT = Path(__file__).resolve().parent
 
@@ -97,11 +107,14 @@ async def _lifespan(app):
         except Exception:
             pass
 app = FastAPI(lifespan=_lifespan, )
+app.add_middleware(CompressionMiddleware)  # gzip/br for JSON bodies >= 1KB; SSE untouched
 
 # --assets image mapping
+# UI files are hashed + precompressed once; the index links to /assets/<name>.<hash>.<ext> (immutable)
 ASSETS_DIR = ROOT / "assets"
 ASSETS_DIR.mkdir(parents=True, exist_ok=True)
-app.mount("/assets", StaticFiles(directory=str(ASSETS_DIR)), name="assets")
+ASSETS = AssetBundle(ASSETS_DIR, ("background.svg", "crosswatch.css", "crosswatch.js"))
+app.mount("/assets", BundledStaticFiles(ASSETS, directory=str(ASSETS_DIR)), name="assets")
 
 # --- Versioning ---
 CURRENT_VERSION = os.getenv("APP_VERSION", "v0.4.5")  # keep in sync with release tag....i think
@@ -112,11 +125,22 @@ router = APIRouter()
 
 
 # -- Statistics (singleton) ---
-STATS = Stats()
+def _cached_runtime(typ: str, tmdb_id: int) -> Optional[int]:
+    """Runtime from the local TMDb cache only (stats must never wait on the network)."""
+    return (peek_meta(typ, tmdb_id, CACHE_DIR) or {}).get("runtime")
+
+STATS = Stats(runtime_lookup=_cached_runtime)
+# keep the watch-time aggregate exact as metadata lands (warm-up, poster/meta requests);
+# deferred: on_runtime takes STATS.lock, which a refresh/save may hold for a while
+add_meta_listener(lambda typ, tmdb_id, rec: STATS.on_runtime(typ, tmdb_id, (rec.get("fields") or {}).get("runtime")),
+                  deferred=True)
+
+# -- Push events for SSE clients (singleton) ---
+EVENTS = EventHub()
 
 @app.get("/api/update")
 def api_update():
-    cache = _cached_latest_release(_ttl_marker(300))
+    cache = _latest_release()
     cur = _norm(CURRENT_VERSION)
     lat = cache.get("latest") or cur
     update = _is_update_available(cur, lat)
@@ -135,10 +159,15 @@ def _norm(v: str) -> str:
     # strip leading 'v' and spaces
     return re.sub(r"^\s*v", "", v.strip(), flags=re.IGNORECASE)
 
-@lru_cache(maxsize=1)
-def _cached_latest_release(_marker: int) -> dict:
+RELEASE_FALLBACK = {"latest": None, "html_url": f"https://github.com/{REPO}/releases", "body": "", "published_at": None}
+
+def _latest_release() -> dict:
+    """Last release the connectivity monitor fetched (never touches the network)."""
+    return MONITOR.value("github", RELEASE_FALLBACK)
+
+def _fetch_latest_release() -> Optional[dict]:
     """
-    Cached lookup. _marker allows us to control TTL via a changing integer.
+    Live GitHub lookup (monitor thread only). None on failure so the monitor keeps the last good answer.
     """
     headers = {
         "Accept": "application/vnd.github+json",
@@ -154,13 +183,8 @@ def _cached_latest_release(_marker: int) -> dict:
         notes = data.get("body") or ""
         published_at = data.get("published_at")
         return {"latest": latest, "html_url": html_url, "body": notes, "published_at": published_at}
-    except Exception as e:
-        # Fallback: no crash; just say "unknown"
-        return {"latest": None, "html_url": f"https://github.com/{REPO}/releases", "body": "", "published_at": None}
-
-def _ttl_marker(seconds=300) -> int:
-    # changes every <seconds> to invalidate lru_cache
-    return int(time.time() // seconds)
+    except Exception:
+        return None
 
 def _is_update_available(current: str, latest: str) -> bool:
     if not latest:
@@ -173,7 +197,7 @@ def _is_update_available(current: str, latest: str) -> bool:
 @app.get("/api/version")
 def get_version():
     cur = _norm(CURRENT_VERSION)
-    cache = _cached_latest_release(_ttl_marker(300))
+    cache = _latest_release()
     latest = cache["latest"]
     html_url = cache["html_url"]
     return {
@@ -191,7 +215,7 @@ def _ver_tuple(s: str):
 
 @app.get("/api/version/check")
 def api_version_check():
-    cache = _cached_latest_release(_ttl_marker(300))
+    cache = _latest_release()
     cur = CURRENT_VERSION
     lat = cache.get("latest") or cur
     update = _ver_tuple(lat) > _ver_tuple(cur)
@@ -218,9 +242,10 @@ FAVICON_SVG = """<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 64 64">
 <path d="M20 30 L32 26 L44 22" fill="none" stroke="url(#g)" stroke-width="3" stroke-linecap="round" stroke-linejoin="round"/>
 </svg>"""
 
-# --- /api/status memoization ---
+# --- /api/status: last payload built from the connectivity monitor ---
 STATUS_CACHE = {"ts": 0.0, "data": None}
-STATUS_TTL = 3600  # 60 minutes
+STATUS_INTERVAL = 600    # Plex/SIMKL re-probe (seconds, jittered; failures back off from 30s)
+RELEASE_INTERVAL = 1800  # GitHub latest-release re-check
 
 # ---------- Paths (Docker-aware) ----------
 # If running from /app (typical inside a container), store config, cache, and reports under /config.
@@ -240,6 +265,7 @@ SYNC_PROC_LOCK = threading.Lock()
 RUNNING_PROCS: Dict[str, subprocess.Popen] = {}
 MAX_LOG_LINES = 3000
 LOG_BUFFERS: Dict[str, List[str]] = {"SYNC": [], "PLEX": [], "SIMKL": [], "TRBL": []}
+LOG_LOCK = threading.Lock()  # keeps buffer replay + live subscription gap-free
 
 SIMKL_STATE: Dict[str, Any] = {}
 
@@ -253,6 +279,8 @@ DEFAULT_CFG: Dict[str, Any] = {
         "token_expires_at": 0,
     },
     "tmdb": {"api_key": ""},
+    "cache": {"max_mb": 1024},  # poster/metadata cache budget; LRU eviction above it
+    "reports": {"keep_days": 90, "keep_max": 1000},  # older sync reports are rolled up per day
     "sync": {
         "enable_add": True,
         "enable_remove": True,
@@ -286,6 +314,22 @@ def load_config() -> Dict[str, Any]:
 def save_config(cfg: Dict[str, Any]) -> None:
     _write_json(JSON_PATH, cfg)
 
+_TMDB_CFG_CACHE: Dict[str, Any] = {"mtime": None, "tmdb": {}}
+
+def _tmdb_cfg() -> Dict[str, Any]:
+    """The config's tmdb section, re-read only when config.json changes (hot poster/meta paths)."""
+    try:
+        mtime = JSON_PATH.stat().st_mtime_ns
+    except Exception:
+        mtime = None
+    if mtime is None or mtime != _TMDB_CFG_CACHE["mtime"]:
+        _TMDB_CFG_CACHE["tmdb"] = dict((load_config().get("tmdb", {}) or {}))
+        _TMDB_CFG_CACHE["mtime"] = mtime
+    return _TMDB_CFG_CACHE["tmdb"]
+
+def _tmdb_key() -> str:
+    return (_tmdb_cfg().get("api_key") or "").strip()
+
 def _is_placeholder(val: str, placeholder: str) -> bool:
     return (val or "").strip().upper() == placeholder.upper()
 
@@ -370,10 +414,23 @@ def ansi_to_html(line: str) -> str:
 
 def _append_log(tag: str, raw_line: str) -> None:
     html = ansi_to_html(raw_line.rstrip("\n"))
-    buf = LOG_BUFFERS.setdefault(tag, [])
-    buf.append(html)
-    if len(buf) > MAX_LOG_LINES:
-        LOG_BUFFERS[tag] = buf[-MAX_LOG_LINES:]
+    with LOG_LOCK:
+        buf = LOG_BUFFERS.setdefault(tag, [])
+        buf.append(html)
+        if len(buf) > MAX_LOG_LINES:
+            LOG_BUFFERS[tag] = buf[-MAX_LOG_LINES:]
+        EVENTS.publish(f"logs:{tag}", html)
+
+def _subscribe_logs(topics: List[str], maxsize: int = 1024):
+    """Subscribe and snapshot the buffers under LOG_LOCK so no line is lost or repeated."""
+    with LOG_LOCK:
+        sub = EVENTS.subscribe(topics, maxsize=maxsize)
+        backlog: List[Tuple[str, str]] = []
+        for t in topics:
+            base, _, tag = t.partition(":")
+            if base == "logs" and tag:
+                backlog.extend((t, line) for line in LOG_BUFFERS.get(tag, []))
+    return sub, backlog
 
 # ---------- Sync Summary ----------
 SUMMARY_LOCK = threading.Lock()
@@ -396,14 +453,30 @@ def _summary_reset() -> None:
             "exit_code": None,
             "timeline": {"start": False, "pre": False, "post": False, "done": False},
             "raw_started_ts": None,
+            "live": None,  # {"now", "plex", "simkl"} from the script's "Live counts" lines
         })
+    _summary_publish()
+
+def _summary_publish() -> None:
+    # push a fresh snapshot to stream subscribers (no-op when nobody listens)
+    if EVENTS.has_subscribers("summary"):
+        EVENTS.publish("summary", _summary_snapshot())
+
 def _summary_set(k: str, v: Any) -> None:
     with SUMMARY_LOCK:
+        changed = SUMMARY.get(k) != v
         SUMMARY[k] = v
+    if changed:
+        _summary_publish()
 
 def _summary_set_timeline(flag: str, value: bool = True) -> None:
     with SUMMARY_LOCK:
-        SUMMARY["timeline"][flag] = value
+        tl = dict(SUMMARY.get("timeline") or {})
+        changed = tl.get(flag) != value
+        tl[flag] = value
+        SUMMARY["timeline"] = tl  # new dict, so published snapshots are never mutated later
+    if changed:
+        _summary_publish()
 
 def _summary_snapshot() -> Dict[str, Any]:
     with SUMMARY_LOCK:
@@ -456,6 +529,13 @@ def _parse_sync_line(line: str) -> None:
         _summary_set_timeline("pre", True)
         return
 
+    # Match live union counts (printed by the script whenever its indexes change)
+    m = re.search(r"Live counts:\s+union=(?P<u>\d+)\s+plex=(?P<p>\d+)\s+simkl=(?P<s>\d+)", s)
+    if m:
+        _summary_set("live", {"now": int(m.group("u")), "plex": int(m.group("p")), "simkl": int(m.group("s"))})
+        _publish_stats()
+        return
+
     # Match Post-sync counts
     m = re.search(r"Post-sync:\s+Plex=(?P<pa>\d+)\s+vs\s+SIMKL=(?P<sa>\d+)\s*(?:→|->)\s*(?P<res>[A-Z]+)", s)
     if m:
@@ -478,12 +558,9 @@ def _parse_sync_line(line: str) -> None:
         _summary_set("running", False)
         _summary_set_timeline("done", True)
 
-        # Save the summary to a file
+        # Save the summary to the report store
         try:
-            ts = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
-            path = REPORT_DIR / f"sync-{ts}.json"
-            with path.open("w", encoding="utf-8") as f:
-                json.dump(_summary_snapshot(), f, indent=2)
+            REPORTS.add(_summary_snapshot())
         except Exception:
             pass
 
@@ -532,6 +609,7 @@ def _stream_proc(cmd: List[str], tag: str) -> None:
 
         if tag == "SYNC" and rc == 0:
             _clear_watchlist_hide()
+            WARMUP.trigger("sync")
 
         if tag == "SYNC" and _summary_snapshot().get("exit_code") is None:
             _summary_set("exit_code", rc)
@@ -543,14 +621,9 @@ def _stream_proc(cmd: List[str], tag: str) -> None:
             _summary_set("running", False)
             _summary_set_timeline("done", True)
 
-            # write report (atomic)
+            # write report (atomic, indexed)
             try:
-                ts = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
-                path = REPORT_DIR / f"sync-{ts}.json"
-                snap = _summary_snapshot()
-                tmp = path.with_suffix(".tmp")
-                tmp.write_text(json.dumps(snap, indent=2), encoding="utf-8")
-                tmp.replace(path)
+                REPORTS.add(_summary_snapshot())
             except Exception:
                 pass
 
@@ -561,19 +634,18 @@ def _stream_proc(cmd: List[str], tag: str) -> None:
                 except Exception:
                     pass
 
+                try:
+                    VIEW.rebuild()
+                except Exception:
+                    pass
+                _refresh_plex_index_soon()  # the sync changed the online watchlist
+
                 ov = STATS.overview(None)
+                _publish_stats(ov)
                 added_last = int(ov.get("new", 0))
                 removed_last = int(ov.get("del", 0))
 
-                reports = sorted(REPORT_DIR.glob("sync-*.json"), key=lambda p: p.stat().st_mtime)
-                if reports:
-                    latest = reports[-1]
-                    data = json.loads(latest.read_text(encoding="utf-8"))
-                    data["added_last"] = added_last
-                    data["removed_last"] = removed_last
-                    tmp2 = latest.with_suffix(".tmp")
-                    tmp2.write_text(json.dumps(data, indent=2), encoding="utf-8")
-                    tmp2.replace(latest)
+                REPORTS.patch(REPORTS.latest_id(), added_last=added_last, removed_last=removed_last)
             except Exception:
                 pass
 
@@ -585,6 +657,10 @@ def _stream_proc(cmd: List[str], tag: str) -> None:
 def start_proc_detached(cmd: List[str], tag: str) -> None:
     threading.Thread(target=_stream_proc, args=(cmd, tag), daemon=True).start()
 
+def _publish_stats(ov: Optional[Dict[str, Any]] = None) -> None:
+    if EVENTS.has_subscribers("stats"):
+        EVENTS.publish("stats", ov if ov is not None else api_stats())
+
 # Add refresh_wall() function here
 def _load_hide_set() -> set:
     # Stub: return an empty set, or implement loading from file if needed
@@ -655,143 +731,104 @@ def _parse_epoch(v: Any) -> int:
     except Exception:
         return 0
 
-def _pick_added(d: Dict[str, Any]) -> Optional[str]:
-    """Find a plausible 'added at' timestamp in various shapes and normalize to UTC Z."""
-    if not isinstance(d, dict):
-        return None
-    for k in ("added", "added_at", "addedAt", "date_added", "created_at", "createdAt"):
-        v = d.get(k)
-        if v:
-            try:
-                if isinstance(v, (int, float)):
-                    return datetime.fromtimestamp(int(v), timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-                return str(v)
-            except Exception:
-                return str(v)
-    dates = d.get("dates") or d.get("meta") or d.get("attributes") or {}
-    if isinstance(dates, dict):
-        for k in ("added", "added_at", "created", "created_at"):
-            v = dates.get(k)
-            if v:
-                try:
-                    if isinstance(v, (int, float)):
-                        return datetime.fromtimestamp(int(v), timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-                    return str(v)
-                except Exception:
-                    return str(v)
-    return None
-
-def _tmdb_genres(api_key: str, typ: str, tmdb_id: int, ttl_days: int = 14) -> List[str]:
-    """Fetch & cache TMDb genres for movie/tv. Safe fallback to []."""
+# the helpers below take an already-read `meta` (peek_meta) so a caller needing several fields reads the record once
+def _tmdb_genres(typ: str, tmdb_id: Any, meta: Optional[Dict[str, Any]] = None) -> List[str]:
+    """TMDb genres for movie/tv from the local cache only; the warm-up worker fills it. Safe fallback to []."""
     try:
-        meta_dir = CACHE_DIR / "tmdb_meta"
-        meta_dir.mkdir(parents=True, exist_ok=True)
-        fpath = meta_dir / f"{typ}-{tmdb_id}.json"
-
-        fresh = False
-        if fpath.exists():
-            age = time.time() - fpath.stat().st_mtime
-            if age < ttl_days * 86400:
-                fresh = True
-
-        data = None
-        if fresh:
-            try:
-                data = json.loads(fpath.read_text(encoding="utf-8"))
-            except Exception:
-                data = None
-
-        if data is None:
-            url = f"https://api.themoviedb.org/3/{'tv' if typ=='tv' else 'movie'}/{tmdb_id}?api_key={api_key}&language=en-US"
-            with urllib.request.urlopen(url, timeout=8) as resp:
-                raw = resp.read()
-            fpath.write_bytes(raw)
-            data = json.loads(raw.decode("utf-8", errors="ignore"))
-
-        genres = []
-        for g in (data.get("genres") or []):
-            name = g.get("name")
-            if isinstance(name, str) and name.strip():
-                genres.append(name.strip())
-        return genres[:8]
+        if meta is None:
+            meta = peek_meta("tv" if typ in ("tv", "show") else "movie", int(tmdb_id), CACHE_DIR)
+        return list((meta or {}).get("genres") or [])[:8]
     except Exception:
         return []
 
-def _wall_items_from_state() -> List[Dict[str, Any]]:
-    """Build watchlist preview items from state.json, newest-first."""
-    st = _load_state()
-    plex_items = (st.get("plex", {}) or {}).get("items", {}) or {}
-    simkl_items = (st.get("simkl", {}) or {}).get("items", {}) or {}
+def _poster_lqip(typ: str, tmdb_id: Any, meta: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """Tiny blurred placeholder (data: URI) if the warm-up already built one."""
+    try:
+        src = poster_cached("tv" if typ in ("tv", "show") else "movie", int(tmdb_id), "w342", CACHE_DIR, meta=meta)
+        return peek_lqip(src) if src else None
+    except Exception:
+        return None
 
-    cfg = load_config()
-    api_key = (cfg.get("tmdb", {}) or {}).get("api_key") or ""
+def _poster_v(typ: str, tmdb_id: Any, meta: Optional[Dict[str, Any]] = None) -> str:
+    """Version token for /art/tmdb URLs ('' until the metadata is cached)."""
+    try:
+        if meta is None:
+            meta = peek_meta("tv" if typ in ("tv", "show") else "movie", int(tmdb_id), CACHE_DIR)
+        return poster_version((meta or {}).get("poster_path"))
+    except Exception:
+        return ""
+
+def _view_enrich(it: Dict[str, Any], api_key: Any = None) -> Dict[str, Any]:
+    """Cache-only TMDb fields for a view row (genres, poster version, LQIP): one record read per row.
+    `api_key` is resolved once per (re)build by the view (enrich_context)."""
+    it["poster_v"] = ""
+    it["lqip"] = None
+    if api_key and it.get("tmdb"):
+        typ = "tv" if it["type"] in ("tv", "show") else "movie"
+        try:
+            meta = peek_meta(typ, int(it["tmdb"]), CACHE_DIR)
+        except Exception:
+            meta = None
+        it["categories"] = _tmdb_genres(typ, it["tmdb"], meta) if meta else []
+        if meta:
+            it["poster_v"] = _poster_v(typ, it["tmdb"], meta)
+            it["lqip"] = _poster_lqip(typ, it["tmdb"], meta)
+    return it
+
+# merged Plex ∪ SIMKL view, materialized once per state.json change (see _watchlist.WatchlistView)
+VIEW = WatchlistView(_find_state_path, enrich=_view_enrich, enrich_context=_tmdb_key)
+# deferred: refresh_tmdb takes the view lock and re-enriches rows; keep it off the writer (often the event loop)
+add_meta_listener(lambda typ, tmdb_id, rec: VIEW.refresh_tmdb(typ, tmdb_id), deferred=True)
+
+# warm Plex account + GUID -> ratingKey index: a grid delete is one Plex write (full scan only on a miss)
+PLEX_WL = PlexWatchlistSession()
+_PLEX_WL_REFRESH = threading.Lock()
+_PLEX_WL_PENDING = threading.Event()
+
+def _refresh_plex_index() -> None:
+    _PLEX_WL_PENDING.set()
+    # a running refresh goes round once more for this request. A request that lands between its last
+    # check and its release() finds the lock still held, so the releasing side re-checks and loops.
+    while _PLEX_WL_PENDING.is_set():
+        if not _PLEX_WL_REFRESH.acquire(blocking=False):
+            return
+        try:
+            while _PLEX_WL_PENDING.is_set():
+                _PLEX_WL_PENDING.clear()
+                try:
+                    token = ((load_config().get("plex") or {}).get("account_token") or "").strip()
+                    PLEX_WL.refresh(token)
+                except Exception as e:
+                    PLEX_WL.invalidate()
+                    _append_log("TRBL", f"[WATCHLIST] Plex index refresh failed: {e}")
+        finally:
+            _PLEX_WL_REFRESH.release()
 
-    out: List[Dict[str, Any]] = []
-    all_keys = set(plex_items.keys()) | set(simkl_items.keys())
+def _refresh_plex_index_soon() -> None:
+    threading.Thread(target=_refresh_plex_index, name="PlexIndex", daemon=True).start()
 
-    def iso_to_epoch(iso: Optional[str]) -> int:
-        if iso is None: return 0
+def _wall_items_from_state() -> List[Dict[str, Any]]:
+    """Watchlist preview items (materialized view, newest-first, hide overlay not applied)."""
+    return VIEW.items()
+
+# ---------- TMDb warm-up (background) ----------
+def _warmup_keys() -> List[Tuple[str, int]]:
+    # _wall_items_from_state() is already newest-first
+    out: List[Tuple[str, int]] = []
+    for it in _wall_items_from_state():
         try:
-            s = str(iso).strip()
-            if s.isdigit(): return int(s)
-            s = s.replace("Z", "+00:00")
-            return int(datetime.fromisoformat(s).timestamp())
+            if it.get("tmdb"):
+                out.append((it["type"], int(it["tmdb"])))
         except Exception:
-            return 0
-
-    for key in all_keys:
-        p = plex_items.get(key) or {}
-        s = simkl_items.get(key) or {}
-        info = p or s
-        if not info:
             continue
-
-        typ_raw = (info.get("type") or "").lower()
-        typ = "tv" if typ_raw in ("tv", "show") else "movie"
-
-        title = info.get("title") or info.get("name") or ""
-        year = info.get("year") or info.get("release_year")
-        tmdb_id = (info.get("ids", {}) or {}).get("tmdb") or info.get("tmdb")
-
-        p_when = _pick_added(p)
-        s_when = _pick_added(s)
-        p_ep = iso_to_epoch(p_when)
-        s_ep = iso_to_epoch(s_when)
-
-        if p_ep >= s_ep:
-            added_when = p_when
-            added_epoch = p_ep
-            added_src = "plex" if p else ("simkl" if s else "")
-        else:
-            added_when = s_when
-            added_epoch = s_ep
-            added_src = "simkl" if s else ("plex" if p else "")
-
-        status = "both" if key in plex_items and key in simkl_items else ("plex_only" if key in plex_items else "simkl_only")
-
-        categories: List[str] = []
-        if api_key and tmdb_id:
-            try:
-                categories = _tmdb_genres(api_key, typ, int(tmdb_id))
-            except Exception:
-                categories = []
-
-        out.append({
-            "key": key,
-            "type": typ,
-            "title": title,
-            "year": year,
-            "tmdb": tmdb_id,
-            "status": status,
-            "added_epoch": added_epoch,
-            "added_when": added_when,
-            "added_src": added_src,
-            "categories": categories,
-        })
-
-    out.sort(key=lambda x: (x.get("added_epoch") or 0, x.get("year") or 0), reverse=True)
     return out
 
+CACHE_MGR = CacheManager(CACHE_DIR, load_config)
+# a finished warm-up pass may have pushed the cache over budget: sweep now instead of at the next interval
+WARMUP = TmdbWarmup(load_config, _warmup_keys, CACHE_DIR, workers=4, on_warm=VIEW.refresh_tmdb, on_idle=CACHE_MGR.kick)
+TMDB_CLIENT = AsyncTmdbClient()  # request-path TMDb access (async, pooled, bounded)
+REPORTS = ReportStore(REPORT_DIR, load_config)
+
 # ---------- Probes (cached) ----------
 _PROBE_CACHE: Dict[str, Tuple[float, bool]] = {"plex": (0.0, False), "simkl": (0.0, False)}
 def _http_get(url: str, headers: Dict[str, str], timeout: int = 8) -> Tuple[int, bytes]:
@@ -847,11 +884,43 @@ def probe_simkl(cfg: Dict[str, Any], max_age_sec: int = 30) -> bool:
     return ok
 
 def connected_status(cfg: Dict[str, Any]) -> Tuple[bool, bool, bool]:
-    plex_ok = probe_plex(cfg)
-    simkl_ok = probe_simkl(cfg)
+    plex_ok = bool(MONITOR.value("plex", False))
+    simkl_ok = bool(MONITOR.value("simkl", False))
     debug = bool(cfg.get("runtime", {}).get("debug"))
     return plex_ok, simkl_ok, debug
 
+def _status_payload() -> Dict[str, Any]:
+    plex_ok, simkl_ok, debug = connected_status(load_config())
+    return {
+        "plex_connected": plex_ok,
+        "simkl_connected": simkl_ok,
+        "debug": debug,
+        "can_run": bool(plex_ok and simkl_ok),
+        "ts": int(time.time()),
+    }
+
+def _publish_status() -> Dict[str, Any]:
+    """Rebuild the status payload; push it to clients only when something other than ts changed."""
+    data = _status_payload()
+    prev = STATUS_CACHE["data"] or {}
+    STATUS_CACHE["ts"] = time.time()
+    STATUS_CACHE["data"] = data
+    if {k: v for k, v in prev.items() if k != "ts"} != {k: v for k, v in data.items() if k != "ts"}:
+        EVENTS.publish("status", data)
+    return data
+
+def _on_probe(name: str, value: Any) -> None:
+    if name == "github":
+        EVENTS.publish("version", get_version())
+    else:
+        _publish_status()
+
+# Probes run concurrently on a jittered schedule in the background; handlers only read MONITOR.
+MONITOR = ConnectivityMonitor(on_change=_on_probe)
+MONITOR.add("plex", lambda: probe_plex(load_config(), max_age_sec=0), interval=STATUS_INTERVAL)
+MONITOR.add("simkl", lambda: probe_simkl(load_config(), max_age_sec=0), interval=STATUS_INTERVAL)
+MONITOR.add("github", _fetch_latest_release, interval=RELEASE_INTERVAL, retry=120, keep_last=True)
+
 # Startup
 # migrated from on_event
 async def _on_startup():
@@ -864,7 +933,29 @@ async def _on_startup():
     except Exception:
         pass
 
-    # 2) warm statistics.json once at boot (new)
+    # 2) start filling TMDb metadata/posters in the background
+    try:
+        WARMUP.start()
+        WARMUP.trigger("startup")
+    except Exception:
+        pass
+
+    # 3) keep the poster/metadata cache under its byte budget
+    try:
+        CACHE_MGR.start()
+    except Exception:
+        pass
+
+    # 3b) Plex/SIMKL/GitHub probes in the background (first round right away)
+    try:
+        MONITOR.start()
+    except Exception:
+        pass
+
+    # 3c) sign in to Plex and index the online watchlist so the first UI delete is one call
+    _refresh_plex_index_soon()
+
+    # 4) warm statistics.json once at boot (new)
     #    - if state.json exists, compute & persist stats so /api/stats
     #      can serve week/month/added/removed immediately.
     try:
@@ -873,14 +964,8 @@ async def _on_startup():
         if not st:
             return
 
-        # Avoid a useless write if the file already exists and is non-empty
-        stats_path = (CONFIG_BASE / "statistics.json")
-        if not stats_path.exists() or stats_path.stat().st_size == 0:
-            STATS.refresh_from_state(st)
-        else:
-            # Optional: refresh anyway to ensure “generated_at” is recent and
-            # samples/events are consistent (safe, atomic)
-            STATS.refresh_from_state(st)
+        # No-op when state.json's checksum matches the one the stats were built from
+        STATS.refresh_from_state(st)
     except Exception:
         # Never block startup on stats warm-up
         pass
@@ -890,105 +975,69 @@ async def _on_startup():
 def api_insights(limit_samples: int = Query(60), history: int = Query(3)) -> JSONResponse:
     """
     Returns:
-      - series: last N (time, count) samples from statistics.json (ascending order)
+      - series: last N (time, count) samples from the stats log (ascending order)
       - history: last few sync reports (date, duration, added_last, removed_last, result)
       - watchtime: estimated minutes/hours/days with method=tmdb|fallback|mixed
     """
-    # --- series from statistics.json ---
-    try:
-        stats_raw = json.loads((CONFIG_BASE / "statistics.json").read_text(encoding="utf-8"))
-    except Exception:
-        stats_raw = {}
-    samples = list(stats_raw.get("samples") or [])
-    samples.sort(key=lambda r: int(r.get("ts") or 0))
-    if limit_samples > 0:
-        samples = samples[-int(limit_samples):]
-    series = [{"ts": int(r.get("ts") or 0), "count": int(r.get("count") or 0)} for r in samples]
-
-    # --- history from saved sync reports ---
+    # --- series from the in-memory sample index ---
+    series = STATS.samples_tail(limit_samples) if limit_samples > 0 else STATS.range(0, int(time.time()))
+
+    # --- history from the report index (newest first) ---
     rows = []
     try:
-        files = sorted(REPORT_DIR.glob("sync-*.json"), key=lambda p: p.stat().st_mtime, reverse=True)[:max(1, int(history))]
-        for p in files:
-            try:
-                d = json.loads(p.read_text(encoding="utf-8"))
-                rows.append({
-                    "started_at": d.get("started_at"),
-                    "finished_at": d.get("finished_at"),
-                    "duration_sec": d.get("duration_sec"),
-                    "result": d.get("result"),
-                    "plex_post": d.get("plex_post"),
-                    "simkl_post": d.get("simkl_post"),
-                    "added": d.get("added_last"),   # may be None on older reports
-                    "removed": d.get("removed_last")
-                })
-            except Exception:
-                continue
+        for d in REPORTS.history(limit=max(1, int(history)))["items"]:
+            rows.append({
+                "started_at": d.get("started_at"),
+                "finished_at": d.get("finished_at"),
+                "duration_sec": d.get("duration_sec"),
+                "result": d.get("result"),
+                "plex_post": d.get("plex_post"),
+                "simkl_post": d.get("simkl_post"),
+                "added": d.get("added_last"),   # may be None on older reports
+                "removed": d.get("removed_last")
+            })
     except Exception:
         pass
 
-    # --- watch time estimate ---
-    state = _load_state()
-    union = {}
-    try:
-        union = Stats._union_keys(state) if state else {}
-    except Exception:
-        union = {}
-
-    plex_items = ((state.get("plex") or {}).get("items") or {}) if state else {}
-    simkl_items = ((state.get("simkl") or {}).get("items") or {}) if state else {}
-
-    cfg = load_config()
-    api_key = (cfg.get("tmdb", {}) or {}).get("api_key") or ""
-    use_tmdb = bool(api_key)
-
-    movies = shows = 0
-    total_min = 0
-    tmdb_hits = tmdb_misses = 0
-
-    # cap to avoid huge first-load fetch; cached files will be instant
-    fetch_cap = 50
-    fetched = 0
-
-    for k, meta in (union or {}).items():
-        typ = "movie" if (meta.get("type") or "") == "movie" else "tv"
-        src = plex_items.get(k) or simkl_items.get(k) or {}
-        ids = (src.get("ids") or {})
-        tmdb_id = ids.get("tmdb") or src.get("tmdb")
-
-        if typ == "movie": movies += 1
-        else: shows += 1
-
-        minutes = None
-        if use_tmdb and tmdb_id and fetched < fetch_cap:
-            try:
-                minutes = get_runtime(api_key, typ, int(tmdb_id), CACHE_DIR)  # <-- use helper from _TMDB.py
-                fetched += 1
-                if minutes is not None:
-                    tmdb_hits += 1
-                else:
-                    tmdb_misses += 1
-            except Exception:
-                tmdb_misses += 1
-
-        if minutes is None:
-            minutes = 115 if typ == "movie" else 45
-
-        total_min += int(minutes)
-
-    method = "tmdb" if tmdb_hits and not tmdb_misses else ("mixed" if tmdb_hits else "fallback")
-
-    watchtime = {
-        "movies": movies,
-        "shows": shows,
-        "minutes": total_min,
-        "hours": round(total_min / 60, 1),
-        "days": round(total_min / 60 / 24, 1),
-        "method": method
-    }
+    # --- watch time: maintained incrementally by Stats (adds/removes + TMDb runtimes) ---
+    watchtime = STATS.watchtime()
 
     return JSONResponse({"series": series, "history": rows, "watchtime": watchtime})
 
+@app.get("/api/reports")
+def api_reports(limit: int = Query(20, ge=1, le=500), before: Optional[str] = Query(None)) -> Dict[str, Any]:
+    """Paged sync history: {items (newest first), next (pass as ?before=), total, rollups (older runs per day)}."""
+    page = REPORTS.history(limit=limit, before=before)
+    if not before:
+        page["rollups"] = REPORTS.rollups()
+    return page
+
+@app.get("/api/reports/{rid}")
+def api_report(rid: str = FPath(...)) -> JSONResponse:
+    rep = REPORTS.get(rid)
+    if rep is None:
+        return JSONResponse({"ok": False, "error": "not found"}, status_code=404)
+    return JSONResponse(rep)
+
+STATS_BUCKETS = ("raw", "hour", "day", "week")
+
+@app.get("/api/stats/range")
+def api_stats_range(
+    from_ts: int = Query(0, alias="from"),
+    to_ts: int = Query(0, alias="to"),
+    bucket: str = Query("day"),
+    events: int = Query(0),
+) -> JSONResponse:
+    """Watchlist size over [from, to] (epoch seconds; to defaults to now) as raw samples or
+    hour/day/week rollups; `events=N` adds up to N add/remove events from the same range."""
+    if bucket not in STATS_BUCKETS:
+        return JSONResponse({"ok": False, "error": f"bucket must be one of {', '.join(STATS_BUCKETS)}"}, status_code=400)
+    end = int(to_ts) if to_ts > 0 else int(time.time())
+    out: Dict[str, Any] = {"from": int(from_ts), "to": end, "bucket": bucket, "series": STATS.range(int(from_ts), end, bucket)}
+    if events > 0:
+        out["events"] = STATS.events_range(int(from_ts), end, limit=min(int(events), 5000))
+    return JSONResponse(out)
+
 @app.get("/api/stats/raw")
 def api_stats_raw():
     try:
@@ -1007,90 +1056,224 @@ async def _on_shutdown():
         scheduler.stop()
     except Exception:
         pass
+    try:
+        WARMUP.stop()
+    except Exception:
+        pass
+    try:
+        CACHE_MGR.stop()
+    except Exception:
+        pass
+    try:
+        MONITOR.stop()
+    except Exception:
+        pass
+    try:
+        await TMDB_CLIENT.aclose()
+    except Exception:
+        pass
 
 @app.middleware("http")
 async def cache_headers_for_api(request: Request, call_next):
     resp = await call_next(request)
-    # Never cache JSON/API responses in the browser
+    # Never cache JSON/API responses in the browser; versioned (ETag) ones may be kept but must be revalidated
     if request.url.path.startswith("/api/"):
-        resp.headers["Cache-Control"] = "no-store"
+        resp.headers["Cache-Control"] = "no-cache" if resp.headers.get("etag") else "no-store"
         # Optional: also kill intermediary cache
         resp.headers["Pragma"] = "no-cache"
         resp.headers["Expires"] = "0"
     return resp
 
-@app.get("/api/stats")
 def api_stats() -> Dict[str, Any]:
     # Persisted stats (from statistics.json)
     base = STATS.overview(None)  # don't pass state here; use persisted file
 
-    # If a sync is actively running, override "now" with a LIVE UNION from state.json
+    # If a sync is actively running, override "now" with the LIVE UNION the script last reported
     snap = _summary_snapshot() if callable(globals().get("_summary_snapshot", None)) else {}
     try:
-        if bool(snap.get("running")):
-            state = _load_state()
-            if state:
-                # compute union count across Plex ∪ SIMKL using the same canonicalizer as stats
-                base["now"] = len(Stats._union_keys(state))
+        live = snap.get("live")
+        if bool(snap.get("running")) and live:
+            base["now"] = int(live.get("now") or 0)
+            base["live"] = True
         # No “grace window” after finish; statistics.json is already refreshed at the end of the run
     except Exception:
         pass
 
     return base
 
+@app.get("/api/stats")
+def api_stats_endpoint(request: Request) -> Response:
+    """api_stats() with an ETag over its content (generated_at excluded), so polling clients get 304s."""
+    data = api_stats()
+    body = json.dumps(data)
+    stable = {k: v for k, v in data.items() if k != "generated_at"}
+    etag = '"stats-' + hashlib.sha1(json.dumps(stable, sort_keys=True).encode("utf-8")).hexdigest()[:16] + '"'
+    if _etag_match(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
 @app.get("/api/logs/stream")
-def api_logs_stream_initial(tag: str = Query("SYNC")):
+async def api_logs_stream_initial(tag: str = Query("SYNC")):
     tag = (tag or "SYNC").upper()
+    # dump existing lines first, then follow pushed lines
+    sub, backlog = _subscribe_logs([f"logs:{tag}"])
+    gen = sse_stream(sub, initial=backlog, named=False)
+    return StreamingResponse(gen, media_type="text/event-stream", headers={"Cache-Control":"no-store"})
 
-    def gen():
-        # dump existing lines first
-        buf = LOG_BUFFERS.get(tag, [])
-        for line in buf:
-            yield f"data: {line}\n\n"
-        # then follow new lines
-        idx = len(buf)
-        while True:
-            new_buf = LOG_BUFFERS.get(tag, [])
-            while idx < len(new_buf):
-                yield f"data: {new_buf[idx]}\n\n"
-                idx += 1
-            time.sleep(0.25)
-
-    return StreamingResponse(gen(), media_type="text/event-stream", headers={"Cache-Control":"no-store"})
+# --- Multiplexed UI event channel ---
+EVENT_TOPICS = {"summary", "logs", "stats", "scheduler", "status", "version"}
 
-# --- Watchlist API (grid page) ---
-@app.get("/api/watchlist")
-def api_watchlist() -> JSONResponse:
-    cfg = load_config()
-    st = _load_state()
-    api_key = (cfg.get("tmdb", {}) or {}).get("api_key") or ""
+def _version_payload() -> Dict[str, Any]:
+    return get_version()
 
-    # If no state at all: return ok:false but HTTP 200 (frontend expects JSON, not 404)
-    if not st:
-        return JSONResponse(
-            {"ok": False, "error": "No state.json found or empty.", "missing_tmdb_key": not bool(api_key)},
-            status_code=200,
-        )
+@app.get("/api/events")
+async def api_events(topics: str = Query("summary,stats,scheduler,status,version")):
+    """
+    One SSE stream for the whole UI. `topics` is a comma list of
+    summary, stats, scheduler, status, version and logs:<TAG> (e.g. logs:SYNC).
+    Each message is a named event (event: <topic>) carrying JSON, or an HTML line for logs.
+    """
+    wanted: List[str] = []
+    for t in (topics or "").split(","):
+        base, _, tag = t.strip().partition(":")
+        base = base.lower()
+        if base not in EVENT_TOPICS:
+            continue
+        if base == "logs":
+            wanted.append(f"logs:{(tag or 'SYNC').upper()}")
+        elif base not in wanted:
+            wanted.append(base)
+
+    sub, initial = _subscribe_logs(wanted)
+    initial = list(initial)
+    if "summary" in wanted:
+        initial.insert(0, ("summary", _summary_snapshot()))
+    if "status" in wanted and STATUS_CACHE["data"]:
+        initial.append(("status", STATUS_CACHE["data"]))
+
+    # anything that may touch disk or the network is computed off the loop and pushed when ready,
+    # to this subscriber only (everyone else already has it)
+    async def _late(topic: str, fn) -> None:
+        try:
+            sub.push(topic, await run_in_threadpool(fn))
+        except Exception:
+            pass
+    if "stats" in wanted:
+        asyncio.create_task(_late("stats", api_stats))
+    if "scheduler" in wanted:
+        asyncio.create_task(_late("scheduler", scheduler.status))
+    if "version" in wanted:
+        asyncio.create_task(_late("version", _version_payload))
+
+    return StreamingResponse(sse_stream(sub, initial=initial), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-store"})
+
+# --- Watchlist API (grid page) ---
+def _etag_match(request: Request, etag: str) -> bool:
+    inm = request.headers.get("if-none-match")
+    if not inm:
+        return False
+    tags = [t.strip() for t in inm.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+def _csv(v: Optional[str]) -> List[str]:
+    return [x.strip() for x in (v or "").split(",") if x.strip()]
+
+def _view_response(
+    request: Request,
+    apply_hide: bool,
+    empty_error: str,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    sort: str = "added",
+    order: str = "desc",
+    type_: Optional[str] = None,
+    status: Optional[str] = None,
+    source: Optional[str] = None,
+    q: Optional[str] = None,
+    fields: Optional[str] = None,
+) -> Response:
+    """
+    {"ok", "items", "total", "next", "version", "missing_tmdb_key", "last_sync_epoch"} around the view's
+    pre-serialized rows. The ETag is the view version, last sync and query, so an unchanged page answers 304
+    (a sync that changed no rows still moves last_sync_epoch, which the page carries).
+    """
+    missing_key = not bool(_tmdb_key())
+    filters = {"type": _csv(type_), "status": _csv(status), "source": _csv(source)}
+    VIEW.ensure()
+    if apply_hide:
+        VIEW.hidden()  # picks up hide-file changes (bumps the version) before we stamp the ETag
+    scope = "wl" if apply_hide else "wall"
+    qs = hashlib.sha1(f"{bool(missing_key)}|{request.url.query}".encode("utf-8")).hexdigest()[:12]
+    etag = f'"{scope}-{VIEW.version}-{VIEW.last_sync_epoch or 0}-{qs}"'
+    if _etag_match(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
     try:
-        items = build_watchlist(st, tmdb_api_key_present=bool(api_key))
+        page = VIEW.page(
+            limit=limit, cursor=cursor, sort=sort, order=order, filters=filters,
+            q=q or "", fields=_csv(fields) or None, apply_hide=apply_hide,
+        )
+    except ValueError as e:
+        return JSONResponse({"ok": False, "error": str(e)}, status_code=400)
     except Exception as e:
-        return JSONResponse({"ok": False, "error": str(e), "missing_tmdb_key": not bool(api_key)}, status_code=200)
+        return JSONResponse({"ok": False, "error": str(e), "missing_tmdb_key": missing_key}, status_code=200)
+    # If no state at all: return ok:false but HTTP 200 (frontend expects JSON, not 404)
+    narrowed = bool(cursor or q or any(filters.values()))
+    if not page["total"] and not narrowed:
+        return JSONResponse({"ok": False, "error": empty_error, "missing_tmdb_key": missing_key}, status_code=200)
+    head = json.dumps({
+        "ok": True,
+        "missing_tmdb_key": missing_key,
+        "last_sync_epoch": VIEW.last_sync_epoch,
+        "total": page["total"],
+        "next": page["next"],
+        "version": VIEW.version,
+    })
+    body = head[:-1].encode("utf-8") + b', "items": ' + page["items"] + b"}"
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
-    if not items:
+@app.get("/api/watchlist")
+def api_watchlist(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=5000),
+    cursor: Optional[str] = Query(None),
+    sort: str = Query("added"),
+    order: str = Query("desc"),
+    type: Optional[str] = Query(None),
+    status: Optional[str] = Query(None),
+    source: Optional[str] = Query(None),
+    q: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None),
+) -> Response:
+    """
+    Merged watchlist (hide overlay applied), newest-first by default.
+    Paging: limit + cursor (pass back `next`). Filters: type=movie,tv; status=both,plex_only,simkl_only;
+    source=plex|simkl (present on that side); q=title substring. sort=added|title|year, order=asc|desc.
+    fields=key,title,... returns only those fields per item. Without limit everything is returned.
+    """
+    if not _find_state_path():
         return JSONResponse(
-            {"ok": False, "error": "No state data found.", "missing_tmdb_key": not bool(api_key)},
+            {"ok": False, "error": "No state.json found or empty.", "missing_tmdb_key": not bool(_tmdb_key())},
             status_code=200,
         )
+    return _view_response(request, True, "No state data found.", limit, cursor, sort, order, type, status, source, q, fields)
 
-    return JSONResponse(
-        {
-            "ok": True,
-            "items": items,
-            "missing_tmdb_key": not bool(api_key),
-            "last_sync_epoch": st.get("last_sync_epoch"),
-        },
-        status_code=200,
-    )
+@app.get("/api/watchlist/changes")
+def api_watchlist_changes(
+    since: int = Query(..., ge=0),
+    fields: Optional[str] = Query(None),
+) -> Response:
+    """
+    Rows added/changed and keys removed since view version `since` (the `version` of an earlier
+    /api/watchlist response). {"full": true} means the version is unknown or too old: reload instead.
+    """
+    try:
+        ch = VIEW.changes(since, fields=_csv(fields) or None)
+    except Exception as e:
+        return JSONResponse({"ok": False, "error": str(e)}, status_code=200)
+    head = json.dumps({"ok": True, "version": ch["version"], "full": ch["full"], "removed": ch["removed"]})
+    body = head[:-1].encode("utf-8") + b', "added": ' + ch["added"] + b', "changed": ' + ch["changed"] + b"}"
+    return Response(content=body, media_type="application/json")
 
 @app.delete("/api/watchlist/{key}")
 def api_watchlist_delete(key: str = FPath(...)) -> JSONResponse:
@@ -1104,21 +1287,14 @@ def api_watchlist_delete(key: str = FPath(...)) -> JSONResponse:
             state_path=sp,
             cfg=load_config(),
             log=_append_log,
+            session=PLEX_WL,
         )
 
         if not isinstance(result, dict) or "ok" not in result:
             result = {"ok": False, "error": "unexpected server response"}
 
         if result.get("ok"):
-            try:
-                state = _load_state()
-                for side in ("plex", "simkl"):
-                    items = ((state.get(side) or {}).get("items") or {})
-                    if key in items:
-                        items.pop(key, None)
-                STATS.refresh_from_state(state)
-            except Exception:
-                pass
+            _after_watchlist_delete([key])
 
         status = 200 if result.get("ok") else 400
         return JSONResponse(result, status_code=status)
@@ -1126,6 +1302,45 @@ def api_watchlist_delete(key: str = FPath(...)) -> JSONResponse:
     except Exception as e:
         _append_log("TRBL", f"[WATCHLIST] ERROR: {e}")
         return JSONResponse({"ok": False, "error": str(e)}, status_code=500)
+
+@app.post("/api/watchlist/delete")
+def api_watchlist_delete_bulk(payload: Dict[str, Any] = Body(...)) -> JSONResponse:
+    """
+    Body {"keys": [...]}: remove many titles from the Plex watchlist in one round
+    (one sign-in, one watchlist fetch, one removeFromWatchlist call).
+    Returns {"ok", "deleted": [keys], "failed": {key: error}}; ok is false if any key failed.
+    """
+    keys = [str(k) for k in ((payload or {}).get("keys") or []) if k]
+    if not keys:
+        return JSONResponse({"ok": False, "error": "keys missing"}, status_code=400)
+    if len(keys) > 500:
+        return JSONResponse({"ok": False, "error": "too many keys (max 500)"}, status_code=400)
+    sp = _find_state_path() or (CONFIG_BASE / "state.json")
+    try:
+        result = delete_watchlist_items(keys, state_path=sp, cfg=load_config(), log=_append_log, session=PLEX_WL)
+        if result.get("deleted"):
+            _after_watchlist_delete(result["deleted"])
+        status = 200 if result.get("deleted") or result.get("ok") else 400
+        return JSONResponse(result, status_code=status)
+    except Exception as e:
+        _append_log("TRBL", f"[WATCHLIST] ERROR: {e}")
+        return JSONResponse({"ok": False, "error": str(e)}, status_code=500)
+
+def _after_watchlist_delete(keys: List[str]) -> None:
+    """Stats, SSE and the view learn about removed keys once per request, however many there were."""
+    try:
+        state = _load_state()
+        for side in ("plex", "simkl"):
+            items = ((state.get(side) or {}).get("items") or {})
+            for key in keys:
+                items.pop(key, None)
+        # only these keys changed: let Stats touch just those entries
+        STATS.refresh_from_state(state, delta={side: {"removed": list(keys)} for side in ("plex", "simkl")})
+        _publish_stats()
+        VIEW.ensure()  # state.json/hide overlay changed: new view version right away, not on the next read
+        VIEW.hidden()
+    except Exception:
+        pass
     
 
 @app.get("/favicon.svg", include_in_schema=False)
@@ -1155,40 +1370,33 @@ def _start_sync_from_scheduler() -> bool:
     return True
 
 # Instantiate scheduler
-scheduler = SyncScheduler(load_config, save_config, run_sync_fn=_start_sync_from_scheduler, is_sync_running_fn=_is_sync_running)
+scheduler = SyncScheduler(
+    load_config, save_config,
+    run_sync_fn=_start_sync_from_scheduler,
+    is_sync_running_fn=_is_sync_running,
+    on_status=lambda st: EVENTS.publish("scheduler", st),
+)
 
-INDEX_HTML = get_index_html()
+INDEX_HTML = ASSETS.rewrite(get_index_html())
+ASSETS.add("index.html", INDEX_HTML.encode("utf-8"), "text/html; charset=utf-8")
 
 @app.get("/", response_class=HTMLResponse)
-def index() -> HTMLResponse:
-    return HTMLResponse(INDEX_HTML)
+def index(request: Request) -> Response:
+    return ASSETS.response("index.html", request.headers) or HTMLResponse(INDEX_HTML)
 
 @app.get("/api/status")
 def api_status(fresh: int = Query(0)):
-    now = time.time()
-    cached = STATUS_CACHE["data"]
-    age = (now - STATUS_CACHE["ts"]) if cached else 1e9
-
-    # If we have a recent cache and not forcing, just return it (0 external calls)
-    if not fresh and cached and age < STATUS_TTL:
-        return JSONResponse(cached, headers={"Cache-Control": "no-store"})
-
-    # Otherwise (fresh=1 OR cache expired/missing), do at most two external probes
-    cfg = load_config()
-    plex_ok  = probe_plex(cfg,  max_age_sec=STATUS_TTL)   # pass 3600 to internal probe cache too
-    simkl_ok = probe_simkl(cfg, max_age_sec=STATUS_TTL)
-    debug    = bool(cfg.get("runtime", {}).get("debug"))
-    data = {
-        "plex_connected": plex_ok,
-        "simkl_connected": simkl_ok,
-        "debug": debug,
-        "can_run": bool(plex_ok and simkl_ok),
-        "ts": int(now),
-    }
-    STATUS_CACHE["ts"] = now
-    STATUS_CACHE["data"] = data
+    # Never probes here: the monitor does. fresh=1 asks it to re-probe now; the result arrives as a "status" event.
+    if fresh:
+        MONITOR.kick("plex", "simkl")
+    data = STATUS_CACHE["data"] or _status_payload()
     return JSONResponse(data, headers={"Cache-Control": "no-store"})
 
+@app.get("/api/status/probes")
+def api_status_probes() -> Dict[str, Any]:
+    """Monitor bookkeeping per probe: ok, ts, consecutive fails, seconds until the next check."""
+    return MONITOR.status()
+
 @app.get("/api/config")
 def api_config() -> JSONResponse:
     return JSONResponse(load_config())
@@ -1196,8 +1404,9 @@ def api_config() -> JSONResponse:
 @app.post("/api/config")
 def api_config_save(cfg: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
     save_config(cfg)
-    _PROBE_CACHE["plex"] = (0.0, False)
-    _PROBE_CACHE["simkl"] = (0.0, False)
+    MONITOR.kick("plex", "simkl")
+    _publish_status()  # debug flag may have changed
+    WARMUP.trigger("config")  # no-op without a TMDb key
     return {"ok": True}
 
 # ---- PLEX auth ----
@@ -1211,7 +1420,8 @@ def api_plex_pin_new() -> Dict[str, Any]:
             if token:
                 cfg = load_config(); cfg.setdefault("plex", {})["account_token"] = token; save_config(cfg)
                 _append_log("PLEX", "\x1b[92m[PLEX]\x1b[0m Token acquired and saved.")
-                _PROBE_CACHE["plex"] = (0.0, False)
+                MONITOR.kick("plex")
+                _refresh_plex_index_soon()
             else:
                 _append_log("PLEX", "\x1b[91m[PLEX]\x1b[0m PIN expired or not authorized.")
         threading.Thread(target=waiter, args=(pin_id, headers), daemon=True).start()
@@ -1260,7 +1470,7 @@ def oauth_simkl_callback(request: Request) -> PlainTextResponse:
         if tokens.get("refresh_token"): simkl_cfg["refresh_token"] = tokens["refresh_token"]
         if tokens.get("expires_in"): simkl_cfg["token_expires_at"] = int(time.time()) + int(tokens["expires_in"])
         save_config(cfg); _append_log("SIMKL", "\x1b[92m[SIMKL]\x1b[0m Access token saved.")
-        _PROBE_CACHE["simkl"] = (0.0, False)
+        MONITOR.kick("simkl")
         return PlainTextResponse("SIMKL authorized. You can close this tab and return to the app.", status_code=200)
     except Exception as e:
         _append_log("SIMKL", f"[SIMKL] ERROR: {e}")
@@ -1304,72 +1514,188 @@ def api_run_summary_file() -> Response:
     return Response(content=js, media_type="application/json", headers={"Content-Disposition": 'attachment; filename="last_sync.json"'})
 
 @app.get("/api/run/summary/stream")
-def api_run_summary_stream() -> StreamingResponse:
-    def gen():
-        last_key = None
-        while True:
-            time.sleep(0.25)
-            snap = _summary_snapshot()
-            key = (snap.get("running"), snap.get("exit_code"), snap.get("plex_post"), snap.get("simkl_post"),
-                   snap.get("result"), snap.get("duration_sec"), (snap.get("timeline", {}) or {}).get("done"))
-            if key != last_key:
-                last_key = key
-                yield f"data: {json.dumps(snap, separators=(',',':'))}\n\n"
-    return StreamingResponse(gen(), media_type="text/event-stream")
+async def api_run_summary_stream() -> StreamingResponse:
+    # push-based: one message now, then only when _summary_set* actually changes something
+    sub = EVENTS.subscribe(["summary"], maxsize=16)
+    gen = sse_stream(sub, initial=[("summary", _summary_snapshot())], named=False)
+    return StreamingResponse(gen, media_type="text/event-stream", headers={"Cache-Control": "no-store"})
 
 # ---- TMDb & wall ----
 @app.get("/api/state/wall")
-def api_state_wall() -> Dict[str, Any]:
-    cfg = load_config()
-    api_key = (cfg.get("tmdb", {}) or {}).get("api_key") or ""
-    st = _load_state()
-    items = _wall_items_from_state()
-    if not items:
-        return {"ok": False, "error": "No state.json found or empty.", "missing_tmdb_key": not bool(api_key)}
-    return {
-        "ok": True,
-        "items": items,
-        "missing_tmdb_key": not bool(api_key),
-        "last_sync_epoch": st.get("last_sync_epoch"),
-    }
+def api_state_wall(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=5000),
+    cursor: Optional[str] = Query(None),
+    sort: str = Query("added"),
+    order: str = Query("desc"),
+    type: Optional[str] = Query(None),
+    status: Optional[str] = Query(None),
+    source: Optional[str] = Query(None),
+    q: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None),
+) -> Response:
+    """Same view and parameters as /api/watchlist, without the hide overlay."""
+    return _view_response(request, False, "No state.json found or empty.", limit, cursor, sort, order, type, status, source, q, fields)
+
+def _poster_file_response(request: Request, typ: str, tmdb_id: int, local_path: Path, w: int, v: str) -> Response:
+    """Disk side of the poster route (variant, stat, version, validators); runs in the threadpool."""
+    mime = "image/jpeg"
+    CACHE_MGR.touch(local_path)
+    headers: Dict[str, str] = {}
+    if w:
+        # resized WebP/AVIF variant when the browser accepts it; JPEG source otherwise
+        allow_avif = bool(_tmdb_cfg().get("poster_avif"))
+        fmt = pick_format(request.headers.get("accept", ""), allow_avif)
+        local_path, mime = get_variant(local_path, w, fmt)
+        CACHE_MGR.touch(local_path)
+        headers["Vary"] = "Accept"
+    st = local_path.stat()
+    cur_v = _poster_v(typ, tmdb_id)
+    etag = f'"{cur_v or "p"}-{local_path.name}-{int(st.st_mtime)}-{st.st_size}"'
+    headers.update({
+        "ETag": etag,
+        "Last-Modified": formatdate(st.st_mtime, usegmt=True),
+        # only a URL carrying the current version may be cached forever
+        "Cache-Control": POSTER_IMMUTABLE if (v and v == cur_v) else POSTER_REVALIDATE,
+    })
+    if _not_modified(request, etag, st.st_mtime):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path=str(local_path), media_type=mime, headers=headers)
+
+class _PosterStreamResponse(StreamingResponse):
+    """Always closes the TMDb stream (slot, blob lock, upstream), even if the body was never sent."""
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.body_iterator.aclose()
+
+POSTER_IMMUTABLE = "public, max-age=31536000, immutable"
+POSTER_REVALIDATE = "public, no-cache"  # unversioned URL: browser keeps it but asks first
+
+def _not_modified(request: Request, etag: str, mtime: float) -> bool:
+    if request.headers.get("if-none-match"):
+        return _etag_match(request, etag)
+    ims = request.headers.get("if-modified-since")
+    if ims:
+        try:
+            return int(mtime) <= int(parsedate_to_datetime(ims).timestamp())
+        except Exception:
+            return False
+    return False
 
 @app.get("/art/tmdb/{typ}/{tmdb_id}")
-def api_tmdb_art(typ: str = FPath(...), tmdb_id: int = FPath(...), size: str = Query("w342")):
+async def api_tmdb_art(
+    request: Request,
+    typ: str = FPath(...),
+    tmdb_id: int = FPath(...),
+    size: str = Query("w342"),
+    v: str = Query(""),
+    w: int = Query(0, ge=0, le=2000),
+):
     typ = typ.lower()
     if typ == "show": typ = "tv"
     if typ not in {"movie", "tv"}:
         return PlainTextResponse("Bad type", status_code=400)
-    cfg = load_config(); api_key = (cfg.get("tmdb", {}) or {}).get("api_key") or ""
+    api_key = await run_in_threadpool(_tmdb_key)
     if not api_key:
         return PlainTextResponse("TMDb key missing", status_code=404)
     try:
-        local_path, mime = get_poster_file(api_key, typ, tmdb_id, size, CACHE_DIR)
-        return FileResponse(
-            path=str(local_path),
-            media_type=mime,
-            headers={
-                # prevent browsers from reusing stale posters
-                "Cache-Control": "no-store, no-cache, must-revalidate, max-age=0",
-                "Pragma": "no-cache",
-                "Expires": "0",
-            },
-        )
+        # normally warm already; on a miss (brand new title) pipe TMDb's bytes straight through
+        # while they land in the cache. Not cacheable by the browser: the next view gets the
+        # resized variant / validators from the file path below.
+        cached = await run_in_threadpool(poster_cached, typ, tmdb_id, size, CACHE_DIR)
+        CACHE_MGR.record(cached is not None)  # waiting on another request's download is still a miss
+        streamed = None if cached is not None else await TMDB_CLIENT.stream_poster(api_key, typ, tmdb_id, size, CACHE_DIR)
+        if streamed is not None:
+            body, mime = streamed
+            return _PosterStreamResponse(body, media_type=mime, headers={"Cache-Control": "no-store"})
+
+        # hit (zero-copy FileResponse), or another request is mid-stream and we wait for its file
+        local_path = await TMDB_CLIENT.poster_file(api_key, typ, tmdb_id, size, CACHE_DIR)
+        return await run_in_threadpool(_poster_file_response, request, typ, tmdb_id, local_path, w, v)
     except Exception as e:
         return PlainTextResponse(f"Poster not available: {e}", status_code=404)
 
+@app.get("/api/tmdb/warmup/status")
+def api_tmdb_warmup_status() -> Dict[str, Any]:
+    return WARMUP.status()
+
+@app.get("/api/tmdb/client/status")
+def api_tmdb_client_status() -> Dict[str, Any]:
+    return TMDB_CLIENT.status()
+
+@app.get("/api/cache/stats")
+def api_cache_stats() -> Dict[str, Any]:
+    return CACHE_MGR.stats()
+
+@app.post("/api/cache/sweep")
+def api_cache_sweep() -> Dict[str, Any]:
+    res = CACHE_MGR.sweep()
+    return {"ok": True, **res, "stats": CACHE_MGR.stats()}
+
 @app.get("/api/tmdb/meta/{typ}/{tmdb_id}")
-def api_tmdb_meta(typ: str = FPath(...), tmdb_id: int = FPath(...)) -> Dict[str, Any]:
+async def api_tmdb_meta(typ: str = FPath(...), tmdb_id: int = FPath(...)) -> Dict[str, Any]:
     typ = typ.lower()
     if typ == "show": typ = "tv"
-    cfg = load_config(); api_key = (cfg.get("tmdb", {}) or {}).get("api_key") or ""
+    api_key = await run_in_threadpool(_tmdb_key)
     if not api_key:
         return {"ok": False, "error": "TMDb key missing"}
     try:
-        meta = get_meta(api_key, typ, tmdb_id, CACHE_DIR)
+        meta = await TMDB_CLIENT.get_meta(api_key, typ, tmdb_id, CACHE_DIR)
         return {"ok": True, **meta}
     except Exception as e:
         return {"ok": False, "error": str(e)}
 
+META_BATCH_MAX = 200
+
+@app.post("/api/tmdb/meta/batch")
+async def api_tmdb_meta_batch(payload: Dict[str, Any] = Body(...)) -> Dict[str, Any]:
+    """Many (type, tmdb) pairs in one go: cache hits answer immediately, misses are fetched concurrently.
+    Body: {"items": [{"type": "movie", "tmdb": 603}, ...]} -> {"ok": true, "items": {"movie:603": {...} | null}}"""
+    api_key = await run_in_threadpool(_tmdb_key)
+    if not api_key:
+        return {"ok": False, "error": "TMDb key missing"}
+
+    wanted: List[Tuple[str, int]] = []
+    for it in (payload.get("items") or [])[:META_BATCH_MAX]:
+        try:
+            typ = str(it.get("type") or "").lower()
+            typ = "tv" if typ in ("tv", "show") else "movie"
+            key = (typ, int(it.get("tmdb")))
+        except Exception:
+            continue
+        if key not in wanted:
+            wanted.append(key)
+
+    def _peek_all() -> List[Optional[Dict[str, Any]]]:
+        return [peek_meta(typ, tid, CACHE_DIR) for typ, tid in wanted]
+
+    out: Dict[str, Any] = {}
+    misses: List[Tuple[str, int]] = []
+    # up to META_BATCH_MAX record files: read and parsed off the loop
+    for (typ, tid), meta in zip(wanted, await run_in_threadpool(_peek_all)):
+        CACHE_MGR.record(meta is not None)
+        if meta is None:
+            misses.append((typ, tid))
+        else:
+            out[f"{typ}:{tid}"] = meta
+
+    async def _fetch(k: Tuple[str, int]) -> Optional[Dict[str, Any]]:
+        try:
+            return await TMDB_CLIENT.get_meta(api_key, k[0], k[1], CACHE_DIR)
+        except Exception:
+            return None
+
+    # the client's in-flight limit bounds the fan-out
+    for (typ, tid), meta in zip(misses, await asyncio.gather(*(_fetch(k) for k in misses))):
+        out[f"{typ}:{tid}"] = meta
+        if meta is not None:
+            # on screen right now: poster, variants and placeholder jump the warm-up queue
+            # (after the fetch above, so the worker finds the record cached and only does the images)
+            WARMUP.enqueue(typ, tid, PRIO_URGENT)
+    return {"ok": True, "items": out}
+
 # --- Scheduling API ---
 @app.get("/api/scheduling")
 def api_sched_get():
@@ -1385,6 +1711,7 @@ def api_sched_post(payload: dict = Body(...)):
         scheduler.start(); scheduler.refresh()
     else:
         scheduler.stop()
+    scheduler.notify()
     st = scheduler.status()
     return {"ok": True, "next_run_at": st.get("next_run_at", 0)}
 
@@ -1406,16 +1733,9 @@ def _safe_remove_path(p: Path) -> bool:
 @app.post("/api/troubleshoot/reset-stats")
 def api_trbl_reset_stats() -> Dict[str, Any]:
     try:
-        with STATS.lock:
-            # Reinitialize to known-good defaults
-            STATS.data = {
-                "events": [],
-                "samples": [],
-                "current": {},
-                "counters": {"added": 0, "removed": 0},
-                "last_run": {"added": 0, "removed": 0, "ts": 0},
-            }
-            STATS._save()
+        # Reinitialize to known-good defaults (snapshot, event/sample log and rollups)
+        STATS.reset()
+        _publish_stats()
         return {"ok": True}
     except Exception as e:
         # Return the error so the UI can display it
@@ -1437,6 +1757,8 @@ def api_trbl_clear_cache() -> Dict[str, Any]:
                     deleted_files += 1
             except Exception:
                 pass
+    CACHE_MGR.reset()
+    VIEW.refresh_enrichment()
     _append_log("TRBL", "\x1b[91m[TROUBLESHOOT]\x1b[0m Cleared cache folder.")
     return {"ok": True, "deleted_files": deleted_files, "deleted_dirs": deleted_dirs}
 